@@ -11,9 +11,14 @@ setup(
         "PySide6>=6.6.0",
         "openpyxl>=3.1.2",
         "reportlab>=4.0.7",
+        "pypdf>=3.17",
         "Pillow>=10.2.0",
         "python-dateutil>=2.8.2",
     ],
+    extras_require={
+        # Storage profile "zstd" (smaller data files); gzip is used without it
+        "zstd": ["zstandard>=0.22"],
+    },
     python_requires=">=3.9",
     entry_points={
         "console_scripts": [
@@ -0,0 +1,377 @@
+"""Headless command line for batch work (no Qt import).
+
+    python -m src.cli import-subjects FILE_OR_DIR [...]
+    python -m src.cli create-schedule --name NAME --range 2026-01-05:2026-03-29 [...] --subjects ID,...
+    python -m src.cli create-units --range 2026-01-05:2026-03-29 --unit "Đại đội 1=ID,..." [...]
+    python -m src.cli validate [SCHEDULE_ID ...]
+    python -m src.cli export --format excel|pdf --out DIR [SCHEDULE_ID ...]
+    python -m src.cli diff OLD NEW [--format excel|pdf --out FILE]
+
+Schedules are built, validated and exported in worker processes (one schedule
+per task). Workers only read the data directory; new schedules are saved by the
+main process so the schedules summary is written by a single process.
+"""
+
+import argparse
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .config.settings import Settings
+from .models.schedule import Schedule
+from .services.file_service import FileService
+from .services.subject_service import SubjectService
+from .services.schedule_service import ScheduleService
+from .services.batch_generator import BatchScheduleGenerator, UnitResult, UnitSpec, populate_schedule
+from .utils.logger import setup_logger
+
+logger = setup_logger()
+
+EXPORT_FORMATS = {"excel": ".xlsx", "pdf": ".pdf"}
+
+# data_dir -> (file_service, subject_service, schedule_service), per process
+_services: Dict[Optional[str], Tuple[FileService, SubjectService, ScheduleService]] = {}
+
+
+def get_services(data_dir: Optional[str] = None) -> Tuple[FileService, SubjectService, ScheduleService]:
+    """Services over a data directory (default src/data), created once per process"""
+    services = _services.get(data_dir)
+    if services is None:
+        if data_dir:
+            settings = Settings(str(Path(data_dir) / "settings.json"))
+        else:
+            settings = Settings()
+        file_service = FileService(data_dir, storage_profile=settings.get_storage_profile())
+        subject_service = SubjectService(file_service)
+        schedule_service = ScheduleService(file_service, subject_service, settings)
+        services = (file_service, subject_service, schedule_service)
+        _services[data_dir] = services
+    return services
+
+
+def parse_range(text: str) -> Tuple[date, date, Optional[str]]:
+    """'START:END[:NAME]' with ISO dates -> (start, end, name)"""
+    parts = text.split(":", 2)
+    if len(parts) < 2:
+        raise argparse.ArgumentTypeError(f"Khoảng ngày không hợp lệ: {text} (dạng BẮT_ĐẦU:KẾT_THÚC[:TÊN])")
+    try:
+        start, end = date.fromisoformat(parts[0]), date.fromisoformat(parts[1])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ngày không hợp lệ: {text} (dạng YYYY-MM-DD)")
+    return start, end, parts[2] if len(parts) > 2 and parts[2] else None
+
+
+def export_file_name(schedule: Schedule, fmt: str) -> str:
+    """<schedule name>_<schedule id>.<ext>, safe on every file system"""
+    stem = re.sub(r'[\\/:*?"<>|\s]+', "_", schedule.name or "thoi_khoa_bieu").strip("_")
+    return f"{stem or 'thoi_khoa_bieu'}_{schedule.schedule_id}{EXPORT_FORMATS[fmt]}"
+
+
+def build_schedule_job(job: Tuple[Optional[str], str, str, str, List[str], bool, bool]) -> Dict:
+    """Create a schedule (not saved) and auto-fill every week. Runs in worker processes.
+    job = (data_dir, name, start iso, end iso, subject ids, auto_fill, use_solver)"""
+    data_dir, name, start, end, subject_ids, auto_fill, use_solver = job
+    _, _, schedule_service = get_services(data_dir)
+    try:
+        schedule = schedule_service.create_schedule(date.fromisoformat(start), date.fromisoformat(end), name)
+    except ValueError as e:
+        return {"name": name, "error": str(e)}
+
+    issues = populate_schedule(schedule_service, schedule, subject_ids, auto_fill, use_solver)
+    return {"name": name, "schedule": schedule.to_dict(), "issues": issues}
+
+
+def validate_schedule_job(job: Tuple[Optional[str], str]) -> Dict:
+    """Validate every week of a stored schedule. Runs in worker processes."""
+    data_dir, schedule_id = job
+    _, _, schedule_service = get_services(data_dir)
+    schedule = schedule_service.load_schedule(schedule_id)
+    if schedule is None:
+        return {"id": schedule_id, "error": "Không tìm thấy thời khóa biểu"}
+    # One schedule per worker already: build its weeks in this process
+    _, _, issues = schedule_service.build_all_weeks(schedule, workers=1, validate=True)
+    return {"id": schedule_id, "name": schedule.name, "issues": issues}
+
+
+def export_schedule_job(job: Tuple[Optional[str], str, str, str]) -> Dict:
+    """Export a stored schedule to out_dir. Runs in worker processes."""
+    data_dir, schedule_id, fmt, out_dir = job
+    file_service, _, schedule_service = get_services(data_dir)
+    schedule = schedule_service.load_schedule(schedule_id)
+    if schedule is None:
+        return {"id": schedule_id, "error": "Không tìm thấy thời khóa biểu"}
+    path = str(Path(out_dir) / export_file_name(schedule, fmt))
+    if fmt == "pdf":
+        from .services.pdf_export_service import PdfExportService
+        # One schedule per worker already: render its weeks in this process
+        pdf_service = PdfExportService(cache_dir=str(file_service.base_dir / "cache" / "pdf_weeks"), max_workers=1)
+        success, error = pdf_service.export_schedule(schedule, path, parallel=False)
+    else:
+        from .services.excel_service import ExcelService
+        success = ExcelService.export_schedule_to_excel(schedule, path)
+        error = None if success else "Không thể xuất Excel"
+    if not success:
+        return {"id": schedule_id, "name": schedule.name, "error": error}
+    return {"id": schedule_id, "name": schedule.name, "path": path}
+
+
+def run_jobs(func: Callable[[tuple], Dict], jobs: Sequence[tuple], workers: int) -> List[Dict]:
+    """func over jobs, in order; in a process pool when there are several jobs and workers"""
+    if workers <= 1 or len(jobs) <= 1:
+        return [func(job) for job in jobs]
+    # spawn: workers start clean (the logging thread of this process is not fork-safe)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=context) as executor:
+        return list(executor.map(func, jobs))
+
+
+def resolve_subject_ids(subject_service: SubjectService, names: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """Map ids, codes or names to subject ids. Returns (ids, unknown)."""
+    subjects = subject_service.get_all_subjects()
+    lookup: Dict[str, str] = {}
+    for subject in subjects:
+        lookup.setdefault(subject.name.lower(), subject.subject_id)
+        if subject.code:
+            lookup.setdefault(subject.code.lower(), subject.subject_id)
+        lookup[subject.subject_id.lower()] = subject.subject_id
+    ids, unknown = [], []
+    for name in names:
+        subject_id = lookup.get(name.strip().lower())
+        if subject_id:
+            ids.append(subject_id)
+        else:
+            unknown.append(name)
+    return ids, unknown
+
+
+def _selected_schedule_ids(schedule_service: ScheduleService, ids: Sequence[str]) -> List[str]:
+    return list(ids) if ids else [schedule.schedule_id for schedule in schedule_service.get_all_schedules()]
+
+
+def cmd_import_subjects(args) -> int:
+    _, subject_service, _ = get_services(args.data_dir)
+    files: List[Path] = []
+    for path in map(Path, args.paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*.xlsx") if not p.name.startswith("~$")))
+        else:
+            files.append(path)
+    failed = 0
+    # Sequential: every import rewrites the subjects summary
+    for path in files:
+        success, subject, error = subject_service.import_from_excel(str(path))
+        if success:
+            print(f"OK    {path}: {subject.name} ({subject.subject_id})")
+        else:
+            failed += 1
+            print(f"LỖI   {path}: {error}")
+    print(f"Đã import {len(files) - failed}/{len(files)} file")
+    return 1 if failed else 0
+
+
+def cmd_create_schedule(args) -> int:
+    _, subject_service, schedule_service = get_services(args.data_dir)
+    subject_ids: List[str] = []
+    if args.subjects:
+        subject_ids, unknown = resolve_subject_ids(subject_service, [s for s in args.subjects.split(",") if s.strip()])
+        if unknown:
+            print(f"Không tìm thấy môn học: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+    jobs = []
+    for start, end, range_name in args.ranges:
+        name = range_name or (f"{args.name} ({start.isoformat()} - {end.isoformat()})"
+                              if len(args.ranges) > 1 else args.name)
+        jobs.append((args.data_dir, name, start.isoformat(), end.isoformat(), subject_ids,
+                     not args.no_auto_fill, args.solver))
+
+    failed = 0
+    created = set()
+    for result in run_jobs(build_schedule_job, jobs, args.workers):
+        if "error" in result:
+            failed += 1
+            print(f"LỖI   {result['name']}: {result['error']}")
+            continue
+        schedule = Schedule.from_dict(result["schedule"])
+        # Ids are timestamps taken in the workers: keep them unique within the batch
+        while schedule.schedule_id in created:
+            schedule.schedule_id += "_1"
+        created.add(schedule.schedule_id)
+        success, error = schedule_service.save_schedule(schedule)
+        if not success:
+            failed += 1
+            print(f"LỖI   {schedule.name}: {error}")
+            continue
+        print(f"OK    {schedule.name} ({schedule.schedule_id}): {len(schedule.weeks)} tuần, {len(result['issues'])} cảnh báo")
+        for issue in result["issues"]:
+            print(f"      {issue}")
+    return 1 if failed else 0
+
+
+def parse_unit(text: str) -> Tuple[str, List[str]]:
+    """'NAME=SUBJECT,...' -> (name, subject ids/codes/names)"""
+    name, _, subjects = text.partition("=")
+    if not name.strip():
+        raise argparse.ArgumentTypeError(f"Đơn vị không hợp lệ: {text} (dạng TÊN=MÔN,MÔN,...)")
+    return name.strip(), [s for s in subjects.split(",") if s.strip()]
+
+
+def cmd_create_units(args) -> int:
+    _, subject_service, schedule_service = get_services(args.data_dir)
+    start, end, _ = args.range
+    units = []
+    for name, names in args.units:
+        subject_ids, unknown = resolve_subject_ids(subject_service, names)
+        if unknown:
+            print(f"{name}: không tìm thấy môn học: {', '.join(unknown)}", file=sys.stderr)
+            return 2
+        units.append(UnitSpec(name, subject_ids, auto_fill=not args.no_auto_fill, use_solver=args.solver))
+
+    def report(done: int, total: int, result: UnitResult):
+        if result.ok:
+            print(f"[{done}/{total}] OK    {result.name} ({result.schedule_id}): {result.weeks} tuần, "
+                  f"{len(result.issues)} cảnh báo, {result.seconds:.1f}s")
+            for issue in result.issues:
+                print(f"      {issue}")
+        else:
+            print(f"[{done}/{total}] LỖI   {result.name}: {result.error}")
+
+    try:
+        results = BatchScheduleGenerator(schedule_service).generate(start, end, units, args.workers, report)
+    except ValueError as e:
+        print(f"LỖI   {e}", file=sys.stderr)
+        return 2
+    return 1 if any(not result.ok for result in results) else 0
+
+
+def cmd_validate(args) -> int:
+    _, _, schedule_service = get_services(args.data_dir)
+    jobs = [(args.data_dir, schedule_id) for schedule_id in _selected_schedule_ids(schedule_service, args.ids)]
+    invalid = 0
+    for result in run_jobs(validate_schedule_job, jobs, args.workers):
+        if "error" in result:
+            invalid += 1
+            print(f"LỖI   {result['id']}: {result['error']}")
+        elif result["issues"]:
+            invalid += 1
+            print(f"LỖI   {result['name']} ({result['id']}): {len(result['issues'])} vấn đề")
+            for issue in result["issues"]:
+                print(f"      {issue}")
+        else:
+            print(f"OK    {result['name']} ({result['id']})")
+    return 1 if invalid else 0
+
+
+def cmd_export(args) -> int:
+    _, _, schedule_service = get_services(args.data_dir)
+    Path(args.out).mkdir(parents=True, exist_ok=True)
+    jobs = [(args.data_dir, schedule_id, args.format, args.out)
+            for schedule_id in _selected_schedule_ids(schedule_service, args.ids)]
+    failed = 0
+    for result in run_jobs(export_schedule_job, jobs, args.workers):
+        if "error" in result:
+            failed += 1
+            print(f"LỖI   {result.get('name', result['id'])}: {result['error']}")
+        else:
+            print(f"OK    {result['name']}: {result['path']}")
+    return 1 if failed else 0
+
+
+def load_schedule_arg(file_service: FileService, schedule_service: ScheduleService, value: str) -> Optional[Schedule]:
+    """A stored schedule by ID, else a schedule file (e.g. a copy of an earlier save)"""
+    schedule = schedule_service.load_schedule(value)
+    if schedule is None and Path(value).is_file():
+        schedule = file_service.load_schedule_file(value)
+    return schedule
+
+
+def cmd_diff(args) -> int:
+    from .services.schedule_diff import diff_schedules
+    file_service, _, schedule_service = get_services(args.data_dir)
+    schedules = []
+    for value in (args.old, args.new):
+        schedule = load_schedule_arg(file_service, schedule_service, value)
+        if schedule is None:
+            print(f"LỖI   Không tìm thấy thời khóa biểu: {value}")
+            return 1
+        schedules.append(schedule)
+    diff = diff_schedules(*schedules)
+    for line in diff.summary_lines():
+        print(line)
+    print(f"{len(diff.days)} ngày thay đổi ({diff.change_count} thay đổi), {diff.unchanged_days} ngày không đổi")
+    if not args.out or diff.is_empty:
+        return 0
+    if args.format == "pdf":
+        from .services.pdf_export_service import PdfExportService
+        success, error = PdfExportService().export_changes(diff, args.out)
+    else:
+        from .services.excel_service import ExcelService
+        success = ExcelService.export_changes_to_excel(diff, args.out)
+        error = None if success else "Không thể xuất Excel"
+    if not success:
+        print(f"LỖI   {error}")
+        return 1
+    print(f"OK    {args.out}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli",
+                                     description="Nhập môn học, tạo, kiểm tra và xuất thời khóa biểu không cần giao diện")
+    parser.add_argument("--data-dir", default=None, help="Thư mục dữ liệu (mặc định: src/data)")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 1) - 1),
+                        help="Số tiến trình song song (mặc định: số CPU - 1)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("import-subjects", help="Import môn học từ file Excel (hoặc thư mục chứa file .xlsx)")
+    p.add_argument("paths", nargs="+")
+    p.set_defaults(func=cmd_import_subjects)
+
+    p = commands.add_parser("create-schedule", help="Tạo và tự động điền thời khóa biểu cho các khoảng ngày")
+    p.add_argument("--name", default="Thời khóa biểu")
+    p.add_argument("--range", dest="ranges", type=parse_range, action="append", required=True,
+                   help="BẮT_ĐẦU:KẾT_THÚC[:TÊN], từ thứ Hai đến Chủ nhật (lặp lại được)")
+    p.add_argument("--subjects", default="", help="Mã, tên hoặc ID môn học cho mỗi ngày, cách nhau bởi dấu phẩy")
+    p.add_argument("--no-auto-fill", action="store_true", help="Không tự động điền giờ và bài học")
+    p.add_argument("--solver", action="store_true",
+                   help="Tự động điền bằng bộ giải: tìm cho cả tuần các bài lấp đầy đúng tổng giờ mỗi ngày")
+    p.set_defaults(func=cmd_create_schedule)
+
+    p = commands.add_parser("create-units", help="Tạo thời khóa biểu cho nhiều đơn vị trong cùng khoảng ngày")
+    p.add_argument("--range", type=parse_range, required=True, help="BẮT_ĐẦU:KẾT_THÚC, từ thứ Hai đến Chủ nhật")
+    p.add_argument("--unit", dest="units", type=parse_unit, action="append", required=True,
+                   help="TÊN=MÔN,MÔN,... (mã, tên hoặc ID môn học; lặp lại cho mỗi đơn vị)")
+    p.add_argument("--no-auto-fill", action="store_true", help="Không tự động điền giờ và bài học")
+    p.add_argument("--solver", action="store_true", help="Tự động điền bằng bộ giải")
+    p.set_defaults(func=cmd_create_units)
+
+    p = commands.add_parser("validate", help="Kiểm tra thời khóa biểu (mặc định: tất cả)")
+    p.add_argument("ids", nargs="*")
+    p.set_defaults(func=cmd_validate)
+
+    p = commands.add_parser("export", help="Xuất thời khóa biểu ra Excel/PDF (mặc định: tất cả)")
+    p.add_argument("ids", nargs="*")
+    p.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="excel")
+    p.add_argument("--out", required=True, help="Thư mục chứa file xuất")
+    p.set_defaults(func=cmd_export)
+
+    p = commands.add_parser("diff", help="So sánh hai thời khóa biểu (hoặc hai lần lưu) và xuất các ngày thay đổi")
+    p.add_argument("old", help="ID hoặc file thời khóa biểu cũ")
+    p.add_argument("new", help="ID hoặc file thời khóa biểu mới")
+    p.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="excel")
+    p.add_argument("--out", default=None, help="File thông báo thay đổi (chỉ gồm các ngày thay đổi)")
+    p.set_defaults(func=cmd_diff)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
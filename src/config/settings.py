@@ -58,6 +58,14 @@ class Settings:
         """Set current language"""
         self.set("language", language)
     
+    def get_storage_profile(self) -> str:
+        """Get data file serialization profile (pretty / compact / gzip / zstd)"""
+        return self.get("storage_profile", "pretty")
+    
+    def set_storage_profile(self, profile: str):
+        """Set data file serialization profile"""
+        self.set("storage_profile", profile)
+    
     # Season (summer/winter) date range
     def get_summer_start_month(self) -> int:
         return int(self.get("summer_start_month", DEFAULT_SUMMER_START_MONTH))
@@ -6,6 +6,14 @@ from pathlib import Path
 # Add parent directory to path to allow imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Imported first so the startup clock starts before Qt is loaded
+from src.utils import startup_timing
+
+# Opt-in startup profiling: python src/main.py --profile-startup (or MTP_PROFILE_STARTUP=1)
+PROFILE_STARTUP = startup_timing.profiling_requested(sys.argv)
+if PROFILE_STARTUP:
+    startup_timing.enable_import_profiling()
+
 from PySide6.QtWidgets import QApplication, QSplashScreen
 from PySide6.QtGui import QPixmap, QIcon
 from PySide6.QtCore import Qt
@@ -14,13 +22,29 @@ from src.ui.main_window import MainWindow
 from src.utils.logger import setup_logger
 
 logger = setup_logger()
+startup_timing.mark("imports")
+
+
+def _install_startup_profiling():
+    """Time the service calls that dominate startup (profiling mode only)"""
+    from src.services.file_service import FileService
+    from src.services.schedule_service import ScheduleService
+    
+    startup_timing.profile_method(FileService, "_ensure_directories")
+    startup_timing.profile_method(FileService, "load_all_subjects")
+    startup_timing.profile_method(FileService, "load_all_users")
+    startup_timing.profile_method(FileService, "load_fixed_subjects")
+    startup_timing.profile_method(ScheduleService, "__init__")
 
 
 def main():
     """Main function"""
-    app = QApplication(sys.argv)
+    if PROFILE_STARTUP:
+        _install_startup_profiling()
+    app = QApplication([arg for arg in sys.argv if arg != startup_timing.PROFILE_FLAG])
     app.setApplicationName("Military Training Plan")
     app.setOrganizationName("Military Training")
+    startup_timing.mark("qapplication")
     
     # Set application icon
     try:
@@ -52,12 +76,14 @@ def main():
             app.processEvents()
     except Exception as e:
         logger.warning(f"Could not show splash screen: {e}")
+    startup_timing.mark("splash")
     
     # Create default user if needed
     from src.services.auth_service import AuthService
     from src.services.file_service import FileService
+    from src.config.settings import Settings
     
-    file_service = FileService()
+    file_service = FileService(storage_profile=Settings().get_storage_profile())
     auth_service = AuthService(file_service)
     
     # Check if any users exist, if not create default
@@ -65,6 +91,7 @@ def main():
     if not users:
         logger.info("No users found, creating default user")
         auth_service.create_user("admin", "admin", "Administrator")
+    startup_timing.mark("services")
     
     # Create and show main window
     window = MainWindow()
@@ -75,6 +102,12 @@ def main():
         splash.finish(window)
     
     logger.info("Application started")
+    startup_timing.mark("main_window")
+    if PROFILE_STARTUP:
+        startup_timing.disable_import_profiling()
+        startup_timing.write_profile_report(logger)
+    else:
+        startup_timing.report(logger)
     
     sys.exit(app.exec())
 
@@ -12,6 +12,7 @@ class Lesson:
     name: str
     duration: Optional[float] = None  # Duration in hours
     materials: List[str] = field(default_factory=list)  # List of file paths
+    resource_ids: List[str] = field(default_factory=list)  # Resources needed in addition to the subject's
     lesson_id: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
@@ -32,6 +33,7 @@ class Lesson:
             "name": self.name,
             "duration": self.duration,
             "materials": self.materials,
+            "resource_ids": self.resource_ids,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
@@ -43,6 +45,7 @@ class Lesson:
             name=data["name"],
             duration=data.get("duration"),
             materials=data.get("materials", []),
+            resource_ids=data.get("resource_ids", []),
             lesson_id=data.get("lesson_id"),
         )
         if data.get("created_at"):
@@ -0,0 +1,62 @@
+"""Resource model (instructors and equipment)"""
+
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+
+
+# Resource kinds
+RESOURCE_KINDS = {
+    "INSTRUCTOR": "Giảng viên",
+    "EQUIPMENT": "Trang thiết bị",
+}
+
+
+@dataclass
+class Resource:
+    """Represents an instructor or a piece of equipment used by subjects/lessons"""
+    
+    name: str  # Required
+    resource_id: Optional[str] = None
+    kind: str = "INSTRUCTOR"  # Key of RESOURCE_KINDS
+    capacity: int = 1  # Lessons it can serve at the same time
+    note: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    def __post_init__(self):
+        """Initialize timestamps"""
+        if self.resource_id is None:
+            self.resource_id = f"resource_{datetime.now().timestamp()}"
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        if self.updated_at is None:
+            self.updated_at = datetime.now()
+    
+    def to_dict(self) -> dict:
+        """Convert resource to dictionary"""
+        return {
+            "resource_id": self.resource_id,
+            "name": self.name,
+            "kind": self.kind,
+            "capacity": self.capacity,
+            "note": self.note,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "Resource":
+        """Create resource from dictionary"""
+        resource = cls(
+            name=data["name"],
+            resource_id=data.get("resource_id"),
+            kind=data.get("kind", "INSTRUCTOR"),
+            capacity=data.get("capacity", 1),
+            note=data.get("note"),
+        )
+        if data.get("created_at"):
+            resource.created_at = datetime.fromisoformat(data["created_at"])
+        if data.get("updated_at"):
+            resource.updated_at = datetime.fromisoformat(data["updated_at"])
+        return resource
@@ -1,10 +1,44 @@
 """Schedule model"""
 
+import sys
 from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Union
 from datetime import datetime, date, time
 from enum import Enum
 
+# ScheduleItem/DaySchedule are created by the thousand for long schedules: use __slots__
+# where the interpreter supports it (dataclass slots=True needs Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# One shared time object per minute of the day; items reuse these instead of allocating their own
+_TIMES_BY_MINUTE = tuple(time(h, m) for h in range(24) for m in range(60))
+# "HH:MM" -> shared time, so loading a schedule does not parse every start/end time
+_TIMES_BY_TEXT = {t.strftime("%H:%M"): t for t in _TIMES_BY_MINUTE}
+
+# Version written into schedule files. Version 1 (no field) may contain legacy single-string
+# slot maps; version 2+ always stores lists, so loading can skip normalization.
+SCHEDULE_FORMAT_VERSION = 2
+
+
+def _intern_str(value: Optional[str]) -> Optional[str]:
+    """Return the interned copy of a string so repeated names share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_time(value: time) -> time:
+    """Return the shared time object for whole-minute times (others are kept as is)."""
+    if value.second or value.microsecond or value.tzinfo is not None:
+        return value
+    return _TIMES_BY_MINUTE[value.hour * 60 + value.minute]
+
+
+def parse_time_str(value: str) -> time:
+    """Parse "HH:MM" via the precomputed table, falling back to time.fromisoformat for other formats."""
+    t = _TIMES_BY_TEXT.get(value)
+    if t is None:
+        t = _intern_time(time.fromisoformat(value))
+    return t
+
 
 class DayOfWeek(Enum):
     """Day of week enumeration"""
@@ -17,7 +51,7 @@ class DayOfWeek(Enum):
     SUNDAY = 6
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScheduleItem:
     """Represents a single scheduled lesson"""
     
@@ -43,15 +77,16 @@ class ScheduleItem:
     
     @classmethod
     def from_dict(cls, data: dict) -> "ScheduleItem":
-        """Create from dictionary"""
+        """Create from dictionary. Ids, names and times are shared with other loaded items
+        (the same subject/lesson repeats across weeks)."""
         return cls(
-            subject_id=data["subject_id"],
-            lesson_id=data["lesson_id"],
-            subject_name=data["subject_name"],
-            lesson_name=data["lesson_name"],
-            start_time=time.fromisoformat(data["start_time"]),
-            end_time=time.fromisoformat(data["end_time"]),
-            location=data.get("location"),
+            subject_id=_intern_str(data["subject_id"]),
+            lesson_id=_intern_str(data["lesson_id"]),
+            subject_name=_intern_str(data["subject_name"]),
+            lesson_name=_intern_str(data["lesson_name"]),
+            start_time=parse_time_str(data["start_time"]),
+            end_time=parse_time_str(data["end_time"]),
+            location=_intern_str(data.get("location")),
         )
 
 
@@ -64,6 +99,25 @@ def _normalize_to_list(value: Union[str, List[str], None]) -> List[str]:
     return list(value) if value else []
 
 
+def _intern_id_lists(raw: dict, legacy: bool = True) -> Dict[str, List[str]]:
+    """Convert a subject_id -> ids/times map from JSON, interning keys and values.
+    legacy=False trusts that every value is already a list (current file format)."""
+    if legacy:
+        return {
+            sys.intern(k): [_intern_str(v) for v in _normalize_to_list(values)]
+            for k, values in raw.items()
+        }
+    return {sys.intern(k): [_intern_str(v) for v in values] for k, values in raw.items()}
+
+
+def _parse_durations(raw: dict) -> Dict[str, List[Optional[float]]]:
+    """Convert a subject_id -> slot durations map from JSON (non-list values are dropped)."""
+    return {
+        sys.intern(k): [float(x) if x is not None else None for x in v]
+        for k, v in (raw or {}).items() if isinstance(v, list)
+    }
+
+
 def _normalize_duration_list(value: Optional[List], length: int) -> List[Optional[float]]:
     """Return list of optional float (duration in hours per slot). None = use full lesson duration."""
     if value is None or not isinstance(value, list):
@@ -71,7 +125,7 @@ def _normalize_duration_list(value: Optional[List], length: int) -> List[Optiona
     return list(value) + [None] * (length - len(value)) if len(value) < length else value[:length]
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DaySchedule:
     """Represents schedule for a single day.
     subject_lesson_map: subject_id -> list of lesson_id (one or more per subject).
@@ -102,72 +156,191 @@ class DaySchedule:
             return None
         return lst[slot_index]
 
-    def to_dict(self) -> dict:
-        """Convert to dictionary. Always serializes slots/map as lists."""
-        return {
+    def to_dict(self, plan: bool = True) -> dict:
+        """Convert to dictionary. Always serializes slots/map as lists.
+        plan=False leaves out the subjects/times/lessons (the day uses its week template's)."""
+        data = {
             "date": self.date.isoformat(),
             "items": [item.to_dict() for item in self.items],
             "is_completed": self.is_completed,
-            "selected_subject_ids": list(self.selected_subject_ids),
-            "subject_time_slots": {k: list(v) for k, v in self.subject_time_slots.items()},
-            "subject_lesson_map": {k: list(v) for k, v in self.subject_lesson_map.items()},
-            "subject_slot_durations": {k: list(v) for k, v in self.subject_slot_durations.items()},
         }
+        if plan:
+            data.update(DayPlan.to_dict(self))
+        return data
 
     @classmethod
-    def from_dict(cls, data: dict) -> "DaySchedule":
-        """Create from dictionary. Accepts legacy format (value is string) and converts to list."""
+    def from_dict(cls, data: dict, legacy: bool = True) -> "DaySchedule":
+        """Create from dictionary. Accepts legacy format (value is string) and converts to list;
+        legacy=False skips that normalization for files written in the current format."""
         raw_slots = data.get("subject_time_slots", {}) or {}
         raw_map = data.get("subject_lesson_map", {}) or {}
-        subject_time_slots = {
-            k: _normalize_to_list(v) for k, v in raw_slots.items()
-        }
-        subject_lesson_map = {
-            k: _normalize_to_list(v) for k, v in raw_map.items()
-        }
-        raw_dur = data.get("subject_slot_durations", {}) or {}
-        subject_slot_durations = {}
-        for k, v in raw_dur.items():
-            if isinstance(v, list):
-                subject_slot_durations[k] = [float(x) if x is not None else None for x in v]
+        subject_time_slots = _intern_id_lists(raw_slots, legacy)
+        subject_lesson_map = _intern_id_lists(raw_map, legacy)
+        subject_slot_durations = _parse_durations(data.get("subject_slot_durations", {}))
         return cls(
             date=date.fromisoformat(data["date"]),
             items=[ScheduleItem.from_dict(item_data) for item_data in data.get("items", [])],
             is_completed=data.get("is_completed", False),
-            selected_subject_ids=data.get("selected_subject_ids", []) or [],
+            selected_subject_ids=[_intern_str(s) for s in data.get("selected_subject_ids", []) or []],
             subject_time_slots=subject_time_slots,
             subject_lesson_map=subject_lesson_map,
             subject_slot_durations=subject_slot_durations,
         )
 
 
+# DaySchedule fields a week template provides
+PLAN_FIELDS = ("selected_subject_ids", "subject_time_slots", "subject_lesson_map", "subject_slot_durations")
+
+
+@dataclass(**_SLOTS)
+class DayPlan:
+    """Subjects, start times and lessons of one weekday in a week template (same fields as DaySchedule)"""
+
+    selected_subject_ids: List[str] = field(default_factory=list)
+    subject_time_slots: Dict[str, List[str]] = field(default_factory=dict)
+    subject_lesson_map: Dict[str, List[str]] = field(default_factory=dict)
+    subject_slot_durations: Dict[str, List[Optional[float]]] = field(default_factory=dict)
+
+    @classmethod
+    def copy_of(cls, day: Union["DayPlan", DaySchedule]) -> "DayPlan":
+        """Independent copy of the plan of a day"""
+        return cls(**DayPlan.to_dict(day))
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary (also accepts a DaySchedule as self)"""
+        return {
+            "selected_subject_ids": list(self.selected_subject_ids),
+            "subject_time_slots": {k: list(v) for k, v in self.subject_time_slots.items()},
+            "subject_lesson_map": {k: list(v) for k, v in self.subject_lesson_map.items()},
+            "subject_slot_durations": {k: list(v) for k, v in self.subject_slot_durations.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DayPlan":
+        """Create from dictionary (current format: every value is a list)"""
+        return cls(
+            selected_subject_ids=[_intern_str(s) for s in data.get("selected_subject_ids", []) or []],
+            subject_time_slots=_intern_id_lists(data.get("subject_time_slots", {}) or {}, legacy=False),
+            subject_lesson_map=_intern_id_lists(data.get("subject_lesson_map", {}) or {}, legacy=False),
+            subject_slot_durations=_parse_durations(data.get("subject_slot_durations", {})),
+        )
+
+
+@dataclass
+class WeekTemplate:
+    """Named standard week: one DayPlan per weekday (Monday first).
+    Weeks using a template share its day plans instead of holding copies, so a template is
+    never changed in place: saving it again replaces the object and weeks keep the old one."""
+
+    name: str
+    template_id: Optional[str] = None
+    days: List[DayPlan] = field(default_factory=list)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    def __post_init__(self):
+        """Initialize timestamps"""
+        if self.template_id is None:
+            self.template_id = f"week_template_{datetime.now().timestamp()}"
+        if self.created_at is None:
+            self.created_at = datetime.now()
+        if self.updated_at is None:
+            self.updated_at = datetime.now()
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "template_id": self.template_id,
+            "name": self.name,
+            "days": [day.to_dict() for day in self.days],
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WeekTemplate":
+        """Create from dictionary"""
+        template = cls(
+            name=data["name"],
+            template_id=data.get("template_id"),
+            days=[DayPlan.from_dict(day_data) for day_data in data.get("days", [])],
+        )
+        if data.get("created_at"):
+            template.created_at = datetime.fromisoformat(data["created_at"])
+        if data.get("updated_at"):
+            template.updated_at = datetime.fromisoformat(data["updated_at"])
+        return template
+
+
 @dataclass
 class WeekSchedule:
-    """Represents schedule for a week"""
+    """Represents schedule for a week.
+    template: week template whose day plans the days still share (copy-on-write: see own_day)."""
     
     week_number: int
     start_date: date  # Monday
     end_date: date  # Sunday
     days: List[DaySchedule] = field(default_factory=list)
+    template: Optional[WeekTemplate] = field(default=None, repr=False, compare=False)
+
+    def apply_template(self, template: WeekTemplate):
+        """Point every day at the template's plan for its weekday (nothing is copied)"""
+        self.template = template
+        for day, plan in zip(self.days, template.days):
+            for name in PLAN_FIELDS:
+                setattr(day, name, getattr(plan, name))
+
+    def uses_template_day(self, day_index: int) -> bool:
+        """True if the day still shares its plan with the week template"""
+        if self.template is None or day_index >= len(self.template.days):
+            return False
+        day, plan = self.days[day_index], self.template.days[day_index]
+        return any(getattr(day, name) is getattr(plan, name) for name in PLAN_FIELDS)
+
+    def own_day(self, day_index: int) -> DaySchedule:
+        """The day, ready to be changed in place: a plan shared with the template is copied first"""
+        day = self.days[day_index]
+        if self.uses_template_day(day_index):
+            own = DayPlan.copy_of(day)
+            for name in PLAN_FIELDS:
+                setattr(day, name, getattr(own, name))
+        return day
     
     def to_dict(self) -> dict:
-        """Convert to dictionary"""
-        return {
+        """Convert to dictionary. Days sharing the template's plan only store a flag."""
+        data = {
             "week_number": self.week_number,
             "start_date": self.start_date.isoformat(),
             "end_date": self.end_date.isoformat(),
-            "days": [day.to_dict() for day in self.days],
+            "days": [],
         }
+        for day_index, day in enumerate(self.days):
+            if self.uses_template_day(day_index):
+                data["days"].append({**day.to_dict(plan=False), "from_template": True})
+            else:
+                data["days"].append(day.to_dict())
+        if self.template is not None:
+            data["template_id"] = self.template.template_id
+        return data
     
     @classmethod
-    def from_dict(cls, data: dict) -> "WeekSchedule":
-        """Create from dictionary"""
-        return cls(
+    def from_dict(cls, data: dict, legacy: bool = True,
+                  templates: Optional[Dict[str, WeekTemplate]] = None) -> "WeekSchedule":
+        """Create from dictionary. templates: the schedule's week templates by id."""
+        week = cls(
             week_number=data["week_number"],
             start_date=date.fromisoformat(data["start_date"]),
             end_date=date.fromisoformat(data["end_date"]),
-            days=[DaySchedule.from_dict(day_data) for day_data in data.get("days", [])],
+            days=[DaySchedule.from_dict(day_data, legacy) for day_data in data.get("days", [])],
         )
+        template = (templates or {}).get(data.get("template_id"))
+        if template is not None:
+            week.template = template
+            for day, day_data, plan in zip(week.days, data.get("days", []), template.days):
+                if day_data.get("from_template"):
+                    for name in PLAN_FIELDS:
+                        setattr(day, name, getattr(plan, name))
+        return week
 
 
 @dataclass
@@ -192,8 +365,9 @@ class Schedule:
             self.updated_at = datetime.now()
     
     def to_dict(self) -> dict:
-        """Convert schedule to dictionary"""
-        return {
+        """Convert schedule to dictionary. Week templates used by the weeks are stored once."""
+        data = {
+            "format_version": SCHEDULE_FORMAT_VERSION,
             "schedule_id": self.schedule_id,
             "name": self.name,
             "start_date": self.start_date.isoformat() if self.start_date else None,
@@ -202,16 +376,50 @@ class Schedule:
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
-    
+        templates = {week.template.template_id: week.template for week in self.weeks if week.template is not None}
+        if templates:
+            data["week_templates"] = {tid: template.to_dict() for tid, template in templates.items()}
+        return data
+
+    def get_day(self, day_date: date) -> Optional[DaySchedule]:
+        """Return the DaySchedule for a date, or None if the date is not scheduled.
+        Weeks are consecutive from the first Monday, so the position is computed directly;
+        falls back to a scan if the weeks are not laid out that way."""
+        if not self.weeks:
+            return None
+        offset = (day_date - self.weeks[0].start_date).days
+        if offset >= 0:
+            week_index, day_index = divmod(offset, 7)
+            if week_index < len(self.weeks):
+                week = self.weeks[week_index]
+                if day_index < len(week.days) and week.days[day_index].date == day_date:
+                    return week.days[day_index]
+        for week in self.weeks:
+            if week.start_date <= day_date <= week.end_date:
+                for day in week.days:
+                    if day.date == day_date:
+                        return day
+        return None
+
+    def iter_days(self):
+        """Iterate over all DaySchedule objects in chronological order."""
+        for week in self.weeks:
+            yield from week.days
+
     @classmethod
     def from_dict(cls, data: dict) -> "Schedule":
         """Create schedule from dictionary"""
+        legacy = data.get("format_version", 1) < SCHEDULE_FORMAT_VERSION
+        templates = {
+            tid: WeekTemplate.from_dict(template_data)
+            for tid, template_data in (data.get("week_templates") or {}).items()
+        }
         schedule = cls(
             schedule_id=data.get("schedule_id"),
             name=data.get("name"),
             start_date=date.fromisoformat(data["start_date"]) if data.get("start_date") else None,
             end_date=date.fromisoformat(data["end_date"]) if data.get("end_date") else None,
-            weeks=[WeekSchedule.from_dict(week_data) for week_data in data.get("weeks", [])],
+            weeks=[WeekSchedule.from_dict(week_data, legacy, templates) for week_data in data.get("weeks", [])],
         )
         if data.get("created_at"):
             schedule.created_at = datetime.fromisoformat(data["created_at"])
@@ -38,6 +38,7 @@ class Subject:
     location: Optional[str] = None  # Learning location
     default_duration: Optional[float] = None  # Default duration in hours
     prerequisites: List[str] = field(default_factory=list)  # List of subject IDs
+    resource_ids: List[str] = field(default_factory=list)  # Resources needed by every lesson
     category_main: Optional[str] = None  # Main category
     category_sub: Optional[str] = None  # Sub category (for Quân sự and Hậu cần kỹ thuật)
     created_at: Optional[datetime] = None
@@ -74,6 +75,7 @@ class Subject:
             "location": self.location,
             "default_duration": self.default_duration,
             "prerequisites": self.prerequisites,
+            "resource_ids": self.resource_ids,
             "category_main": self.category_main,
             "category_sub": self.category_sub,
             "created_at": self.created_at.isoformat() if self.created_at else None,
@@ -93,6 +95,7 @@ class Subject:
             location=data.get("location"),
             default_duration=data.get("default_duration"),
             prerequisites=data.get("prerequisites", []),
+            resource_ids=data.get("resource_ids", []),
             category_main=data.get("category_main"),
             category_sub=data.get("category_sub"),
         )
@@ -0,0 +1,197 @@
+"""Create schedules for many training units over the same date range.
+
+The empty schedule (weeks, days and fixed items) is built once and copied for
+every unit, and each worker process receives it with the subject catalog once
+(pool initializer). Workers fill units; the calling process saves each unit as
+soon as it comes back, so saving overlaps with the units still being filled and
+the schedules summary is written by a single process.
+
+Units only see the instructor/equipment bookings of schedules already saved,
+so when any resource is defined the units are filled one after another in the
+calling process, each saved before the next is filled.
+"""
+
+import multiprocessing
+import os
+import time as _time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Sequence
+from ..models.schedule import Schedule
+from ..models.subject import Subject
+from .file_service import FileService
+from .sequencing import TeachingHistory
+from .week_builder import SubjectSnapshotService
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+@dataclass
+class UnitSpec:
+    """One training unit: schedule name and the subjects taught every day"""
+    name: str
+    subject_ids: List[str] = field(default_factory=list)
+    auto_fill: bool = True
+    use_solver: bool = False
+
+
+@dataclass
+class UnitResult:
+    """Outcome of one unit: the saved schedule id, or the error"""
+    name: str
+    schedule_id: Optional[str] = None
+    weeks: int = 0
+    issues: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# (units done, units total, result of the unit just done)
+ProgressCallback = Callable[[int, int, UnitResult], None]
+
+
+def populate_schedule(schedule_service, schedule: Schedule, subject_ids: Sequence[str],
+                      auto_fill: bool = True, use_solver: bool = False) -> List[str]:
+    """Select subject_ids on every day, then auto-fill (or just build) every week.
+    Returns the issues, prefixed with their week."""
+    issues: List[str] = []
+    # Extended week by week, so each week does not re-read the weeks filled before it
+    history = TeachingHistory(schedule_service.subject_service.get_subject_graph())
+    for week_num in range(1, len(schedule.weeks) + 1):
+        if subject_ids:
+            for day_index in range(len(schedule.weeks[week_num - 1].days)):
+                schedule_service.set_day_subjects(schedule, week_num, day_index, list(subject_ids))
+        if auto_fill:
+            success, error, days_with_issues = schedule_service.auto_fill_week_times_and_lessons(
+                schedule, week_num, use_solver=use_solver, history=history
+            )
+            if not success:
+                issues.append(f"Tuần {week_num}: {error}")
+            issues.extend(f"Tuần {week_num}, {day} ({day_date}): {suggestion}"
+                          for day, day_date, suggestion in days_with_issues)
+        else:
+            success, _, errors = schedule_service.build_week_items(schedule, week_num)
+            issues.extend(f"Tuần {week_num}: {error}" for error in errors)
+            history.record_week(week_num, schedule.weeks[week_num - 1].days)
+    return issues
+
+
+# Per worker process, set by init_unit_worker
+_worker = {}
+
+
+def init_unit_worker(base_data_dir: str, settings_file: Optional[str],
+                     subjects_data: List[dict], template_data: dict):
+    """Pool initializer: services over the shared subjects, and the empty schedule"""
+    from .schedule_service import ScheduleService
+    settings = None
+    if settings_file:
+        from ..config.settings import Settings
+        settings = Settings(settings_file)
+    file_service = FileService(base_data_dir=base_data_dir)
+    subject_service = SubjectSnapshotService(file_service, [Subject.from_dict(d) for d in subjects_data])
+    _worker["service"] = ScheduleService(file_service, subject_service, settings)
+    _worker["template"] = template_data
+
+
+def fill_unit(schedule_service, template_data: dict, job: tuple) -> Dict:
+    """Fill one unit from the template.
+    job = (schedule id, name, subject ids, auto_fill, use_solver)"""
+    schedule_id, name, subject_ids, auto_fill, use_solver = job
+    started = _time.perf_counter()
+    schedule = Schedule.from_dict(template_data)
+    schedule.schedule_id, schedule.name = schedule_id, name
+    schedule.created_at = schedule.updated_at = datetime.now()
+    try:
+        issues = populate_schedule(schedule_service, schedule, subject_ids, auto_fill, use_solver)
+    except Exception as e:
+        logger.error(f"Error filling unit {name}: {e}")
+        return {"error": f"Lỗi: {str(e)}", "seconds": _time.perf_counter() - started}
+    return {"schedule": schedule.to_dict(), "issues": issues, "seconds": _time.perf_counter() - started}
+
+
+def fill_unit_job(job: tuple) -> Dict:
+    """fill_unit with the service and template set up by init_unit_worker. Runs in worker processes"""
+    return fill_unit(_worker["service"], _worker["template"], job)
+
+
+class BatchScheduleGenerator:
+    """Creates, auto-fills and saves one schedule per unit"""
+
+    def __init__(self, schedule_service, max_workers: Optional[int] = None):
+        self.schedule_service = schedule_service
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1) - 1)
+
+    def generate(self, start_date: date, end_date: date, units: Sequence[UnitSpec],
+                 workers: Optional[int] = None,
+                 progress: Optional[ProgressCallback] = None) -> List[UnitResult]:
+        """Create a schedule per unit over [start_date, end_date] and save it.
+        progress is called in this process after each unit is saved (in completion order).
+        Returns the results in unit order."""
+        service = self.schedule_service
+        # Raises ValueError for an invalid range, like create_schedule
+        template = service.create_schedule(start_date, end_date)
+        batch_id = template.schedule_id
+        jobs = [
+            (f"{batch_id}_{i + 1:02d}", unit.name, list(unit.subject_ids), unit.auto_fill, unit.use_solver)
+            for i, unit in enumerate(units)
+        ]
+        initargs = (
+            str(service.file_service.base_dir),
+            str(service.settings.config_file) if service.settings is not None else None,
+            [s.to_dict() for s in service.subject_service.get_all_subjects()],
+            template.to_dict(),
+        )
+        workers = min(workers or self.max_workers, len(jobs))
+        if workers > 1 and service.file_service.load_all_resources():
+            # Units filled at the same time would not see each other's resource bookings
+            logger.info("Batch %s: resources defined, filling units one after another", batch_id)
+            workers = 1
+        results: List[Optional[UnitResult]] = [None] * len(jobs)
+        done = 0
+
+        def finish(index: int, outcome: Dict):
+            nonlocal done
+            result = self._save_unit(units[index].name, outcome)
+            results[index] = result
+            done += 1
+            logger.info("Batch %s: unit %s/%s %s (%.2fs)%s", batch_id, done, len(jobs), result.name,
+                        result.seconds, f": {result.error}" if result.error else "")
+            if progress:
+                progress(done, len(jobs), result)
+
+        if workers <= 1:
+            # This service: its resource calendar includes the units saved so far
+            for index, job in enumerate(jobs):
+                finish(index, fill_unit(service, initargs[3], job))
+        else:
+            # spawn: never fork the GUI process (Qt and the logging thread are not fork-safe)
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=init_unit_worker, initargs=initargs) as executor:
+                futures = {executor.submit(fill_unit_job, job): index for index, job in enumerate(jobs)}
+                for future in as_completed(futures):
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        outcome = {"error": f"Lỗi: {str(e)}", "seconds": 0.0}
+                    finish(futures[future], outcome)
+        return results
+
+    def _save_unit(self, name: str, outcome: Dict) -> UnitResult:
+        result = UnitResult(name=name, seconds=outcome.get("seconds", 0.0))
+        if "error" in outcome:
+            result.error = outcome["error"]
+            return result
+        schedule = Schedule.from_dict(outcome["schedule"])
+        result.schedule_id, result.weeks, result.issues = schedule.schedule_id, len(schedule.weeks), outcome["issues"]
+        success, error = self.schedule_service.save_schedule(schedule)
+        if not success:
+            result.error = error
+        return result
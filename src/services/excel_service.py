@@ -2,8 +2,8 @@
 
 from typing import List, Optional, Dict, Any
 from pathlib import Path
-import openpyxl
-from openpyxl import load_workbook
+# openpyxl is imported inside the import/export methods so that loading the services
+# (and starting the application) does not pay for it
 from ..models.subject import Subject
 from ..models.lesson import Lesson
 from ..utils.logger import setup_logger
@@ -18,6 +18,8 @@ class ExcelService:
     def import_subject_from_excel(file_path: str) -> Optional[Subject]:
         """Import subject from Excel file"""
         try:
+            from openpyxl import load_workbook
+            
             workbook = load_workbook(file_path, data_only=True)
             sheet = workbook.active
             
@@ -78,6 +80,8 @@ class ExcelService:
     def create_subject_template(file_path: str):
         """Create Excel template for subject import"""
         try:
+            import openpyxl
+            
             workbook = openpyxl.Workbook()
             sheet = workbook.active
             sheet.title = "Subject Template"
@@ -106,6 +110,7 @@ class ExcelService:
     def export_schedule_to_excel(schedule, file_path: str) -> bool:
         """Export schedule to Excel file"""
         try:
+            import openpyxl
             from ..models.schedule import Schedule
             
             workbook = openpyxl.Workbook()
@@ -157,3 +162,43 @@ class ExcelService:
             logger.error(f"Error exporting schedule to Excel: {e}")
             return False
 
+    
+    @staticmethod
+    def export_changes_to_excel(diff, file_path: str) -> bool:
+        """Export the changed days of a ScheduleDiff (change notice) to Excel file"""
+        try:
+            import openpyxl
+            from .schedule_diff import CHANGE_LABELS
+            
+            workbook = openpyxl.Workbook()
+            sheet = workbook.active
+            sheet.title = "Thay đổi"
+            
+            # Header
+            sheet.cell(row=1, column=1, value="Thông báo thay đổi thời khóa biểu")
+            if diff.new_name:
+                sheet.cell(row=1, column=2, value=diff.new_name)
+            sheet.cell(row=2, column=1, value=f"{len(diff.days)} ngày thay đổi, {diff.change_count} thay đổi")
+            
+            row = 4
+            for column, title in enumerate(["Tuần", "Ngày", "Thay đổi", "Trước", "Sau"], start=1):
+                sheet.cell(row=row, column=column, value=title)
+            row += 1
+            
+            # Only the changed days
+            for day in diff.days:
+                for change in day.changes:
+                    sheet.cell(row=row, column=1, value=day.week_number)
+                    sheet.cell(row=row, column=2, value=day.day_date.strftime("%Y-%m-%d"))
+                    sheet.cell(row=row, column=3, value=CHANGE_LABELS[change.kind])
+                    sheet.cell(row=row, column=4, value=change.old_text)
+                    sheet.cell(row=row, column=5, value=change.new_text)
+                    row += 1
+            
+            workbook.save(file_path)
+            logger.info(f"Successfully exported schedule changes to Excel: {file_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error exporting schedule changes to Excel: {e}")
+            return False
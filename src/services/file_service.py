@@ -1,21 +1,135 @@
 """File service for JSON operations and directory management"""
 
+import gzip
+import hashlib
 import json
 import os
+import shutil
+import stat
+import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Tuple
 from datetime import datetime
 
 from ..models.subject import Subject
-from ..models.schedule import Schedule
+from ..models.schedule import Schedule, WeekTemplate
 from ..models.user import User
+from ..models.resource import Resource
+from ..utils.metrics import timed, increment
+
+# Optional faster JSON parsers for reading data files (output is identical to json.loads)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+try:
+    import ujson
+    UJSON_AVAILABLE = True
+except ImportError:
+    UJSON_AVAILABLE = False
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Serialization profiles for data files (chosen in Settings). File names stay "*.json";
+# readers detect the profile from the file content, so mixed directories load fine.
+STORAGE_PROFILE_PRETTY = "pretty"  # indent=2, human-readable (default)
+STORAGE_PROFILE_COMPACT = "compact"  # no whitespace
+STORAGE_PROFILE_GZIP = "gzip"  # compact + gzip
+STORAGE_PROFILE_ZSTD = "zstd"  # compact + zstandard (needs the zstandard package)
+STORAGE_PROFILES = (
+    STORAGE_PROFILE_PRETTY, STORAGE_PROFILE_COMPACT, STORAGE_PROFILE_GZIP, STORAGE_PROFILE_ZSTD,
+)
+DEFAULT_STORAGE_PROFILE = STORAGE_PROFILE_PRETTY
+
+# Per-lesson material manifest file name and blob store folder (under materials/)
+MATERIAL_MANIFEST_NAME = "manifest.json"
+MATERIAL_BLOBS_DIR_NAME = "_blobs"
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def detect_storage_profile(raw: bytes) -> str:
+    """Return the storage profile a data file was written with (from its first bytes)."""
+    if raw[:2] == _GZIP_MAGIC:
+        return STORAGE_PROFILE_GZIP
+    if raw[:4] == _ZSTD_MAGIC:
+        return STORAGE_PROFILE_ZSTD
+    if b"\n" in raw[:64]:
+        return STORAGE_PROFILE_PRETTY
+    return STORAGE_PROFILE_COMPACT
+
+
+def _decode_json_bytes(raw: bytes) -> Any:
+    """Decompress (if needed) and parse JSON file content, using orjson/ujson when installed."""
+    if raw[:2] == _GZIP_MAGIC:
+        raw = gzip.decompress(raw)
+    elif raw[:4] == _ZSTD_MAGIC:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("File is zstd-compressed but the zstandard package is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    if UJSON_AVAILABLE:
+        return ujson.loads(raw.decode('utf-8'))
+    return json.loads(raw.decode('utf-8'))
+
+
+def _encode_json_bytes(data: Any, profile: str) -> bytes:
+    """Serialize data for a storage profile."""
+    if profile == STORAGE_PROFILE_PRETTY:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+    if profile == STORAGE_PROFILE_GZIP:
+        return gzip.compress(raw, compresslevel=6)
+    if profile == STORAGE_PROFILE_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return raw
+
+
+@timed("file_service.read")
+def _read_json_file(path: Path) -> Any:
+    """Read and parse a JSON data file in any storage profile."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    increment("file_service.bytes_read", len(raw))
+    return _decode_json_bytes(raw)
+
+
+def _make_read_only(path: Path):
+    """Clear the write bits of a material blob (shared by its hard links)."""
+    os.chmod(path, stat.S_IMODE(os.stat(path).st_mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def _make_writable(path: Path):
+    os.chmod(path, stat.S_IMODE(os.stat(path).st_mode) | stat.S_IWUSR)
+
+
+def _unlink_file(path: Path):
+    """Delete a file, clearing its read-only flag first where the OS requires it (Windows)."""
+    try:
+        path.unlink()
+    except PermissionError:
+        _make_writable(path)
+        path.unlink()
+
+
+def _remove_read_only(func, path, _exc_info):
+    """shutil.rmtree error handler for read-only material links."""
+    _make_writable(Path(path))
+    func(path)
 
 
 class FileService:
     """Service for file operations"""
     
-    def __init__(self, base_data_dir: Optional[str] = None):
-        """Initialize file service with base data directory"""
+    def __init__(self, base_data_dir: Optional[str] = None,
+                 storage_profile: Optional[str] = None):
+        """Initialize file service with base data directory and storage profile for writes"""
         if base_data_dir is None:
             # Default to src/data relative to project root
             base_data_dir = Path(__file__).parent.parent.parent / "src" / "data"
@@ -24,8 +138,20 @@ class FileService:
         self.subjects_dir = self.base_dir / "subjects"
         self.schedules_dir = self.base_dir / "schedules"
         self.materials_dir = self.base_dir / "materials"
+        self.blobs_dir = self.materials_dir / MATERIAL_BLOBS_DIR_NAME
         self.users_file = self.base_dir / "users.json"
+        self.resources_file = self.base_dir / "resources.json"
+        self.week_templates_file = self.schedules_dir / "week_templates.json"
         self.fixed_subjects_file = self.subjects_dir / "fixed_subjects.json"
+        self.storage_profile = DEFAULT_STORAGE_PROFILE
+        self.set_storage_profile(storage_profile or DEFAULT_STORAGE_PROFILE)
+        # Serializes writes with the background storage migration
+        self._write_lock = threading.RLock()
+        # Bumped on every subject save/delete made through this instance
+        self._subjects_generation = 0
+        # Same for schedules and resources
+        self._schedules_generation = 0
+        self._resources_generation = 0
         
         # Create directories if they don't exist
         self._ensure_directories()
@@ -36,17 +162,85 @@ class FileService:
         self.schedules_dir.mkdir(parents=True, exist_ok=True)
         self.materials_dir.mkdir(parents=True, exist_ok=True)
     
+    def set_storage_profile(self, profile: str):
+        """Set the serialization profile used for subsequent writes"""
+        if profile not in STORAGE_PROFILES:
+            print(f"Unknown storage profile '{profile}', using {DEFAULT_STORAGE_PROFILE}")
+            profile = DEFAULT_STORAGE_PROFILE
+        if profile == STORAGE_PROFILE_ZSTD and not ZSTD_AVAILABLE:
+            print("zstandard is not installed, using gzip storage profile")
+            profile = STORAGE_PROFILE_GZIP
+        self.storage_profile = profile
+
+    @timed("file_service.write")
+    def _write_json_file(self, path: Path, data: Any):
+        """Write data in the current storage profile (via a temp file, so readers never see a partial file)"""
+        raw = _encode_json_bytes(data, self.storage_profile)
+        increment("file_service.bytes_written", len(raw))
+        tmp_path = path.with_name(path.name + ".tmp")
+        with self._write_lock:
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+
+    def _iter_data_files(self) -> List[Path]:
+        """All data files managed by this service (fixed_subjects.json is hand-edited and left alone)"""
+        files = [p for p in self.subjects_dir.glob("*.json") if p != self.fixed_subjects_file]
+        files.extend(self.schedules_dir.glob("*.json"))
+        for path in (self.users_file, self.resources_file):
+            if path.exists():
+                files.append(path)
+        return files
+
+    def migrate_storage_profile(self, profile: Optional[str] = None,
+                                progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, int]:
+        """Rewrite existing data files into a storage profile (default: the current one).
+        Files already in that profile are skipped. progress(done, total) is called per file.
+        Returns counts {"rewritten", "skipped", "failed"}."""
+        if profile is not None:
+            self.set_storage_profile(profile)
+        target = self.storage_profile
+        counts = {"rewritten": 0, "skipped": 0, "failed": 0}
+        files = self._iter_data_files()
+        for index, path in enumerate(files, 1):
+            try:
+                with self._write_lock:
+                    with open(path, 'rb') as f:
+                        raw = f.read()
+                    if detect_storage_profile(raw) == target:
+                        counts["skipped"] += 1
+                    else:
+                        self._write_json_file(path, _decode_json_bytes(raw))
+                        counts["rewritten"] += 1
+            except Exception as e:
+                print(f"Error migrating {path.name}: {e}")
+                counts["failed"] += 1
+            if progress:
+                progress(index, len(files))
+        return counts
+
+    def start_storage_migration(self, profile: Optional[str] = None,
+                                on_done: Optional[Callable[[Dict[str, int]], None]] = None) -> threading.Thread:
+        """Run migrate_storage_profile in a background thread. on_done(counts) runs in that thread."""
+        def run():
+            counts = self.migrate_storage_profile(profile)
+            if on_done:
+                on_done(counts)
+        thread = threading.Thread(target=run, name="storage-migration", daemon=True)
+        thread.start()
+        return thread
+
     # Subject operations
     def save_subject(self, subject: Subject) -> bool:
         """Save subject to JSON files"""
         try:
             # Save detailed subject file
             subject_file = self.subjects_dir / f"{subject.subject_id}.json"
-            with open(subject_file, 'w', encoding='utf-8') as f:
-                json.dump(subject.to_dict(), f, ensure_ascii=False, indent=2)
+            self._write_json_file(subject_file, subject.to_dict())
             
             # Update summary file
             self._update_subjects_summary(subject)
+            self._subjects_generation += 1
             
             return True
         except Exception as e:
@@ -60,14 +254,21 @@ class FileService:
             if not subject_file.exists():
                 return None
             
-            with open(subject_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(subject_file)
             
             return Subject.from_dict(data)
         except Exception as e:
             print(f"Error loading subject: {e}")
             return None
     
+    def subjects_catalog_version(self) -> Tuple[int, int, int]:
+        """Changes whenever a subject is saved or deleted (also by another process: summary file stamp)"""
+        try:
+            stat = (self.subjects_dir / "subjects_summary.json").stat()
+            return self._subjects_generation, stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return self._subjects_generation, 0, 0
+    
     def load_all_subjects(self) -> List[Subject]:
         """Load all subjects"""
         subjects = []
@@ -77,8 +278,7 @@ class FileService:
             return subjects
         
         try:
-            with open(summary_file, 'r', encoding='utf-8') as f:
-                summary_data = json.load(f)
+            summary_data = _read_json_file(summary_file)
             
             for subject_summary in summary_data.get("subjects", []):
                 subject_id = subject_summary.get("subject_id")
@@ -99,14 +299,15 @@ class FileService:
             if subject_file.exists():
                 subject_file.unlink()
             
-            # Delete materials directory
+            # Delete materials directory, then drop blobs only this subject used
             materials_subject_dir = self.materials_dir / subject_id
             if materials_subject_dir.exists():
-                import shutil
-                shutil.rmtree(materials_subject_dir)
+                shutil.rmtree(materials_subject_dir, onerror=_remove_read_only)
+                self.collect_material_garbage()
             
             # Update summary
             self._update_subjects_summary_after_delete(subject_id)
+            self._subjects_generation += 1
             
             return True
         except Exception as e:
@@ -118,8 +319,7 @@ class FileService:
         summary_file = self.subjects_dir / "subjects_summary.json"
         
         if summary_file.exists():
-            with open(summary_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(summary_file)
         else:
             data = {"subjects": []}
         
@@ -138,8 +338,7 @@ class FileService:
         data["subjects"] = subjects
         data["updated_at"] = datetime.now().isoformat()
         
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json_file(summary_file, data)
     
     def _update_subjects_summary_after_delete(self, subject_id: str):
         """Remove subject from summary after deletion"""
@@ -149,15 +348,13 @@ class FileService:
             return
         
         try:
-            with open(summary_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(summary_file)
             
             subjects = data.get("subjects", [])
             data["subjects"] = [s for s in subjects if s.get("subject_id") != subject_id]
             data["updated_at"] = datetime.now().isoformat()
             
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self._write_json_file(summary_file, data)
         except Exception as e:
             print(f"Error updating summary after delete: {e}")
 
@@ -167,8 +364,7 @@ class FileService:
             return []
 
         try:
-            with open(self.fixed_subjects_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(self.fixed_subjects_file)
             return data.get("fixed_subjects", []) or []
         except Exception as e:
             print(f"Error loading fixed subjects: {e}")
@@ -180,17 +376,29 @@ class FileService:
         try:
             # Save detailed schedule file
             schedule_file = self.schedules_dir / f"{schedule.schedule_id}.json"
-            with open(schedule_file, 'w', encoding='utf-8') as f:
-                json.dump(schedule.to_dict(), f, ensure_ascii=False, indent=2)
+            self._write_json_file(schedule_file, schedule.to_dict())
             
             # Update summary file
             self._update_schedules_summary(schedule)
+            self._schedules_generation += 1
             
             return True
         except Exception as e:
             print(f"Error saving schedule: {e}")
             return False
     
+    def schedules_catalog_version(self) -> Tuple[int, int, int]:
+        """Changes whenever a schedule is saved or deleted (also by another process: summary file stamp)"""
+        try:
+            stat = (self.schedules_dir / "schedules_summary.json").stat()
+            return self._schedules_generation, stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return self._schedules_generation, 0, 0
+    
+    def schedule_exists(self, schedule_id: str) -> bool:
+        """True if the schedule has been saved"""
+        return (self.schedules_dir / f"{schedule_id}.json").exists()
+    
     def load_schedule(self, schedule_id: str) -> Optional[Schedule]:
         """Load schedule from JSON file"""
         try:
@@ -198,14 +406,21 @@ class FileService:
             if not schedule_file.exists():
                 return None
             
-            with open(schedule_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(schedule_file)
             
             return Schedule.from_dict(data)
         except Exception as e:
             print(f"Error loading schedule: {e}")
             return None
     
+    def load_schedule_file(self, path: str) -> Optional[Schedule]:
+        """Load a schedule from any schedule file (e.g. a copy of an earlier save)"""
+        try:
+            return Schedule.from_dict(_read_json_file(Path(path)))
+        except Exception as e:
+            print(f"Error loading schedule file: {e}")
+            return None
+    
     def load_all_schedules(self) -> List[Schedule]:
         """Load all schedules"""
         schedules = []
@@ -215,8 +430,7 @@ class FileService:
             return schedules
         
         try:
-            with open(summary_file, 'r', encoding='utf-8') as f:
-                summary_data = json.load(f)
+            summary_data = _read_json_file(summary_file)
             
             for schedule_summary in summary_data.get("schedules", []):
                 schedule_id = schedule_summary.get("schedule_id")
@@ -238,6 +452,7 @@ class FileService:
             
             # Update summary
             self._update_schedules_summary_after_delete(schedule_id)
+            self._schedules_generation += 1
             
             return True
         except Exception as e:
@@ -249,8 +464,7 @@ class FileService:
         summary_file = self.schedules_dir / "schedules_summary.json"
         
         if summary_file.exists():
-            with open(summary_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(summary_file)
         else:
             data = {"schedules": []}
         
@@ -268,8 +482,7 @@ class FileService:
         data["schedules"] = schedules
         data["updated_at"] = datetime.now().isoformat()
         
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        self._write_json_file(summary_file, data)
     
     def _update_schedules_summary_after_delete(self, schedule_id: str):
         """Remove schedule from summary after deletion"""
@@ -279,49 +492,184 @@ class FileService:
             return
         
         try:
-            with open(summary_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(summary_file)
             
             schedules = data.get("schedules", [])
             data["schedules"] = [s for s in schedules if s.get("schedule_id") != schedule_id]
             data["updated_at"] = datetime.now().isoformat()
             
-            with open(summary_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self._write_json_file(summary_file, data)
         except Exception as e:
             print(f"Error updating schedule summary after delete: {e}")
     
     # Material operations
+    # Each material file is stored once per content in materials/_blobs/<xx>/<sha256><ext>.
+    # A lesson folder holds manifest.json (name -> blob) and, where the file system allows it,
+    # a hard link per material under its original name. Blobs (and so their links) are
+    # read-only, since editing one lesson's file in place would change it for every lesson;
+    # a blob whose content no longer matches its hash is replaced when the file is saved again.
+    # Blobs no longer referenced by any manifest are removed by collect_material_garbage().
     def get_material_path(self, subject_id: str, lesson_id: str) -> Path:
         """Get path for lesson materials"""
         return self.materials_dir / subject_id / lesson_id
     
+    def _material_manifest_path(self, subject_id: str, lesson_id: str) -> Path:
+        """Get manifest path for lesson materials"""
+        return self.get_material_path(subject_id, lesson_id) / MATERIAL_MANIFEST_NAME
+    
+    def _load_material_manifest(self, subject_id: str, lesson_id: str) -> List[Dict[str, Any]]:
+        """Load material entries ({name, sha256, blob, size}) for a lesson"""
+        manifest_file = self._material_manifest_path(subject_id, lesson_id)
+        if not manifest_file.exists():
+            return []
+        try:
+            return _read_json_file(manifest_file).get("materials", []) or []
+        except Exception as e:
+            print(f"Error loading material manifest: {e}")
+            return []
+    
+    def _save_material_manifest(self, subject_id: str, lesson_id: str, entries: List[Dict[str, Any]]):
+        """Save material entries for a lesson"""
+        data = {"materials": entries, "updated_at": datetime.now().isoformat()}
+        self._write_json_file(self._material_manifest_path(subject_id, lesson_id), data)
+    
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        """SHA-256 of a file, read in chunks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _store_blob(self, source_path: Path) -> Tuple[str, Path]:
+        """Store file content in the blob store (no copy if already present). Returns (sha256, blob path)"""
+        digest = self._hash_file(source_path)
+        blob_path = self.blobs_dir / digest[:2] / f"{digest}{source_path.suffix.lower()}"
+        if blob_path.exists() and self._hash_file(blob_path) == digest:
+            return digest, blob_path
+        if blob_path.exists():
+            # Changed in place through a link despite being read-only: the other links
+            # keep the changed content, the blob gets the content of its hash again
+            print(f"Material blob {blob_path.name} was modified, storing it again")
+            _make_writable(blob_path)
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob_path.with_name(blob_path.name + ".tmp")
+        shutil.copy2(source_path, tmp_path)
+        _make_read_only(tmp_path)
+        os.replace(tmp_path, blob_path)
+        return digest, blob_path
+    
+    @staticmethod
+    def _link_blob(blob_path: Path, dest_path: Path) -> bool:
+        """Hard-link a blob under its lesson file name. Returns False if links are not supported"""
+        if dest_path.exists():
+            if os.path.samefile(blob_path, dest_path):
+                return True
+            _unlink_file(dest_path)
+        try:
+            os.link(blob_path, dest_path)
+            return True
+        except OSError:
+            return False
+    
     def save_material(self, subject_id: str, lesson_id: str, file_path: str) -> Optional[str]:
-        """Save a material file for a lesson"""
+        """Save a material file for a lesson (content stored once, shared by all lessons using it)"""
         try:
-            material_dir = self.get_material_path(subject_id, lesson_id)
-            material_dir.mkdir(parents=True, exist_ok=True)
-            
             source_path = Path(file_path)
             if not source_path.exists():
                 return None
             
+            material_dir = self.get_material_path(subject_id, lesson_id)
+            material_dir.mkdir(parents=True, exist_ok=True)
+            
+            digest, blob_path = self._store_blob(source_path)
             dest_path = material_dir / source_path.name
-            import shutil
-            shutil.copy2(source_path, dest_path)
+            linked = self._link_blob(blob_path, dest_path)
+            
+            entries = [
+                e for e in self._load_material_manifest(subject_id, lesson_id)
+                if e.get("name") != source_path.name
+            ]
+            entries.append({
+                "name": source_path.name,
+                "sha256": digest,
+                "blob": blob_path.relative_to(self.materials_dir).as_posix(),
+                "size": blob_path.stat().st_size,
+            })
+            self._save_material_manifest(subject_id, lesson_id, entries)
             
-            return str(dest_path)
+            return str(dest_path if linked else blob_path)
         except Exception as e:
             print(f"Error saving material: {e}")
             return None
     
+    def remove_material(self, subject_id: str, lesson_id: str, name: str) -> bool:
+        """Remove a material from a lesson (the blob is kept until garbage collection)"""
+        try:
+            entries = self._load_material_manifest(subject_id, lesson_id)
+            remaining = [e for e in entries if e.get("name") != name]
+            material_file = self.get_material_path(subject_id, lesson_id) / name
+            if material_file.exists():
+                _unlink_file(material_file)
+            if len(remaining) != len(entries):
+                self._save_material_manifest(subject_id, lesson_id, remaining)
+            return True
+        except Exception as e:
+            print(f"Error removing material: {e}")
+            return False
+    
     def get_materials(self, subject_id: str, lesson_id: str) -> List[str]:
         """Get list of material file paths for a lesson"""
         material_dir = self.get_material_path(subject_id, lesson_id)
         if not material_dir.exists():
             return []
         
-        return [str(f) for f in material_dir.iterdir() if f.is_file()]
+        paths = []
+        names = set()
+        for entry in self._load_material_manifest(subject_id, lesson_id):
+            name = entry.get("name")
+            names.add(name)
+            linked = material_dir / name
+            paths.append(str(linked if linked.exists() else self.materials_dir / entry.get("blob", "")))
+        # Files copied before manifests existed
+        for f in material_dir.iterdir():
+            if f.is_file() and f.name != MATERIAL_MANIFEST_NAME and f.name not in names:
+                paths.append(str(f))
+        return paths
+    
+    def collect_material_garbage(self) -> Dict[str, int]:
+        """Delete blobs not referenced by any lesson manifest.
+        Returns counts {"removed", "kept", "freed_bytes"}."""
+        counts = {"removed": 0, "kept": 0, "freed_bytes": 0}
+        if not self.blobs_dir.exists():
+            return counts
+        live = set()
+        for manifest_file in self.materials_dir.glob(f"*/*/{MATERIAL_MANIFEST_NAME}"):
+            try:
+                for entry in _read_json_file(manifest_file).get("materials", []) or []:
+                    if entry.get("blob"):
+                        live.add(entry["blob"])
+            except Exception as e:
+                # An unreadable manifest could reference anything: do not delete blobs
+                print(f"Error reading material manifest {manifest_file}: {e}")
+                return counts
+        for blob_path in self.blobs_dir.glob("*/*"):
+            if not blob_path.is_file():
+                continue
+            if blob_path.relative_to(self.materials_dir).as_posix() in live:
+                # Removing a link may have cleared the flag shared with the blob (Windows)
+                _make_read_only(blob_path)
+                counts["kept"] += 1
+                continue
+            try:
+                size = blob_path.stat().st_size
+                _unlink_file(blob_path)
+                counts["removed"] += 1
+                counts["freed_bytes"] += size
+            except OSError as e:
+                print(f"Error removing material blob {blob_path.name}: {e}")
+        return counts
     
     # User operations
     def save_user(self, user: User) -> bool:
@@ -346,8 +694,7 @@ class FileService:
                 "updated_at": datetime.now().isoformat()
             }
             
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self._write_json_file(self.users_file, data)
             
             return True
         except Exception as e:
@@ -368,11 +715,116 @@ class FileService:
             return []
         
         try:
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json_file(self.users_file)
             
             return [User.from_dict(user_data) for user_data in data.get("users", [])]
         except Exception as e:
             print(f"Error loading users: {e}")
             return []
-
+    
+    # Resource operations (all resources in one file, like users)
+    def save_resource(self, resource: Resource) -> bool:
+        """Save (add or replace) a resource"""
+        try:
+            resources = [r for r in self.load_all_resources() if r.resource_id != resource.resource_id]
+            resources.append(resource)
+            self._write_resources(resources)
+            return True
+        except Exception as e:
+            print(f"Error saving resource: {e}")
+            return False
+    
+    def load_resource(self, resource_id: str) -> Optional[Resource]:
+        """Load resource by ID"""
+        for resource in self.load_all_resources():
+            if resource.resource_id == resource_id:
+                return resource
+        return None
+    
+    def load_all_resources(self) -> List[Resource]:
+        """Load all resources"""
+        if not self.resources_file.exists():
+            return []
+        
+        try:
+            data = _read_json_file(self.resources_file)
+            
+            return [Resource.from_dict(resource_data) for resource_data in data.get("resources", [])]
+        except Exception as e:
+            print(f"Error loading resources: {e}")
+            return []
+    
+    def delete_resource(self, resource_id: str) -> bool:
+        """Delete resource"""
+        try:
+            self._write_resources([r for r in self.load_all_resources() if r.resource_id != resource_id])
+            return True
+        except Exception as e:
+            print(f"Error deleting resource: {e}")
+            return False
+    
+    def resources_version(self) -> Tuple[int, int, int]:
+        """Changes whenever a resource is saved or deleted (also by another process: file stamp)"""
+        try:
+            stat = self.resources_file.stat()
+            return self._resources_generation, stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return self._resources_generation, 0, 0
+    
+    def _write_resources(self, resources: List[Resource]):
+        data = {
+            "resources": [r.to_dict() for r in resources],
+            "updated_at": datetime.now().isoformat()
+        }
+        self._write_json_file(self.resources_file, data)
+        self._resources_generation += 1
+    
+    # Week template operations (all templates in one file, like resources)
+    def save_week_template(self, template: WeekTemplate) -> bool:
+        """Save (add or replace) a week template"""
+        try:
+            templates = [t for t in self.load_all_week_templates() if t.template_id != template.template_id]
+            templates.append(template)
+            self._write_week_templates(templates)
+            return True
+        except Exception as e:
+            print(f"Error saving week template: {e}")
+            return False
+    
+    def load_week_template(self, template_id: str) -> Optional[WeekTemplate]:
+        """Load week template by ID"""
+        for template in self.load_all_week_templates():
+            if template.template_id == template_id:
+                return template
+        return None
+    
+    def load_all_week_templates(self) -> List[WeekTemplate]:
+        """Load all week templates"""
+        if not self.week_templates_file.exists():
+            return []
+        
+        try:
+            data = _read_json_file(self.week_templates_file)
+            
+            return [WeekTemplate.from_dict(template_data) for template_data in data.get("week_templates", [])]
+        except Exception as e:
+            print(f"Error loading week templates: {e}")
+            return []
+    
+    def delete_week_template(self, template_id: str) -> bool:
+        """Delete week template (schedules keep their own copy of it)"""
+        try:
+            self._write_week_templates(
+                [t for t in self.load_all_week_templates() if t.template_id != template_id]
+            )
+            return True
+        except Exception as e:
+            print(f"Error deleting week template: {e}")
+            return False
+    
+    def _write_week_templates(self, templates: List[WeekTemplate]):
+        data = {
+            "week_templates": [t.to_dict() for t in templates],
+            "updated_at": datetime.now().isoformat()
+        }
+        self._write_json_file(self.week_templates_file, data)
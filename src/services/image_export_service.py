@@ -0,0 +1,248 @@
+"""PNG export for schedules.
+
+Every week is drawn as one tile from the shared week layout. Tiles are either
+saved as one PNG per week ("pages") or appended to a single tall PNG that is
+written to disk row by row ("tall"), so only the tiles being drawn are held in
+memory. Many weeks are drawn in a process pool; fonts are loaded once per
+process.
+"""
+
+import multiprocessing
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from ..models.schedule import Schedule, WeekSchedule
+from .schedule_layout import layout_week
+from ..utils.logger import setup_logger
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+logger = setup_logger()
+
+IMAGE_MODE_PAGES = "pages"
+IMAGE_MODE_TALL = "tall"
+
+TIME_WIDTH = 110
+CELL_WIDTH = 200
+CELL_HEIGHT = 100
+HEADER_HEIGHT = 40
+TITLE_HEIGHT = 36
+TILE_WIDTH = TIME_WIDTH + 6 * CELL_WIDTH
+
+# Weeks drawn in-process below this count (starting workers costs more)
+PARALLEL_MIN_WEEKS = 32
+# Tiles in flight per worker in tall mode (bounds memory while streaming)
+TILES_IN_FLIGHT_PER_WORKER = 2
+
+DAY_HEADERS = ["Thứ Hai", "Thứ Ba", "Thứ Tư", "Thứ Năm", "Thứ Sáu", "Thứ Bảy"]
+
+# TrueType fonts with Vietnamese glyphs, tried in order; PIL's default font otherwise
+FONT_CANDIDATES = ("DejaVuSans.ttf", "arial.ttf", "Arial.ttf", "LiberationSans-Regular.ttf")
+
+# size -> font, per process
+_fonts: Dict[int, object] = {}
+
+
+def get_font(size: int = 14):
+    """Return a cached ImageFont of the given size"""
+    font = _fonts.get(size)
+    if font is None:
+        for name in FONT_CANDIDATES:
+            try:
+                font = ImageFont.truetype(name, size)
+                break
+            except OSError:
+                continue
+        else:
+            font = ImageFont.load_default()
+        _fonts[size] = font
+    return font
+
+
+def tile_height(week: WeekSchedule) -> int:
+    """Pixel height of a week tile"""
+    return TITLE_HEIGHT + HEADER_HEIGHT + max(layout_week(week).row_count, 1) * CELL_HEIGHT
+
+
+def draw_week_tile(week: WeekSchedule):
+    """Draw one week (title, day header, time column and lesson cells) as a PIL image"""
+    week_layout = layout_week(week)
+    img = Image.new('RGB', (TILE_WIDTH, tile_height(week)), color='white')
+    draw = ImageDraw.Draw(img)
+    title_font = get_font(16)
+    font = get_font(12)
+
+    draw.text((10, 8), f"Tuần {week.week_number}: {week.start_date} - {week.end_date}",
+              fill='black', font=title_font)
+
+    top = TITLE_HEIGHT
+    draw.rectangle([0, top, TIME_WIDTH, top + HEADER_HEIGHT], fill='gray', outline='black')
+    for i, day_name in enumerate(DAY_HEADERS):
+        x = TIME_WIDTH + i * CELL_WIDTH
+        draw.rectangle([x, top, x + CELL_WIDTH, top + HEADER_HEIGHT], fill='gray', outline='black')
+        draw.text((x + 10, top + HEADER_HEIGHT // 2 - 8), day_name, fill='white', font=font)
+
+    top += HEADER_HEIGHT
+    for row in range(week_layout.row_count):
+        y = top + row * CELL_HEIGHT
+        draw.rectangle([0, y, TIME_WIDTH, y + CELL_HEIGHT], outline='black')
+        draw.text((5, y + 5), week_layout.row_label(row), fill='black', font=font)
+
+    # A lesson covers all rows of its time span
+    for cell in week_layout.cells:
+        x = TIME_WIDTH + cell.col * CELL_WIDTH
+        y = top + cell.row * CELL_HEIGHT
+        draw.rectangle([x, y, x + CELL_WIDTH, y + cell.row_span * CELL_HEIGHT], outline='black')
+        draw.multiline_text((x + 5, y + 5), cell.text, fill='black', font=font)
+    return img
+
+
+def save_week_tiles(jobs: List[Tuple[dict, str]]) -> List[str]:
+    """Draw weeks (WeekSchedule.to_dict()) and save each to its path. Runs in worker processes."""
+    paths = []
+    for week_data, path in jobs:
+        draw_week_tile(WeekSchedule.from_dict(week_data)).save(path)
+        paths.append(path)
+    return paths
+
+
+def render_week_rows(week_data: dict) -> bytes:
+    """Draw a week and return its raw RGB pixels. Runs in worker processes."""
+    return draw_week_tile(WeekSchedule.from_dict(week_data)).tobytes()
+
+
+class StreamingPngWriter:
+    """Writes an 8-bit RGB PNG row by row without holding the whole image"""
+
+    def __init__(self, path: str, width: int, height: int):
+        self.width = width
+        self._file = open(path, "wb")
+        self._compressor = zlib.compressobj(6)
+        self._file.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+
+    def _chunk(self, kind: bytes, data: bytes):
+        self._file.write(struct.pack(">I", len(data)))
+        self._file.write(kind)
+        self._file.write(data)
+        self._file.write(struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    def write_rows(self, pixels: bytes):
+        """Append rows of raw RGB pixels (len must be a multiple of width * 3)"""
+        stride = self.width * 3
+        out = []
+        for offset in range(0, len(pixels), stride):
+            # filter type 0 (none) before every row
+            out.append(self._compressor.compress(b"\x00" + pixels[offset:offset + stride]))
+        data = b"".join(out)
+        if data:
+            self._chunk(b"IDAT", data)
+
+    def close(self):
+        self._chunk(b"IDAT", self._compressor.flush())
+        self._chunk(b"IEND", b"")
+        self._file.close()
+
+
+class ImageExportService:
+    """Service for exporting schedule weeks to PNG"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1) - 1)
+
+    @staticmethod
+    def page_path(file_path: str, week: WeekSchedule) -> str:
+        """Per-week file name in pages mode: <name>_tuan_<nn>.png"""
+        path = Path(file_path)
+        return str(path.with_name(f"{path.stem}_tuan_{week.week_number:02d}{path.suffix or '.png'}"))
+
+    def export_weeks(self, schedule: Schedule, file_path: str,
+                     week_indexes: Optional[Sequence[int]] = None,
+                     mode: str = IMAGE_MODE_PAGES,
+                     parallel: Optional[bool] = None) -> Tuple[bool, Optional[str], List[str]]:
+        """Export weeks (default: all) of a schedule.
+        pages: one PNG per week (exactly file_path when a single week is exported);
+        tall: one PNG with the weeks stacked vertically.
+        Returns (success, error, written paths)."""
+        if not PIL_AVAILABLE:
+            return False, "PIL/Pillow không được cài đặt. Vui lòng cài đặt: pip install Pillow", []
+        if week_indexes is None:
+            week_indexes = range(len(schedule.weeks))
+        weeks = [schedule.weeks[i] for i in week_indexes if 0 <= i < len(schedule.weeks)]
+        if not weeks:
+            return False, "Không có tuần nào để xuất", []
+
+        workers = 1
+        if parallel if parallel is not None else len(weeks) >= PARALLEL_MIN_WEEKS:
+            workers = min(self.max_workers, len(weeks))
+        try:
+            if mode == IMAGE_MODE_TALL:
+                paths = self._export_tall(weeks, file_path, workers)
+            else:
+                paths = self._export_pages(weeks, file_path, workers)
+        except Exception as e:
+            logger.error(f"Error exporting schedule image: {e}")
+            return False, f"Không thể xuất ảnh: {str(e)}", []
+        logger.info(f"Image export ({mode}, {len(weeks)} weeks, {workers} workers): {file_path}")
+        return True, None, paths
+
+    @staticmethod
+    def _executor(workers: int) -> ProcessPoolExecutor:
+        # spawn: never fork the GUI process (Qt and the logging thread are not fork-safe)
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _export_pages(self, weeks: List[WeekSchedule], file_path: str, workers: int) -> List[str]:
+        if len(weeks) == 1:
+            jobs = [(weeks[0].to_dict(), file_path)]
+        else:
+            jobs = [(week.to_dict(), self.page_path(file_path, week)) for week in weeks]
+        if workers <= 1:
+            return save_week_tiles(jobs)
+        # Workers save their own tiles, so no image data comes back to this process
+        chunk_size = max(1, -(-len(jobs) // (workers * 2)))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        with self._executor(workers) as executor:
+            return [path for chunk in executor.map(save_week_tiles, chunks) for path in chunk]
+
+    def _export_tall(self, weeks: List[WeekSchedule], file_path: str, workers: int) -> List[str]:
+        height = sum(tile_height(week) for week in weeks)
+        tmp_path = f"{file_path}.tmp"
+        writer = StreamingPngWriter(tmp_path, TILE_WIDTH, height)
+        try:
+            try:
+                for pixels in self._iter_tile_rows(weeks, workers):
+                    writer.write_rows(pixels)
+            finally:
+                writer.close()
+        except BaseException:
+            # Do not leave a large partial image behind
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        os.replace(tmp_path, file_path)
+        return [file_path]
+
+    def _iter_tile_rows(self, weeks: List[WeekSchedule], workers: int) -> Iterator[bytes]:
+        """Raw pixels of each week tile, in week order, with a bounded number in flight"""
+        if workers <= 1:
+            for week in weeks:
+                yield render_week_rows(week.to_dict())
+            return
+        window = workers * TILES_IN_FLIGHT_PER_WORKER
+        with self._executor(workers) as executor:
+            pending = []
+            for week in weeks:
+                pending.append(executor.submit(render_week_rows, week.to_dict()))
+                if len(pending) >= window:
+                    yield pending.pop(0).result()
+            for future in pending:
+                yield future.result()
@@ -0,0 +1,157 @@
+"""Lessons of a subject indexed by effective duration.
+
+Durations are kept sorted so "lessons whose duration lies in [lo, hi]" is two
+bisects plus the matches, instead of a scan of every lesson per scheduled item.
+Indexes are cached per subject and rebuilt only when its lessons or default
+duration change.
+"""
+
+import time as _time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+from ..models.subject import Subject
+from ..models.lesson import Lesson
+
+# Hours: durations closer than this are considered equal
+DURATION_EPSILON = 0.01
+# Subjects whose index is kept
+LESSON_INDEX_CACHE_SIZE = 128
+
+
+def subject_signature(subject: Subject) -> Tuple:
+    """Everything the index depends on (cheap: no duration lookups)"""
+    return (subject.default_duration, tuple((lesson.lesson_id, lesson.duration) for lesson in subject.lessons))
+
+
+class LessonDurationIndex:
+    """Lessons of one subject sorted by effective duration (default_duration when unset)"""
+
+    def __init__(self, subject: Subject):
+        # Equal durations keep the subject's lesson order
+        entries = sorted(
+            ((subject.get_lesson_duration(lesson), position, lesson) for position, lesson in enumerate(subject.lessons)),
+            key=lambda entry: entry[:2],
+        )
+        self.durations: List[float] = [entry[0] for entry in entries]
+        self.lessons: List[Lesson] = [entry[2] for entry in entries]
+        self._duration_of: Dict[str, float] = {lesson.lesson_id: d for d, _, lesson in entries}
+        self._lesson_of: Dict[str, Lesson] = {lesson.lesson_id: lesson for lesson in self.lessons}
+
+    def __len__(self) -> int:
+        return len(self.lessons)
+
+    def duration(self, lesson_id: str) -> Optional[float]:
+        return self._duration_of.get(lesson_id)
+
+    def lesson(self, lesson_id: str) -> Optional[Lesson]:
+        return self._lesson_of.get(lesson_id)
+
+    def between(self, low: float, high: float) -> Iterator[Tuple[float, Lesson]]:
+        """(duration, lesson) with low <= duration <= high (within DURATION_EPSILON), shortest first"""
+        start = bisect_left(self.durations, low - DURATION_EPSILON)
+        stop = bisect_right(self.durations, high + DURATION_EPSILON)
+        for i in range(start, stop):
+            yield self.durations[i], self.lessons[i]
+
+    def replacements(self, lesson_id: str, low_change: float, high_change: float) -> Iterator[Tuple[float, Lesson]]:
+        """(duration change, lesson) for lessons that change lesson_id's duration by a value
+        in [low_change, high_change]; the lesson itself and equal durations are skipped"""
+        current = self._duration_of.get(lesson_id)
+        if current is None:
+            return
+        for duration, lesson in self.between(current + low_change, current + high_change):
+            change = duration - current
+            if lesson.lesson_id != lesson_id and abs(change) > DURATION_EPSILON:
+                yield change, lesson
+
+
+class LessonIndexCache:
+    """LRU of LessonDurationIndex by subject id, checked against the subject's signature"""
+
+    def __init__(self, max_size: int = LESSON_INDEX_CACHE_SIZE):
+        self.max_size = max_size
+        self._indexes: "OrderedDict[str, Tuple[Tuple, LessonDurationIndex]]" = OrderedDict()
+
+    def get(self, subject: Subject) -> LessonDurationIndex:
+        signature = subject_signature(subject)
+        entry = self._indexes.get(subject.subject_id)
+        if entry is not None and entry[0] == signature:
+            self._indexes.move_to_end(subject.subject_id)
+            return entry[1]
+        index = LessonDurationIndex(subject)
+        self._indexes[subject.subject_id] = (signature, index)
+        self._indexes.move_to_end(subject.subject_id)
+        if len(self._indexes) > self.max_size:
+            self._indexes.popitem(last=False)
+        return index
+
+    def clear(self):
+        self._indexes.clear()
+
+
+def search_swap_combinations(slots: Sequence[Tuple[str, LessonDurationIndex]], gap: float,
+                             tolerance: float = 0.5, time_budget: float = 0.05, limit: int = 5,
+                             taken: Optional[Set[str]] = None) -> List[Tuple[float, List[Tuple[int, Lesson, float]]]]:
+    """Best sets of lesson replacements whose total duration change closes gap (hours).
+
+    slots: (current lesson id, index of its subject) for each replaceable item.
+    Depth-first over the slots (keep, or replace by a lesson from the index); a
+    branch is cut when the remaining slots cannot bring the total within
+    tolerance of gap. Lessons in taken (already in the day) and lessons chosen
+    for another slot are not used twice. Stops after time_budget seconds and
+    returns what was found so far. Returns up to limit
+    (remaining gap, [(slot, lesson, change), ...]) ranked by remaining gap, then
+    fewer swaps.
+    """
+    deadline = _time.perf_counter() + time_budget
+    # Largest possible decrease / increase of the slots from i onwards (for pruning)
+    span: List[Tuple[float, float]] = []
+    for lesson_id, index in slots:
+        current = index.duration(lesson_id)
+        if current is None or not index.durations:
+            span.append((0.0, 0.0))
+        else:
+            span.append((min(0.0, index.durations[0] - current), max(0.0, index.durations[-1] - current)))
+    reach_low = [0.0] * (len(slots) + 1)
+    reach_high = [0.0] * (len(slots) + 1)
+    for i in range(len(slots) - 1, -1, -1):
+        reach_low[i] = reach_low[i + 1] + span[i][0]
+        reach_high[i] = reach_high[i + 1] + span[i][1]
+
+    found: Dict[Tuple[Tuple[int, str], ...], Tuple[float, List[Tuple[int, Lesson, float]]]] = {}
+    chosen: List[Tuple[int, Lesson, float]] = []
+    used = set(taken or ())
+
+    def visit(i: int, remaining: float) -> bool:
+        """False once the time budget is spent"""
+        if _time.perf_counter() > deadline:
+            return False
+        if chosen and abs(remaining) <= tolerance + DURATION_EPSILON:
+            key = tuple((slot, lesson.lesson_id) for slot, lesson, _ in chosen)
+            found[key] = (round(remaining, 2), list(chosen))
+        if i == len(slots):
+            return True
+        # remaining must end within tolerance: the rest of the slots must be able to cover it
+        if remaining - tolerance > reach_high[i] + DURATION_EPSILON or remaining + tolerance < reach_low[i] - DURATION_EPSILON:
+            return True
+        if not visit(i + 1, remaining):
+            return False
+        lesson_id, index = slots[i]
+        low = remaining - tolerance - reach_high[i + 1]
+        high = remaining + tolerance - reach_low[i + 1]
+        for change, lesson in index.replacements(lesson_id, low, high):
+            if lesson.lesson_id in used:
+                continue
+            chosen.append((i, lesson, change))
+            used.add(lesson.lesson_id)
+            keep_going = visit(i + 1, remaining - change)
+            used.discard(lesson.lesson_id)
+            chosen.pop()
+            if not keep_going:
+                return False
+        return True
+
+    visit(0, gap)
+    ranked = sorted(found.values(), key=lambda entry: (abs(entry[0]), len(entry[1])))
+    return ranked[:limit]
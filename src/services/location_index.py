@@ -0,0 +1,101 @@
+"""Who uses a location when, across all saved schedules.
+
+Items with a location are kept per (location, date) sorted by start minute,
+with the longest item duration of the bucket. Items overlapping [start, end)
+start in (start - longest, end), so a query is two bisects plus the items in
+that window. Locations are compared case-insensitively without surrounding
+spaces. A schedule's entries are replaced as a whole when it is saved.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import date, time
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..models.schedule import Schedule
+
+
+def location_key(location: Optional[str]) -> str:
+    return (location or "").strip().casefold()
+
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+@dataclass(frozen=True, order=True)
+class LocationBooking:
+    """One schedule item at a location"""
+    start: int
+    end: int
+    schedule_id: str
+    schedule_name: str
+    subject_name: str
+    lesson_name: str
+    location: str
+
+    def describe(self, day_date: date) -> str:
+        span = f"{self.start // 60:02d}:{self.start % 60:02d}–{self.end // 60:02d}:{self.end % 60:02d}"
+        return (f"Địa điểm \"{self.location}\" ngày {day_date.isoformat()} {span} đã được dùng bởi "
+                f"\"{self.schedule_name}\" (môn \"{self.subject_name}\", bài \"{self.lesson_name}\").")
+
+
+class LocationIndex:
+    """Location bookings of many schedules, queried by (location, date, interval)"""
+
+    def __init__(self, schedules: Iterable[Schedule] = ()):
+        # (location key, date) -> (bookings sorted by (start, end, schedule id), longest duration)
+        self._buckets: Dict[Tuple[str, date], Tuple[List[Tuple[int, int, str, LocationBooking]], int]] = {}
+        # schedule id -> buckets holding its bookings
+        self._by_schedule: Dict[str, set] = {}
+        for schedule in schedules:
+            self.add_schedule(schedule)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries, _ in self._buckets.values())
+
+    def add_schedule(self, schedule: Schedule):
+        """Index the items of a schedule (replacing what was indexed for it)"""
+        self.remove_schedule(schedule.schedule_id)
+        name = schedule.name or schedule.schedule_id
+        keys = set()
+        for week in schedule.weeks:
+            for day in week.days:
+                for item in day.items:
+                    key = location_key(item.location)
+                    if not key or not item.subject_id:
+                        continue
+                    booking = LocationBooking(
+                        _minutes(item.start_time), _minutes(item.end_time), schedule.schedule_id, name,
+                        item.subject_name, item.lesson_name, item.location.strip(),
+                    )
+                    bucket_key = (key, day.date)
+                    entries, longest = self._buckets.get(bucket_key, ([], 0))
+                    insort(entries, (booking.start, booking.end, booking.schedule_id, booking))
+                    self._buckets[bucket_key] = (entries, max(longest, booking.end - booking.start))
+                    keys.add(bucket_key)
+        if keys:
+            self._by_schedule[schedule.schedule_id] = keys
+
+    def remove_schedule(self, schedule_id: str):
+        for bucket_key in self._by_schedule.pop(schedule_id, ()):
+            entries, _ = self._buckets[bucket_key]
+            entries = [entry for entry in entries if entry[2] != schedule_id]
+            if entries:
+                self._buckets[bucket_key] = (entries, max(end - start for start, end, _, _ in entries))
+            else:
+                del self._buckets[bucket_key]
+
+    def overlapping(self, location: Optional[str], day_date: date, start: time, end: time,
+                    exclude_schedule_id: Optional[str] = None) -> List[LocationBooking]:
+        """Bookings of location on day_date overlapping [start, end), other than exclude_schedule_id's"""
+        bucket = self._buckets.get((location_key(location), day_date))
+        if bucket is None:
+            return []
+        entries, longest = bucket
+        lo, hi = _minutes(start), _minutes(end)
+        first = bisect_left(entries, (lo - longest + 1,))
+        last = bisect_left(entries, (hi,))
+        return [
+            booking for s, e, schedule_id, booking in entries[first:last]
+            if e > lo and schedule_id != exclude_schedule_id
+        ]
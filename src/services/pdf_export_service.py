@@ -0,0 +1,304 @@
+"""PDF export for schedules.
+
+Each week is rendered as its own PDF fragment (from the shared week layout) and
+the fragments are merged into the final document. Fragments are cached by a
+hash of the week content, so re-exporting after a small change only renders the
+changed weeks, and when many weeks need rendering they are split into chunks
+rendered in a process pool.
+
+Merging needs pypdf; without it the whole schedule is rendered in one pass as
+before (no cache, single process).
+"""
+
+import hashlib
+import io
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from ..models.schedule import Schedule, WeekSchedule
+from .schedule_layout import layout_week, week_version
+from ..utils.logger import setup_logger
+
+try:
+    from pypdf import PdfReader, PdfWriter
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+logger = setup_logger()
+
+# Bump when the week rendering changes so cached fragments are not reused
+PDF_RENDER_VERSION = 1
+# Below this many weeks to render, starting worker processes costs more than it saves
+# (a week renders in a few ms; spawning a worker takes a few hundred)
+PARALLEL_MIN_WEEKS = 64
+# Fragments kept in memory / on disk
+MEMORY_CACHE_SIZE = 256
+DISK_CACHE_MAX_FILES = 2000
+
+DAY_HEADERS = ["Thứ Hai", "Thứ Ba", "Thứ Tư", "Thứ Năm", "Thứ Sáu", "Thứ Bảy"]
+
+
+def _week_flowables(week: WeekSchedule, styles) -> list:
+    """Heading and time-aligned table for one week"""
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.units import cm
+
+    flowables = [
+        Paragraph(f"<b>Tuần {week.week_number}: {week.start_date} - {week.end_date}</b>", styles['Heading2']),
+        Spacer(1, 0.3*cm),
+    ]
+
+    # First column is the time interval, lessons span their rows
+    week_layout = layout_week(week)
+    cells = week_layout.cell_map()
+    data = [[""] + DAY_HEADERS]
+    for row in range(week_layout.row_count):
+        line = [week_layout.row_label(row)]
+        for col in range(week_layout.day_count):
+            cell = cells.get((row, col))
+            line.append(cell.text if cell is not None else "")
+        data.append(line)
+
+    style = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ]
+    for cell in week_layout.cells:
+        if cell.row_span > 1:
+            # +1 for the header row and the time column
+            style.append(('SPAN', (cell.col + 1, cell.row + 1), (cell.col + 1, cell.row + cell.row_span)))
+
+    table = Table(data, colWidths=[2.2*cm] + [3.5*cm]*6, repeatRows=1)
+    table.setStyle(TableStyle(style))
+    flowables.append(table)
+    flowables.append(Spacer(1, 0.5*cm))
+    return flowables
+
+
+def _change_flowables(diff, styles) -> list:
+    """Heading and before/after table for each changed day of a ScheduleDiff"""
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.units import cm
+    from .schedule_diff import CHANGE_LABELS
+
+    flowables = [Paragraph(f"{len(diff.days)} ngày thay đổi, {diff.change_count} thay đổi", styles['Normal']),
+                 Spacer(1, 0.3*cm)]
+    for day in diff.days:
+        week = f"Tuần {day.week_number}: " if day.week_number else ""
+        flowables.append(Paragraph(f"<b>{week}{day.day_date}</b>", styles['Heading3']))
+        data = [["Thay đổi", "Trước", "Sau"]]
+        data.extend([CHANGE_LABELS[c.kind], c.old_text, c.new_text] for c in day.changes)
+        table = Table(data, colWidths=[2.5*cm, 11.5*cm, 11.5*cm], repeatRows=1)
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]))
+        flowables.append(table)
+        flowables.append(Spacer(1, 0.4*cm))
+    return flowables
+
+
+def _title_flowables(title: str, styles) -> list:
+    from reportlab.platypus import Paragraph, Spacer
+    from reportlab.lib.units import cm
+    return [Paragraph(f"<b>{title}</b>", styles['Title']), Spacer(1, 0.5*cm)]
+
+
+def _build_pdf(target, flowables: list):
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.platypus import SimpleDocTemplate
+    SimpleDocTemplate(target, pagesize=landscape(A4)).build(flowables)
+
+
+def _render_title(title: str) -> bytes:
+    from reportlab.lib.styles import getSampleStyleSheet
+    buffer = io.BytesIO()
+    _build_pdf(buffer, _title_flowables(title, getSampleStyleSheet()))
+    return buffer.getvalue()
+
+
+def render_week_fragments(week_dicts: List[dict]) -> List[bytes]:
+    """Render each week (as WeekSchedule.to_dict()) to its own PDF. Runs in worker processes."""
+    from reportlab.lib.styles import getSampleStyleSheet
+    styles = getSampleStyleSheet()
+    fragments = []
+    for week_data in week_dicts:
+        buffer = io.BytesIO()
+        _build_pdf(buffer, _week_flowables(WeekSchedule.from_dict(week_data), styles))
+        fragments.append(buffer.getvalue())
+    return fragments
+
+
+def week_content_hash(week: WeekSchedule) -> str:
+    """Hash of everything a week fragment depends on (heading and layout content)"""
+    payload = repr((PDF_RENDER_VERSION, week.week_number, week.start_date, week.end_date, week_version(week)))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PdfExportService:
+    """Service for exporting schedules to PDF"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_workers: Optional[int] = None):
+        """cache_dir: where week fragments are kept between sessions (memory only if None)"""
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 1) - 1)
+        self._fragments: "OrderedDict[str, bytes]" = OrderedDict()
+        # Counts from the last export: {"weeks", "rendered", "cached", "workers"}
+        self.last_export_stats: Dict[str, int] = {}
+
+    def export_schedule(self, schedule: Schedule, file_path: str,
+                        parallel: Optional[bool] = None) -> Tuple[bool, Optional[str]]:
+        """Export all weeks of a schedule to file_path.
+        parallel=None renders in a process pool when enough weeks are not cached."""
+        title = schedule.name or 'Thời khóa biểu'
+        try:
+            if not PYPDF_AVAILABLE:
+                self._export_single_pass(schedule, title, file_path)
+                return True, None
+            self._export_merged(schedule, title, file_path, parallel)
+            return True, None
+        except Exception as e:
+            logger.error(f"Error exporting schedule to PDF: {e}")
+            return False, f"Không thể xuất PDF: {str(e)}"
+
+    def export_changes(self, diff, file_path: str) -> Tuple[bool, Optional[str]]:
+        """Export the changed days of a ScheduleDiff (change notice) to file_path.
+        Only changed days are rendered, so the work follows the size of the change."""
+        try:
+            from reportlab.lib.styles import getSampleStyleSheet
+            styles = getSampleStyleSheet()
+            title = f"Thông báo thay đổi: {diff.new_name or 'Thời khóa biểu'}"
+            _build_pdf(file_path, _title_flowables(title, styles) + _change_flowables(diff, styles))
+            return True, None
+        except Exception as e:
+            logger.error(f"Error exporting schedule changes to PDF: {e}")
+            return False, f"Không thể xuất PDF: {str(e)}"
+
+    def _export_single_pass(self, schedule: Schedule, title: str, file_path: str):
+        from reportlab.lib.styles import getSampleStyleSheet
+        styles = getSampleStyleSheet()
+        story = _title_flowables(title, styles)
+        for week in schedule.weeks:
+            story.extend(_week_flowables(week, styles))
+        _build_pdf(file_path, story)
+        self.last_export_stats = {"weeks": len(schedule.weeks), "rendered": len(schedule.weeks),
+                                  "cached": 0, "workers": 1}
+
+    def _export_merged(self, schedule: Schedule, title: str, file_path: str, parallel: Optional[bool]):
+        hashes = [week_content_hash(week) for week in schedule.weeks]
+        fragments: Dict[str, bytes] = {}
+        missing: List[Tuple[str, WeekSchedule]] = []
+        pending = set()
+        for week, key in zip(schedule.weeks, hashes):
+            if key in fragments or key in pending:
+                continue
+            cached = self._get_cached(key)
+            if cached is not None:
+                fragments[key] = cached
+            else:
+                pending.add(key)
+                missing.append((key, week))
+
+        workers = 1
+        if missing:
+            use_pool = parallel if parallel is not None else len(missing) >= PARALLEL_MIN_WEEKS
+            week_dicts = [week.to_dict() for _, week in missing]
+            if use_pool and self.max_workers > 1:
+                workers = min(self.max_workers, len(missing))
+                rendered = self._render_in_pool(week_dicts, workers)
+            else:
+                rendered = render_week_fragments(week_dicts)
+            for (key, _), data in zip(missing, rendered):
+                fragments[key] = data
+                self._put_cached(key, data)
+            self._prune_disk_cache()
+
+        writer = PdfWriter()
+        for data in [_render_title(title)] + [fragments[key] for key in hashes]:
+            for page in PdfReader(io.BytesIO(data)).pages:
+                writer.add_page(page)
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            writer.write(f)
+        os.replace(tmp_path, file_path)
+
+        self.last_export_stats = {"weeks": len(hashes), "rendered": len(missing),
+                                  "cached": len(hashes) - len(missing), "workers": workers}
+        logger.info(f"PDF export {file_path}: {self.last_export_stats}")
+
+    def _render_in_pool(self, week_dicts: List[dict], workers: int) -> List[bytes]:
+        """Render weeks in contiguous chunks (about two per worker) and return them in order"""
+        chunk_size = max(1, -(-len(week_dicts) // (workers * 2)))
+        chunks = [week_dicts[i:i + chunk_size] for i in range(0, len(week_dicts), chunk_size)]
+        # spawn: never fork the GUI process (Qt and the logging thread are not fork-safe)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            results = list(executor.map(render_week_fragments, chunks))
+        return [fragment for chunk in results for fragment in chunk]
+
+    def _cache_file(self, key: str) -> Optional[Path]:
+        return self.cache_dir / f"{key}.pdf" if self.cache_dir else None
+
+    def _get_cached(self, key: str) -> Optional[bytes]:
+        data = self._fragments.get(key)
+        if data is not None:
+            self._fragments.move_to_end(key)
+            return data
+        path = self._cache_file(key)
+        if path is not None and path.exists():
+            try:
+                data = path.read_bytes()
+            except OSError:
+                return None
+            self._remember(key, data)
+            return data
+        return None
+
+    def _put_cached(self, key: str, data: bytes):
+        self._remember(key, data)
+        path = self._cache_file(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic: other processes (CLI workers) may read the same fragment
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache PDF fragment: {e}")
+
+    def _remember(self, key: str, data: bytes):
+        self._fragments[key] = data
+        self._fragments.move_to_end(key)
+        if len(self._fragments) > MEMORY_CACHE_SIZE:
+            self._fragments.popitem(last=False)
+
+    def _prune_disk_cache(self):
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return
+        files = list(self.cache_dir.glob("*.pdf"))
+        if len(files) <= DISK_CACHE_MAX_FILES:
+            return
+        files.sort(key=lambda p: p.stat().st_mtime)
+        for path in files[:len(files) - DISK_CACHE_MAX_FILES]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
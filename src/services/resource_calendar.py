@@ -0,0 +1,123 @@
+"""Resource use per day as minute bitmaps.
+
+A day has 1440 slots of SLOT_MINUTES; an interval books every slot it touches.
+Lesson times are whole minutes (auto-fill produces times such as 07:45), so
+with one-minute slots back-to-back lessons never share a slot and the bitmap
+check is exact; a day is still a single int per level. For each (resource, date)
+the calendar keeps one int per usage level: bit s of level k is set when more
+than k lessons use the resource in slot s. A resource with capacity c can take
+one more lesson in a set of slots exactly when level c - 1 has none of them,
+so the check is one AND whatever the number of bookings; booking and
+releasing touch at most c levels.
+"""
+
+from datetime import date, time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from ..models.schedule import Schedule, ScheduleItem
+
+SLOT_MINUTES = 1
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+def _minutes(t: time) -> int:
+    return t.hour * 60 + t.minute
+
+
+def slot_mask(start: time, end: time) -> int:
+    """Bits of the slots touched by [start, end)"""
+    first = _minutes(start) // SLOT_MINUTES
+    last = min(-(-_minutes(end) // SLOT_MINUTES), SLOTS_PER_DAY)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+class ResourceCalendar:
+    """Usage levels per (resource id, date), with the bookings of each schedule so it can be replaced"""
+
+    def __init__(self, capacities: Dict[str, int]):
+        self.capacities = capacities
+        self._levels: Dict[Tuple[str, date], List[int]] = {}
+        # schedule id -> (resource id, date, mask) booked for it
+        self._by_schedule: Dict[str, List[Tuple[str, date, int]]] = {}
+        # Keys whose level list is shared with a copy (copied before the first change)
+        self._shared: set = set()
+
+    def _own(self, key: Tuple[str, date]) -> Optional[List[int]]:
+        levels = self._levels.get(key)
+        if levels is not None and key in self._shared:
+            levels = self._levels[key] = list(levels)
+            self._shared.discard(key)
+        return levels
+
+    def capacity(self, resource_id: str) -> int:
+        return max(1, self.capacities.get(resource_id, 1))
+
+    def fits(self, resource_id: str, day_date: date, mask: int) -> bool:
+        """True if one more lesson can use the resource in every slot of mask"""
+        levels = self._levels.get((resource_id, day_date))
+        capacity = self.capacity(resource_id)
+        return levels is None or len(levels) < capacity or not levels[capacity - 1] & mask
+
+    def busy(self, resource_ids: Iterable[str], day_date: date, start: time, end: time) -> List[str]:
+        """Resources of resource_ids that cannot take a lesson at [start, end)"""
+        mask = slot_mask(start, end)
+        return [r for r in resource_ids if not self.fits(r, day_date, mask)]
+
+    def book(self, resource_id: str, day_date: date, mask: int, schedule_id: Optional[str] = None):
+        levels = self._own((resource_id, day_date))
+        if levels is None:
+            levels = self._levels[(resource_id, day_date)] = []
+        carry = mask
+        for k in range(len(levels)):
+            # Slots already at level k move up one level
+            levels[k], carry = levels[k] | carry, levels[k] & carry
+            if not carry:
+                break
+        if carry:
+            levels.append(carry)
+        if schedule_id is not None:
+            self._by_schedule.setdefault(schedule_id, []).append((resource_id, day_date, mask))
+
+    def release(self, resource_id: str, day_date: date, mask: int):
+        levels = self._own((resource_id, day_date))
+        if not levels:
+            return
+        for k in range(len(levels) - 1, -1, -1):
+            # Levels are nested, so the highest level set in a slot is its count
+            taken = levels[k] & mask
+            levels[k] &= ~taken
+            mask &= ~taken
+        while levels and not levels[-1]:
+            levels.pop()
+        if not levels:
+            del self._levels[(resource_id, day_date)]
+
+    def add_schedule(self, schedule: Schedule, requirements: Callable[[ScheduleItem], Iterable[str]]):
+        """Book the items of a schedule (replacing its previous bookings).
+        requirements(item) gives the resource ids an item needs."""
+        self.remove_schedule(schedule.schedule_id)
+        for week in schedule.weeks:
+            for day in week.days:
+                for item in day.items:
+                    if not item.subject_id:
+                        continue
+                    mask = slot_mask(item.start_time, item.end_time)
+                    for resource_id in requirements(item):
+                        self.book(resource_id, day.date, mask, schedule.schedule_id)
+
+    def remove_schedule(self, schedule_id: str):
+        for resource_id, day_date, mask in self._by_schedule.pop(schedule_id, ()):
+            self.release(resource_id, day_date, mask)
+
+    def excluding(self, schedule_id: str) -> "ResourceCalendar":
+        """Copy without one schedule's bookings, for checks and tentative bookings while that
+        schedule is edited (days are shared until either side changes them; the copy does not
+        track bookings per schedule)"""
+        view = ResourceCalendar(self.capacities)
+        view._levels = dict(self._levels)
+        self._shared = set(self._levels)
+        view._shared = set(self._levels)
+        for resource_id, day_date, mask in self._by_schedule.get(schedule_id, ()):
+            view.release(resource_id, day_date, mask)
+        return view
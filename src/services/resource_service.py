@@ -0,0 +1,90 @@
+"""Resource service for CRUD operations (instructors, equipment)"""
+
+from typing import List, Optional
+from ..models.resource import Resource, RESOURCE_KINDS
+from .file_service import FileService
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class ResourceService:
+    """Service for resource management"""
+
+    def __init__(self, file_service: Optional[FileService] = None):
+        """Initialize resource service"""
+        self.file_service = file_service or FileService()
+
+    def create_resource(self, resource: Resource) -> tuple[bool, Optional[str]]:
+        """Create a new resource"""
+        try:
+            error = self._validate_resource(resource)
+            if error:
+                return False, error
+
+            if self.file_service.save_resource(resource):
+                logger.info(f"Created resource: {resource.name} ({resource.resource_id})")
+                return True, None
+            else:
+                return False, "Lỗi khi lưu nguồn lực"
+
+        except Exception as e:
+            logger.error(f"Error creating resource: {e}")
+            return False, f"Lỗi: {str(e)}"
+
+    def update_resource(self, resource: Resource) -> tuple[bool, Optional[str]]:
+        """Update an existing resource"""
+        try:
+            if not self.file_service.load_resource(resource.resource_id):
+                return False, "Nguồn lực không tồn tại"
+
+            error = self._validate_resource(resource)
+            if error:
+                return False, error
+
+            from datetime import datetime
+            resource.updated_at = datetime.now()
+
+            if self.file_service.save_resource(resource):
+                logger.info(f"Updated resource: {resource.name} ({resource.resource_id})")
+                return True, None
+            else:
+                return False, "Lỗi khi lưu nguồn lực"
+
+        except Exception as e:
+            logger.error(f"Error updating resource: {e}")
+            return False, f"Lỗi: {str(e)}"
+
+    def delete_resource(self, resource_id: str) -> tuple[bool, Optional[str]]:
+        """Delete a resource (subjects still listing it simply stop requiring it)"""
+        try:
+            if not self.file_service.load_resource(resource_id):
+                return False, "Nguồn lực không tồn tại"
+
+            if self.file_service.delete_resource(resource_id):
+                logger.info(f"Deleted resource: {resource_id}")
+                return True, None
+            else:
+                return False, "Lỗi khi xóa nguồn lực"
+
+        except Exception as e:
+            logger.error(f"Error deleting resource: {e}")
+            return False, f"Lỗi: {str(e)}"
+
+    def get_resource(self, resource_id: str) -> Optional[Resource]:
+        """Get resource by ID"""
+        return self.file_service.load_resource(resource_id)
+
+    def get_all_resources(self) -> List[Resource]:
+        """Get all resources"""
+        return self.file_service.load_all_resources()
+
+    def _validate_resource(self, resource: Resource) -> Optional[str]:
+        """Validate resource data"""
+        if not resource.name or not resource.name.strip():
+            return "Tên nguồn lực là bắt buộc"
+        if resource.kind not in RESOURCE_KINDS:
+            return "Loại nguồn lực không hợp lệ"
+        if not isinstance(resource.capacity, int) or resource.capacity < 1:
+            return "Số lượng đáp ứng đồng thời phải từ 1 trở lên"
+        return None
@@ -0,0 +1,150 @@
+"""Differences between two schedules (or two saves of one schedule), day by day.
+
+Days are matched by date (Schedule.get_day, no search) and their item lists
+compared directly, which stops at the first difference; only days that differ
+are compared item by item. Items are matched by content; what is left on both
+sides at the same time is a changed item, the rest added or removed. The
+change notice exports (Excel/PDF) only contain the changed days.
+"""
+
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, time
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..models.schedule import Schedule, DaySchedule, ScheduleItem
+
+CHANGE_LABELS = {"added": "Thêm", "removed": "Xóa", "changed": "Sửa"}
+
+# What an item shows in a timetable: (start, end, subject id, lesson id, subject, lesson, location)
+ItemKey = Tuple[time, time, str, str, str, str, Optional[str]]
+
+
+def item_key(item: ScheduleItem) -> ItemKey:
+    return (item.start_time, item.end_time, item.subject_id, item.lesson_id,
+            item.subject_name, item.lesson_name, item.location)
+
+
+def _item_text(item: Optional[ScheduleItem]) -> str:
+    if item is None:
+        return ""
+    text = f"{item.start_time.strftime('%H:%M')} - {item.end_time.strftime('%H:%M')} {item.subject_name}"
+    if item.lesson_name and item.lesson_name != item.subject_name:
+        text += f": {item.lesson_name}"
+    if item.location:
+        text += f" ({item.location})"
+    return text
+
+
+@dataclass(frozen=True)
+class ItemChange:
+    """One item added, removed or changed (same time, other content)"""
+    kind: str  # Key of CHANGE_LABELS
+    old: Optional[ScheduleItem] = None
+    new: Optional[ScheduleItem] = None
+
+    @property
+    def start_time(self) -> time:
+        return (self.new or self.old).start_time
+
+    @property
+    def old_text(self) -> str:
+        return _item_text(self.old)
+
+    @property
+    def new_text(self) -> str:
+        return _item_text(self.new)
+
+    def describe(self) -> str:
+        label = CHANGE_LABELS[self.kind]
+        if self.kind == "added":
+            return f"{label}: {self.new_text}"
+        if self.kind == "removed":
+            return f"{label}: {self.old_text}"
+        return f"{label}: {self.old_text} → {self.new_text}"
+
+
+@dataclass
+class DayDiff:
+    """Changes of one date, in start time order"""
+    day_date: date
+    week_number: Optional[int]
+    changes: List[ItemChange] = field(default_factory=list)
+
+
+@dataclass
+class ScheduleDiff:
+    """Changed days of new compared with old, by date"""
+    old_name: Optional[str]
+    new_name: Optional[str]
+    days: List[DayDiff] = field(default_factory=list)
+    unchanged_days: int = 0
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.days
+
+    @property
+    def change_count(self) -> int:
+        return sum(len(day.changes) for day in self.days)
+
+    def summary_lines(self) -> List[str]:
+        lines = []
+        for day in self.days:
+            week = f"Tuần {day.week_number}, " if day.week_number else ""
+            lines.extend(f"{week}{day.day_date.isoformat()}: {change.describe()}" for change in day.changes)
+        return lines
+
+
+def diff_day_items(old_items: List[ScheduleItem], new_items: List[ScheduleItem]) -> List[ItemChange]:
+    """Item changes from old_items to new_items, in start time order"""
+    unchanged = Counter(map(item_key, old_items)) & Counter(map(item_key, new_items))
+    removed, added = [], []
+    for items, left in ((old_items, removed), (new_items, added)):
+        matched = Counter(unchanged)
+        for item in items:
+            key = item_key(item)
+            if matched[key]:
+                matched[key] -= 1
+            else:
+                left.append(item)
+    changes = []
+    added_by_time: Dict[Tuple[time, time], List[ScheduleItem]] = {}
+    for item in added:
+        added_by_time.setdefault((item.start_time, item.end_time), []).append(item)
+    for item in removed:
+        same_time = added_by_time.get((item.start_time, item.end_time))
+        if same_time:
+            changes.append(ItemChange("changed", item, same_time.pop(0)))
+        else:
+            changes.append(ItemChange("removed", item))
+    changes.extend(ItemChange("added", new=item) for items in added_by_time.values() for item in items)
+    changes.sort(key=lambda change: (change.start_time, change.kind))
+    return changes
+
+
+def _days_with_week(schedule: Schedule) -> Iterator[Tuple[int, DaySchedule]]:
+    for week in schedule.weeks:
+        for day in week.days:
+            yield week.week_number, day
+
+
+def diff_schedules(old: Schedule, new: Schedule) -> ScheduleDiff:
+    """Days whose items differ between old and new (dates only in one of them included)"""
+    diff = ScheduleDiff(old.name, new.name)
+    seen = set()
+    for week_number, day in _days_with_week(new):
+        seen.add(day.date)
+        old_day = old.get_day(day.date)
+        if old_day is not None and old_day.items == day.items:
+            diff.unchanged_days += 1
+            continue
+        changes = diff_day_items(old_day.items if old_day is not None else [], day.items)
+        if changes:
+            diff.days.append(DayDiff(day.date, week_number, changes))
+        else:
+            diff.unchanged_days += 1
+    for week_number, old_day in _days_with_week(old):
+        if old_day.date not in seen and old_day.items:
+            diff.days.append(DayDiff(old_day.date, None, diff_day_items(old_day.items, [])))
+    diff.days.sort(key=lambda day: day.day_date)
+    return diff
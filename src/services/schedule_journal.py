@@ -0,0 +1,192 @@
+"""Append-only edit journal of a schedule, with undo/redo.
+
+Every edit appends one JSON line to schedules/journal/<schedule_id>.jsonl
+holding the days it changed, before and after (DaySchedule dicts). Undo and
+redo append a marker line. Day states are absolute, so replaying the log over
+the main document is safe even if the document already contains some of the
+edits (e.g. a crash between saving the document and resetting the log).
+
+The first line is a header; for a schedule never saved it carries the whole
+schedule, so a draft can be recovered. After JOURNAL_COMPACT_EVERY lines the
+log is compacted: the schedule is written as the main document (or into the
+header for a draft) and the log starts over. Undo history kept in memory is
+not affected; after a crash, it starts at the last compaction.
+"""
+
+import json
+import os
+from dataclasses import fields
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from ..models.schedule import Schedule, DaySchedule
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Log lines before the journal is folded into the schedule document
+JOURNAL_COMPACT_EVERY = 200
+
+# (week index, day index)
+DayKey = Tuple[int, int]
+
+
+def _restore_day(day: DaySchedule, data: dict):
+    """Set a day (in place, so views holding it stay valid) to a DaySchedule dict"""
+    restored = DaySchedule.from_dict(data, legacy=False)
+    for f in fields(DaySchedule):
+        setattr(day, f.name, getattr(restored, f.name))
+
+
+class ScheduleJournal:
+    """Edit log of one schedule; persist(schedule) writes the main document"""
+
+    def __init__(self, path: Path, persist: Callable[[Schedule], bool]):
+        self.path = Path(path)
+        self.persist = persist
+        # Entries: {"name", "days": [[week index, day index, before, after], ...]}
+        self._done: List[dict] = []
+        self._undone: List[dict] = []
+        self._lines = 0
+        # The schedule has a main document (else the header holds it)
+        self.saved = False
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._done)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._undone)
+
+    def start(self, schedule: Schedule, saved: bool):
+        """Begin a new log for schedule (saved: the main document is up to date)"""
+        self._write_header(schedule, saved)
+
+    def record(self, schedule: Schedule, name: str, days: Sequence[DayKey],
+               edit: Callable[[], tuple]) -> tuple:
+        """Run edit() (a service call returning (success, ...)) and log the days it changed.
+        Days are logged whatever the result: a failed edit may have changed some before failing."""
+        keys = [(w, d) for w, d in dict.fromkeys(days)
+                if 0 <= w < len(schedule.weeks) and 0 <= d < len(schedule.weeks[w].days)]
+        before = [schedule.weeks[w].days[d].to_dict() for w, d in keys]
+        result = edit()
+        changes = []
+        for (w, d), old in zip(keys, before):
+            new = schedule.weeks[w].days[d].to_dict()
+            if new != old:
+                changes.append([w, d, old, new])
+        if changes:
+            entry = {"name": name, "days": changes}
+            self._done.append(entry)
+            self._undone.clear()
+            self._append({"op": "do", **entry}, schedule)
+        return result
+
+    def undo(self, schedule: Schedule) -> Optional[str]:
+        """Revert the last edit; returns its name (None if nothing to undo)"""
+        if not self._done:
+            return None
+        entry = self._done.pop()
+        for w, d, old, _ in entry["days"]:
+            _restore_day(schedule.weeks[w].days[d], old)
+        self._undone.append(entry)
+        self._append({"op": "undo"}, schedule)
+        return entry["name"]
+
+    def redo(self, schedule: Schedule) -> Optional[str]:
+        """Re-apply the last undone edit; returns its name (None if nothing to redo)"""
+        if not self._undone:
+            return None
+        entry = self._undone.pop()
+        for w, d, _, new in entry["days"]:
+            _restore_day(schedule.weeks[w].days[d], new)
+        self._done.append(entry)
+        self._append({"op": "redo"}, schedule)
+        return entry["name"]
+
+    def compact(self, schedule: Schedule, saved: bool = False):
+        """Fold the log into the main document (saved: the caller has just written it; a draft
+        is folded into the header instead) and start over"""
+        if not saved and self.saved:
+            saved = self.persist(schedule)
+        self._write_header(schedule, saved)
+
+    def discard(self):
+        """Remove the log (schedule deleted or draft abandoned)"""
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def replay(self, schedule: Schedule, header: dict, lines: List[dict]):
+        """Apply logged lines (after the header) to schedule, rebuilding undo/redo.
+        Call compact() afterwards: new lines must not follow a torn one."""
+        self.saved = bool(header.get("saved"))
+        for line in lines:
+            op = line.get("op")
+            if op == "do":
+                entry = {"name": line.get("name", ""), "days": line.get("days", [])}
+                for w, d, _, new in entry["days"]:
+                    _restore_day(schedule.weeks[w].days[d], new)
+                self._done.append(entry)
+                self._undone.clear()
+            elif op == "undo" and self._done:
+                entry = self._done.pop()
+                for w, d, old, _ in entry["days"]:
+                    _restore_day(schedule.weeks[w].days[d], old)
+                self._undone.append(entry)
+            elif op == "redo" and self._undone:
+                entry = self._undone.pop()
+                for w, d, _, new in entry["days"]:
+                    _restore_day(schedule.weeks[w].days[d], new)
+                self._done.append(entry)
+        self._lines = len(lines)
+
+    def _write_header(self, schedule: Schedule, saved: bool):
+        header = {"op": "base", "schedule_id": schedule.schedule_id, "saved": saved}
+        if not saved:
+            header["schedule"] = schedule.to_dict()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._lines = 0
+        self.saved = saved
+
+    def _append(self, line: dict, schedule: Schedule):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._lines += 1
+        if self._lines >= JOURNAL_COMPACT_EVERY:
+            logger.info("Compacting journal of %s (%s lines)", schedule.schedule_id, self._lines)
+            self.compact(schedule)
+
+
+def read_journal(path: Path) -> Tuple[Optional[dict], List[dict]]:
+    """(header, lines) of a journal file; a torn last line (crash while writing) is ignored"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw_lines = f.read().splitlines()
+    except OSError:
+        return None, []
+    parsed: List[dict] = []
+    for raw in raw_lines:
+        if not raw.strip():
+            continue
+        try:
+            parsed.append(json.loads(raw))
+        except ValueError:
+            break
+    if not parsed or parsed[0].get("op") != "base":
+        return None, []
+    return parsed[0], parsed[1:]
+
+
+def journal_schedule_ids(journal_dir: Path) -> Dict[str, Path]:
+    """schedule id -> journal file, for every journal in journal_dir"""
+    return {path.stem: path for path in sorted(Path(journal_dir).glob("*.jsonl"))}
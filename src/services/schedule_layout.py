@@ -0,0 +1,124 @@
+"""Time-aligned week layout shared by the schedule viewer and the PDF/image exports.
+
+Rows are the elementary intervals between every start/end time used in the week,
+so lessons line up by time across days and a lesson covering several intervals
+gets a row span. Layouts are memoized by the week's content (its "version"): a
+week that has not changed - or another week with identical content - is not laid
+out again.
+"""
+
+from dataclasses import dataclass
+from datetime import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from ..models.schedule import WeekSchedule
+
+# Monday..Saturday are shown; Sunday has no lessons
+LAYOUT_DAY_COUNT = 6
+
+# Number of distinct week contents whose layout is kept
+LAYOUT_CACHE_SIZE = 256
+
+# (day index, start, end, subject_name, lesson_name) for every item in the week
+WeekKey = Tuple[Tuple[int, time, time, str, Optional[str]], ...]
+
+
+@dataclass(frozen=True)
+class GridCell:
+    """One occupied cell: the items starting in row for this day column, spanning row_span rows"""
+    row: int
+    col: int
+    row_span: int
+    start_time: time
+    end_time: time
+    lines: Tuple[str, ...]
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+@dataclass(frozen=True)
+class WeekLayout:
+    """Time-aligned grid for one week. boundaries has len(rows) + 1 entries."""
+    boundaries: Tuple[time, ...]
+    cells: Tuple[GridCell, ...]
+    day_count: int = LAYOUT_DAY_COUNT
+
+    @property
+    def row_count(self) -> int:
+        return max(len(self.boundaries) - 1, 0)
+
+    def row_label(self, row: int) -> str:
+        return f"{self.boundaries[row].strftime('%H:%M')} - {self.boundaries[row + 1].strftime('%H:%M')}"
+
+    def cell_map(self) -> Dict[Tuple[int, int], GridCell]:
+        """(row, col) of each cell's top-left position -> cell"""
+        return {(cell.row, cell.col): cell for cell in self.cells}
+
+
+def _label(subject_name: str, lesson_name: Optional[str]) -> str:
+    if lesson_name and lesson_name != subject_name:
+        return f"{subject_name}: {lesson_name}"
+    return subject_name
+
+
+def item_label(item) -> str:
+    """Text shown for an item in a grid cell (the time is given by the row)"""
+    return _label(item.subject_name, item.lesson_name)
+
+
+def week_version(week: WeekSchedule, day_count: int = LAYOUT_DAY_COUNT) -> WeekKey:
+    """Content key of a week: everything the layout depends on"""
+    return tuple(
+        (day_index, item.start_time, item.end_time, item.subject_name, item.lesson_name)
+        for day_index, day in enumerate(week.days[:day_count])
+        for item in day.items
+    )
+
+
+def layout_week(week: WeekSchedule, day_count: int = LAYOUT_DAY_COUNT) -> WeekLayout:
+    """Time-aligned layout of a week (memoized by week content)"""
+    return _layout_for_key(week_version(week, day_count), day_count)
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _layout_for_key(key: WeekKey, day_count: int) -> WeekLayout:
+    boundaries = sorted({t for _, start, end, _, _ in key for t in (start, end)})
+    if len(boundaries) == 1:
+        # Only zero-length items: keep one (empty) interval to put them in
+        boundaries.append(boundaries[0])
+    row_of = {t: i for i, t in enumerate(boundaries)}
+    last_row = max(len(boundaries) - 2, 0)
+
+    by_day: Dict[int, List[Tuple[time, time, str, Optional[str]]]] = {}
+    for day_index, start, end, subject_name, lesson_name in key:
+        by_day.setdefault(day_index, []).append((start, end, subject_name, lesson_name))
+
+    cells: List[GridCell] = []
+    for day_index in sorted(by_day):
+        # cell being filled for this day: [row, span, start, end, lines]
+        current = None
+        for start, end, subject_name, lesson_name in sorted(by_day[day_index], key=lambda x: (x[0], x[1])):
+            label = _label(subject_name, lesson_name)
+            row = min(row_of[start], last_row)
+            span = max(row_of[end] - row_of[start], 1)
+            if current is not None and start < current[3]:
+                # Overlaps the previous item of the day: share its cell
+                current[4].append(label)
+                if end > current[3]:
+                    current[3] = end
+                    current[1] = max(row_of[end] - current[0], 1)
+                continue
+            if current is not None:
+                cells.append(GridCell(current[0], day_index, current[1], current[2], current[3], tuple(current[4])))
+            current = [row, span, start, end, [label]]
+        if current is not None:
+            cells.append(GridCell(current[0], day_index, current[1], current[2], current[3], tuple(current[4])))
+
+    return WeekLayout(boundaries=tuple(boundaries), cells=tuple(cells), day_count=day_count)
+
+
+def clear_layout_cache():
+    """Forget all memoized layouts"""
+    _layout_for_key.cache_clear()
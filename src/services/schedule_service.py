@@ -1,15 +1,26 @@
 """Schedule service for creating and managing schedules"""
 
-from typing import List, Optional, Tuple, Dict, Set
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Dict, Set, Iterable, Callable
 from datetime import date, time, timedelta
 from ..models.schedule import (
-    Schedule, WeekSchedule, DaySchedule, ScheduleItem, DayOfWeek
+    Schedule, WeekSchedule, DaySchedule, ScheduleItem, DayOfWeek, WeekTemplate
 )
 from ..models.subject import Subject
 from ..models.lesson import Lesson
 from .file_service import FileService
 from .subject_service import SubjectService
+from .lesson_index import LessonIndexCache, search_swap_combinations
+from .week_planner import DayInput, plan_week, SOLVER_TIME_LIMIT
+from .sequencing import TeachingHistory, day_ordinal, sequencing_issues
+from .week_builder import BUILD_PARALLEL_MIN_WEEKS, build_weeks, build_weeks_in_pool
+from .location_index import LocationBooking, LocationIndex
+from .resource_calendar import ResourceCalendar, slot_mask
+from .schedule_diff import ScheduleDiff, diff_schedules
+from .schedule_journal import ScheduleJournal, journal_schedule_ids, read_journal
 from ..utils.logger import setup_logger
+from ..utils.metrics import timed
 from ..utils.date_utils import (
     get_week_start, get_week_end, get_weeks_in_range,
     is_first_thursday_of_month, time_duration, add_hours_to_time
@@ -28,6 +39,25 @@ logger = setup_logger()
 DIAGNOSTIC_START = "--- DIAGNOSTIC (copy from here to END and send when reporting errors) ---"
 DIAGNOSTIC_END = "--- END DIAGNOSTIC ---"
 
+# Edits that go through the journal (edit_schedule): name -> days they change as
+# (week index, day index), from the edit's arguments after the schedule
+JOURNALED_EDITS: Dict[str, Callable[..., List[Tuple[int, int]]]] = {
+    "set_day_subjects": lambda schedule, week_num, day_index, *_, **__: [(week_num - 1, day_index)],
+    "set_day_subject_time": lambda schedule, week_num, day_index, *_, **__: [(week_num - 1, day_index)],
+    "set_day_subject_lesson": lambda schedule, week_num, day_index, *_, **__: [(week_num - 1, day_index)],
+    "add_lesson_to_day": lambda schedule, week_num, day_index, *_, **__: [(week_num - 1, day_index)],
+    "copy_week_subjects_and_times": lambda schedule, from_week_num, to_week_num, **__: [
+        (to_week_num - 1, d) for d in range(len(schedule.weeks[to_week_num - 1].days))
+    ] if 1 <= to_week_num <= len(schedule.weeks) else [],
+    "apply_week_template": lambda schedule, template, week_nums, **__: [
+        (week_num - 1, d) for week_num in week_nums if 1 <= week_num <= len(schedule.weeks)
+        for d in range(len(schedule.weeks[week_num - 1].days))
+    ],
+    "auto_fill_week_times_and_lessons": lambda schedule, week_num, *_, **__: [
+        (week_num - 1, d) for d in range(len(schedule.weeks[week_num - 1].days))
+    ] if 1 <= week_num <= len(schedule.weeks) else [],
+}
+
 
 def _log_build_week_diagnostic(
     schedule: "Schedule",
@@ -123,6 +153,16 @@ class ScheduleService:
             for subject in self.fixed_subjects:
                 if subject.get("is_break"):
                     self.break_subject_names.add(subject.get("name", ""))
+        # Lessons of each subject sorted by duration, for adjustment suggestions
+        self._lesson_indexes = LessonIndexCache()
+        # (schedules catalog version, index) of location bookings across saved schedules
+        self._location_index: Optional[Tuple[Tuple[int, int, int], LocationIndex]] = None
+        # (version, calendar, resource names) of resource use across saved schedules, and
+        # (schedule id, version, calendar without that schedule) for the schedule being edited
+        self._resource_calendar: Optional[Tuple[tuple, ResourceCalendar, Dict[str, str]]] = None
+        self._resource_view: Optional[Tuple[str, tuple, ResourceCalendar]] = None
+        # schedule id -> edit journal of schedules being edited
+        self._journals: Dict[str, ScheduleJournal] = {}
     
     def _get_schedule_times_for_date(self, day_date: date) -> dict:
         """Get morning/afternoon/break times for a date (based on season)."""
@@ -300,7 +340,7 @@ class ScheduleService:
                 ordered.append(subject_id)
                 seen.add(subject_id)
 
-        day = week.days[day_index]
+        day = week.own_day(day_index)
         day.selected_subject_ids = ordered
         day.subject_time_slots = {s: day.get_time_slots(s) for s in seen}
         day.subject_lesson_map = {s: day.get_lesson_ids(s) for s in seen}
@@ -318,7 +358,7 @@ class ScheduleService:
         if not subject_id:
             return False, "Môn học không hợp lệ"
 
-        day = week.days[day_index]
+        day = week.own_day(day_index)
         if subject_id not in day.selected_subject_ids:
             return False, "Môn học chưa được chọn trong ngày"
 
@@ -346,7 +386,7 @@ class ScheduleService:
         if not subject_id:
             return False, "Môn học không hợp lệ"
 
-        day = week.days[day_index]
+        day = week.own_day(day_index)
         if subject_id not in day.selected_subject_ids:
             return False, "Môn học chưa được chọn trong ngày"
 
@@ -375,16 +415,31 @@ class ScheduleService:
         for day_index, from_day in enumerate(from_week.days):
             if day_index >= len(to_week.days):
                 break
-            to_day = to_week.days[day_index]
+            to_day = to_week.own_day(day_index)
             to_day.selected_subject_ids = list(from_day.selected_subject_ids)
             to_day.subject_time_slots = {k: list(v) for k, v in from_day.subject_time_slots.items()}
             to_day.subject_lesson_map = {}
         return True, None
 
+    def apply_week_template(self, schedule: Schedule, template: WeekTemplate,
+                            week_nums: List[int]) -> Tuple[bool, Optional[str]]:
+        """Make weeks use a template's subjects, times and lessons. The days share the template's
+        plan until one is edited (then that day gets its own copy), so nothing is copied here."""
+        if not template.days:
+            return False, "Mẫu tuần không có ngày nào"
+        for week_num in week_nums:
+            if week_num < 1 or week_num > len(schedule.weeks):
+                return False, "Số tuần không hợp lệ"
+        for week_num in week_nums:
+            schedule.weeks[week_num - 1].apply_template(template)
+        return True, None
+
+    @timed("schedule_service.build_week_items")
     def build_week_items(
-        self, schedule: Schedule, week_num: int
+        self, schedule: Schedule, week_num: int, warnings: Optional[List[str]] = None
     ) -> Tuple[bool, Optional[str], List[str]]:
         """Build schedule items for a week from selected subjects and (lesson_id, time) lists per subject.
+        When warnings is a list, locations also used by other saved schedules at the same time are appended to it.
         Returns: (success, summary_for_ui, all_errors). When success, errors=[]."""
         if week_num < 1 or week_num > len(schedule.weeks):
             msg = "Số tuần không hợp lệ"
@@ -394,6 +449,7 @@ class ScheduleService:
         week = schedule.weeks[week_num - 1]
         errors: List[str] = []
         schedule_label = schedule.name or schedule.schedule_id or "TKB"
+        resources = self._resource_snapshot(schedule)
 
         for day in week.days:
             fixed_items = [item for item in day.items if not item.subject_id and not item.lesson_id]
@@ -447,6 +503,14 @@ class ScheduleService:
                         logger.warning("[Kiểm tra TKB] Tuần %s, %s: %s", week_num, day_label, err)
                         continue
 
+                    busy = self._busy_in(resources, day.date, subject, lesson, start_time, end_time)
+                    if busy:
+                        slot_range = f"{start_time.strftime('%H:%M')}–{end_time.strftime('%H:%M')}"
+                        err = f"Ngày {day_label}, môn \"{subject.name}\", bài \"{lesson.name}\" (tiết {slot_range}): Nguồn lực đã được thời khóa biểu khác dùng hết ở khung giờ này: {', '.join(busy)}. Hãy đổi giờ hoặc đổi bài."
+                        errors.append(err)
+                        logger.warning("[Kiểm tra TKB] Tuần %s, %s: %s", week_num, day_label, err)
+                        continue
+
                     item = ScheduleItem(
                         subject_id=subject.subject_id,
                         lesson_id=lesson.lesson_id,
@@ -460,6 +524,9 @@ class ScheduleService:
 
             day.items = new_items
 
+        if warnings is not None:
+            warnings.extend(self.location_conflicts_for_week(schedule, week_num))
+
         if errors:
             full_text = "\n".join(errors)
             logger.error(
@@ -485,11 +552,19 @@ class ScheduleService:
             return False, ["Số tuần không hợp lệ"]
 
         issues: List[str] = []
-        success, _, build_errors = self.build_week_items(schedule, week_num)
+        location_warnings: List[str] = []
+        success, _, build_errors = self.build_week_items(schedule, week_num, location_warnings)
         issues.extend(build_errors)
+        issues.extend(self.validate_week_days(schedule, week_num))
+        issues.extend(location_warnings)
+        issues.extend(self.check_sequencing(schedule, week_num)[0])
+        return len(issues) == 0, issues
 
+    def validate_week_days(self, schedule: Schedule, week_num: int) -> List[str]:
+        """Total hours check of every day of a built week"""
         week = schedule.weeks[week_num - 1]
         day_names = ["Thứ Hai", "Thứ Ba", "Thứ Tư", "Thứ Năm", "Thứ Sáu", "Thứ Bảy"]
+        issues: List[str] = []
         for day_index, day in enumerate(week.days):
             is_valid, total_hours, suggestion = self.validate_day_schedule(day)
             if not is_valid and suggestion:
@@ -500,9 +575,222 @@ class ScheduleService:
                     "[Kiểm tra TKB] Tuần %s, %s: không đủ/đúng tổng giờ. total=%.2f. %s",
                     week_num, day_date, total_hours, suggestion
                 )
+        return issues
+
+    def _sequencing_messages(
+        self, schedule: Schedule, week_num: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        """sequencing_issues with each message prefixed by its day name and date"""
+        day_names = ["Thứ Hai", "Thứ Ba", "Thứ Tư", "Thứ Năm", "Thứ Sáu", "Thứ Bảy", "Chủ Nhật"]
+        weeks = [week_num] if week_num is not None else None
+        prerequisite_issues, order_warnings = sequencing_issues(
+            schedule, self.subject_service.get_subject_graph(), weeks
+        )
 
-        return len(issues) == 0, issues
+        def label(ordinal: int, message: str) -> Tuple[int, str]:
+            day = schedule.weeks[ordinal // 7].days[ordinal % 7]
+            return ordinal, f"{day_names[ordinal % 7]} ({day.date.isoformat()}): {message}"
+
+        return [label(o, m) for o, m in prerequisite_issues], [label(o, m) for o, m in order_warnings]
+
+    def check_sequencing(self, schedule: Schedule, week_num: Optional[int] = None) -> Tuple[List[str], List[str]]:
+        """Teaching order checks for one week (default: all weeks).
+        Returns (prerequisite issues, lesson order warnings), each message prefixed with its day."""
+        prerequisite_issues, order_warnings = self._sequencing_messages(schedule, week_num)
+        return [m for _, m in prerequisite_issues], [m for _, m in order_warnings]
+
+    @timed("schedule_service.build_all_weeks")
+    def build_all_weeks(
+        self, schedule: Schedule, workers: Optional[int] = None, validate: bool = False
+    ) -> Tuple[bool, Optional[str], List[str]]:
+        """Build every week (with validate, also check day hours and prerequisites like
+        validate_week_schedule). Weeks are built in `workers` processes. By default a schedule with
+        at least BUILD_PARALLEL_MIN_WEEKS weeks uses cpu_count - 1 workers; shorter ones are built in
+        this process.
+        Returns: (success, summary_for_ui, all_issues prefixed with their week, in week order)."""
+        week_count = len(schedule.weeks)
+        if workers is None:
+            workers = max(1, (os.cpu_count() or 1) - 1) if week_count >= BUILD_PARALLEL_MIN_WEEKS else 1
+        workers = min(workers, week_count)
+
+        results = None
+        if workers > 1:
+            try:
+                results = build_weeks_in_pool(self, schedule, validate, workers)
+            except Exception as e:
+                logger.warning("build_all_weeks: process pool failed (%s), building in this process", e)
+        if results is None:
+            workers = 1
+            results = build_weeks(self, schedule, range(1, week_count + 1), validate)
+
+        # Prerequisites need the whole schedule in order, and locations the other schedules: checked here
+        sequencing_by_week: Dict[int, List[str]] = {}
+        if validate:
+            for ordinal, message in self._sequencing_messages(schedule)[0]:
+                sequencing_by_week.setdefault(ordinal // 7 + 1, []).append(message)
+
+        issues: List[str] = []
+        for week_num, items, errors, day_issues in results:
+            if workers > 1:
+                for day, day_items in zip(schedule.weeks[week_num - 1].days, items):
+                    day.items = [ScheduleItem.from_dict(d) for d in day_items]
+            week_issues = errors + day_issues
+            if validate:
+                week_issues += self.location_conflicts_for_week(schedule, week_num)
+                week_issues += sequencing_by_week.get(week_num, [])
+            issues.extend(f"Tuần {week_num}: {issue}" for issue in week_issues)
+        logger.info("build_all_weeks: %s weeks, %s workers, %s issues", week_count, workers, len(issues))
+
+        if issues:
+            summary = (
+                f"Phát hiện {len(issues)} vấn đề. Chi tiết đã ghi trong file log (thư mục logs/).\n\n"
+                "Một số lỗi:\n" + "\n".join(issues[:5])
+            )
+            if len(issues) > 5:
+                summary += f"\n... và {len(issues) - 5} lỗi khác (xem log)."
+            return False, summary, issues
+
+        from datetime import datetime
+        schedule.updated_at = datetime.now()
+        return True, None, []
     
+    def get_location_index(self) -> LocationIndex:
+        """Location bookings of all saved schedules (rebuilt when schedules change outside this service)"""
+        version = self.file_service.schedules_catalog_version()
+        if self._location_index is None or self._location_index[0] != version:
+            self._location_index = (version, LocationIndex(self.get_all_schedules()))
+        return self._location_index[1]
+
+    def find_location_users(self, location: Optional[str], day_date: date, start: time, end: time,
+                            exclude_schedule_id: Optional[str] = None) -> List[LocationBooking]:
+        """Saved schedule items using location on day_date at a time overlapping [start, end)"""
+        if not (location or "").strip():
+            return []
+        return self.get_location_index().overlapping(location, day_date, start, end, exclude_schedule_id)
+
+    def location_conflicts_for_week(self, schedule: Schedule, week_num: int) -> List[str]:
+        """Items of a built week whose location other saved schedules use at the same time"""
+        week = schedule.weeks[week_num - 1]
+        index = self.get_location_index()  # Once per week: each lookup would stat the summary
+        conflicts: List[str] = []
+        for day in week.days:
+            for item in day.items:
+                if not item.subject_id or not (item.location or "").strip():
+                    continue
+                for booking in index.overlapping(
+                    item.location, day.date, item.start_time, item.end_time, schedule.schedule_id
+                ):
+                    conflict = (
+                        f"Ngày {day.date.isoformat()}, môn \"{item.subject_name}\", bài \"{item.lesson_name}\": "
+                        f"{booking.describe(day.date)}"
+                    )
+                    conflicts.append(conflict)
+                    logger.warning("[Kiểm tra TKB] Tuần %s: %s", week_num, conflict)
+        return conflicts
+
+    def _location_index_current(self) -> bool:
+        return (self._location_index is not None
+                and self._location_index[0] == self.file_service.schedules_catalog_version())
+
+    def _index_saved_schedule(self, update: Callable[[LocationIndex], None], was_current: bool):
+        """Apply a save/delete to the location index when it was up to date, else drop it"""
+        if was_current:
+            update(self._location_index[1])
+            self._location_index = (self.file_service.schedules_catalog_version(), self._location_index[1])
+        else:
+            self._location_index = None
+
+    def _resource_calendar_current(self) -> bool:
+        return (self._resource_calendar is not None
+                and self._resource_calendar[0] == self._resource_calendar_version())
+
+    def _update_resource_calendar(self, update: Callable[[ResourceCalendar], None], was_current: bool):
+        """Apply a save/delete to the resource calendar when it was up to date, else drop it"""
+        if was_current:
+            _, calendar, names = self._resource_calendar
+            update(calendar)
+            self._resource_calendar = (self._resource_calendar_version(), calendar, names)
+        else:
+            self._resource_calendar = None
+        self._resource_view = None
+
+    def _resource_calendar_version(self) -> tuple:
+        return (self.file_service.schedules_catalog_version(), self.file_service.subjects_catalog_version(),
+                self.file_service.resources_version())
+
+    @staticmethod
+    def required_resources(subject: Subject, lesson: Optional[Lesson] = None) -> List[str]:
+        """Resource ids a lesson needs: the subject's, then the lesson's own"""
+        return list(dict.fromkeys(subject.resource_ids + (lesson.resource_ids if lesson else [])))
+
+    def get_resource_calendar(self) -> Optional[ResourceCalendar]:
+        """Resource use of all saved schedules (None when no resource is defined)"""
+        version = self._resource_calendar_version()
+        if self._resource_calendar is None or self._resource_calendar[0] != version:
+            resources = self.file_service.load_all_resources()
+            if not resources:
+                self._resource_calendar = None
+                return None
+            calendar = ResourceCalendar({r.resource_id: r.capacity for r in resources})
+            requirements = self._item_requirements(calendar)
+            for schedule in self.get_all_schedules():
+                calendar.add_schedule(schedule, requirements)
+            self._resource_calendar = (version, calendar, {r.resource_id: r.name for r in resources})
+        return self._resource_calendar[1]
+
+    def _item_requirements(self, calendar: ResourceCalendar) -> Callable[[ScheduleItem], List[str]]:
+        """item -> known resource ids it needs (subjects looked up once)"""
+        subjects: Dict[str, Optional[Subject]] = {}
+
+        def requirements(item: ScheduleItem) -> List[str]:
+            if item.subject_id not in subjects:
+                subjects[item.subject_id] = self.subject_service.get_subject(item.subject_id)
+            subject = subjects[item.subject_id]
+            if not subject:
+                return []
+            lesson = next((l for l in subject.lessons if l.lesson_id == item.lesson_id), None)
+            return [r for r in self.required_resources(subject, lesson) if r in calendar.capacities]
+
+        return requirements
+
+    def _resources_for_editing(self, schedule: Schedule) -> Optional[ResourceCalendar]:
+        """Resource use of the other saved schedules (the saved copy of this one left out)"""
+        calendar = self.get_resource_calendar()
+        if calendar is None:
+            return None
+        version = self._resource_calendar[0]
+        view = self._resource_view
+        if view is None or view[0] != schedule.schedule_id or view[1] != version:
+            self._resource_view = view = (schedule.schedule_id, version, calendar.excluding(schedule.schedule_id))
+        return view[2]
+
+    def _resource_snapshot(self, schedule: Schedule) -> Optional[Tuple[ResourceCalendar, Dict[str, str]]]:
+        """(resource use of the other saved schedules, resource names), checked against the data files
+        once; held for a whole build/fill so each candidate lesson costs no stat(). None without resources."""
+        calendar = self._resources_for_editing(schedule)
+        if calendar is None:
+            return None
+        return calendar, self._resource_calendar[2]
+
+    def _busy_in(self, snapshot: Optional[Tuple[ResourceCalendar, Dict[str, str]]], day_date: date,
+                 subject: Subject, lesson: Optional[Lesson], start: time, end: time) -> List[str]:
+        """busy_resources against a snapshot from _resource_snapshot"""
+        if snapshot is None:
+            return []
+        resource_ids = self.required_resources(subject, lesson)
+        if not resource_ids:
+            return []
+        calendar, names = snapshot
+        mask = slot_mask(start, end)
+        return [names[r] for r in resource_ids if r in names and not calendar.fits(r, day_date, mask)]
+
+    def busy_resources(self, schedule: Schedule, day_date: date, subject: Subject,
+                       lesson: Optional[Lesson], start: time, end: time) -> List[str]:
+        """Names of the resources the lesson needs that other schedules already use to capacity at [start, end)"""
+        if not self.required_resources(subject, lesson):
+            return []
+        return self._busy_in(self._resource_snapshot(schedule), day_date, subject, lesson, start, end)
+
     def add_lesson_to_day(self, schedule: Schedule, week_num: int, day_index: int,
                          subject: Subject, lesson: Lesson, 
                          start_time: time) -> Tuple[bool, Optional[str]]:
@@ -530,6 +818,11 @@ class ScheduleService:
             if self._is_lesson_scheduled(schedule, subject.subject_id, lesson.lesson_id):
                 return False, "Bài học này đã được lên lịch"
             
+            # Check instructors/equipment are not used to capacity by other schedules
+            busy = self.busy_resources(schedule, day.date, subject, lesson, start_time, end_time)
+            if busy:
+                return False, f"Nguồn lực đã được dùng hết ở khung giờ này: {', '.join(busy)}"
+            
             # Create schedule item
             item = ScheduleItem(
                 subject_id=subject.subject_id,
@@ -671,18 +964,26 @@ class ScheduleService:
             result.extend(current)
         return result
 
+    @timed("schedule_service.fill_day_times_and_lessons")
     def _fill_day_times_and_lessons(
-        self, day: DaySchedule, schedule: Schedule, week_num: int, day_index: int = 0
+        self, day: DaySchedule, schedule: Schedule, week_num: int, day_index: int = 0,
+        history: Optional[TeachingHistory] = None
     ) -> Tuple[bool, Optional[str]]:
-        """Auto-fill subject_time_slots and subject_lesson_map for one day. Đã dạy = bài trong tuần trước + bài trong các ngày trước đó trong tuần này."""
+        """Auto-fill subject_time_slots and subject_lesson_map for one day. Đã dạy = bài trong tuần trước + bài trong các ngày trước đó trong tuần này.
+        history: teaching history up to this day (built here when not given)."""
         from ..utils.date_utils import time_duration as duration_hours
 
+        ordinal = day_ordinal(week_num, day_index)
+        if history is None:
+            history = TeachingHistory(self.subject_service.get_subject_graph(), schedule, before=ordinal)
+
         free = self._get_free_intervals_for_day(day, day.date)
         if not free:
             return True, None
         subject_ids = list(day.selected_subject_ids)
         if not subject_ids:
             return True, None
+        resources = self._resource_snapshot(schedule)
 
         # Clear existing subject assignments for this day so we build from scratch (avoids old data causing conflicts)
         for s in subject_ids:
@@ -693,7 +994,6 @@ class ScheduleService:
         times = self._get_schedule_times_for_date(day.date)
         afternoon_start = times["afternoon_start"]
 
-        scheduled_this_run: Set[str] = set()
         subject_idx = 0
         lesson_lists: Dict[str, List[str]] = {s: [] for s in subject_ids}
         time_lists: Dict[str, List[str]] = {s: [] for s in subject_ids}
@@ -701,6 +1001,27 @@ class ScheduleService:
         # Ranges already used this day (including spanning afternoon part) so we don't double-book
         used_ranges: List[Tuple[time, time]] = []
 
+        # Per subject, loaded once for the day: the subject and its lessons not yet taught, in order
+        subjects: Dict[str, Optional[Subject]] = {}
+        remaining_lessons: Dict[str, List[Lesson]] = {}
+
+        def lessons_left(subject_id: str) -> Tuple[Optional[Subject], List[Lesson]]:
+            if subject_id not in subjects:
+                subject = self.subject_service.get_subject(subject_id)
+                subjects[subject_id] = subject
+                if subject:
+                    already = history.taught_before(subject_id, ordinal)
+                    remaining_lessons[subject_id] = [l for l in subject.lessons if l.lesson_id not in already]
+            return subjects[subject_id], remaining_lessons.get(subject_id, [])
+
+        def mark_scheduled(subject_id: str, lesson: Lesson):
+            remaining_lessons[subject_id].remove(lesson)
+
+        def resources_free(subject: Subject, lesson: Lesson, start: time, hours: float) -> bool:
+            """Instructors/equipment of the lesson not used to capacity by other schedules"""
+            end = add_hours_to_time(start, hours)
+            return not self._busy_in(resources, day.date, subject, lesson, start, end)
+
         def advance_cursor_past_used(t: time) -> time:
             while True:
                 overlap = next(
@@ -721,47 +1042,33 @@ class ScheduleService:
                 placed = False
                 while tried < len(subject_ids):
                     subject_id = subject_ids[subject_idx % len(subject_ids)]
-                    subject = self.subject_service.get_subject(subject_id)
+                    # Bài đã dạy ở các tuần trước và các ngày trước đó của tuần này (theo lịch sử giảng dạy)
+                    subject, available = lessons_left(subject_id)
                     subject_idx += 1
                     tried += 1
-                    if not subject:
-                        continue
-
-                    already = set(
-                        self.get_scheduled_lesson_ids_for_subject_in_weeks_before(
-                            schedule, subject_id, week_num
-                        )
-                    )
-                    # Thêm bài đã dạy trong các ngày trước đó của tuần này (vd: Thứ Hai đã học bài 1 thì Thứ Ba không dạy lại)
-                    week = schedule.weeks[week_num - 1]
-                    for prev_day in week.days[:day_index]:
-                        for lid in prev_day.get_lesson_ids(subject_id):
-                            if lid:
-                                already.add(lid)
-                        for item in prev_day.items:
-                            if item.subject_id == subject_id and item.lesson_id:
-                                already.add(item.lesson_id)
-                    already.update(scheduled_this_run)
-                    available = [l for l in subject.lessons if l.lesson_id not in already]
-                    if not available:
+                    if not subject or not available:
                         continue
 
                     duration = subject.get_lesson_duration(available[0])
                     fits = duration <= remaining_hours + 0.01
-                    if fits:
+                    if fits and resources_free(subject, available[0], cursor, duration):
                         start_str = cursor.strftime("%H:%M")
                         end_t = add_hours_to_time(cursor, duration)
                         lesson_lists[subject_id].append(available[0].lesson_id)
                         time_lists[subject_id].append(start_str)
                         duration_lists[subject_id].append(None)
                         used_ranges.append((cursor, end_t))
-                        scheduled_this_run.add(available[0].lesson_id)
+                        mark_scheduled(subject_id, available[0])
                         cursor = end_t
                         remaining_hours = duration_hours(cursor, interval_end)
                         placed = True
                         break
 
-                    shorter = [l for l in available if subject.get_lesson_duration(l) <= remaining_hours + 0.01]
+                    shorter = [
+                        l for l in available
+                        if subject.get_lesson_duration(l) <= remaining_hours + 0.01
+                        and resources_free(subject, l, cursor, subject.get_lesson_duration(l))
+                    ]
                     if shorter:
                         best = max(shorter, key=lambda l: subject.get_lesson_duration(l))
                         start_str = cursor.strftime("%H:%M")
@@ -771,7 +1078,7 @@ class ScheduleService:
                         time_lists[subject_id].append(start_str)
                         duration_lists[subject_id].append(None)
                         used_ranges.append((cursor, end_t))
-                        scheduled_this_run.add(best.lesson_id)
+                        mark_scheduled(subject_id, best)
                         cursor = end_t
                         remaining_hours = duration_hours(cursor, interval_end)
                         placed = True
@@ -782,7 +1089,9 @@ class ScheduleService:
                         if next_start >= afternoon_start:
                             part1 = remaining_hours
                             part2 = duration - part1
-                            if part2 <= duration_hours(next_start, next_end) + 0.01:
+                            if (part2 <= duration_hours(next_start, next_end) + 0.01
+                                    and resources_free(subject, available[0], cursor, part1)
+                                    and resources_free(subject, available[0], next_start, part2)):
                                 start1 = cursor
                                 end1 = add_hours_to_time(cursor, part1)
                                 start2 = next_start
@@ -795,7 +1104,7 @@ class ScheduleService:
                                 duration_lists[subject_id].append(part2)
                                 used_ranges.append((start1, end1))
                                 used_ranges.append((start2, end2))
-                                scheduled_this_run.add(available[0].lesson_id)
+                                mark_scheduled(subject_id, available[0])
                                 remaining_hours = 0
                                 placed = True
                                 break
@@ -812,18 +1121,122 @@ class ScheduleService:
                     day.subject_slot_durations[s] = duration_lists[s]
         return True, None
 
+    def _plan_week_with_solver(self, schedule: Schedule, week_num: int, time_limit: float,
+                               history: Optional[TeachingHistory] = None):
+        """Fill every day of the week with selected subjects using the search planner (week_planner).
+        history: teaching history of the days before the week (built here when not given)."""
+        week = schedule.weeks[week_num - 1]
+        subjects: Dict[str, Subject] = {}
+        days: List[DayInput] = []
+        for day_index, day in enumerate(week.days):
+            if not day.selected_subject_ids:
+                continue
+            for subject_id in day.selected_subject_ids:
+                if subject_id not in subjects:
+                    subject = self.subject_service.get_subject(subject_id)
+                    if subject:
+                        subjects[subject_id] = subject
+            # Minutes since midnight; the last morning interval continues into the first afternoon one
+            afternoon_start = self._get_schedule_times_for_date(day.date)["afternoon_start"]
+            segments: List[List[Tuple[int, int]]] = []
+            joinable = False
+            for start, end in self._get_free_intervals_for_day(day, day.date):
+                interval = (start.hour * 60 + start.minute, end.hour * 60 + end.minute)
+                if joinable and start >= afternoon_start:
+                    segments[-1].append(interval)
+                else:
+                    segments.append([interval])
+                joinable = start < afternoon_start
+            days.append(DayInput(day_index, segments, list(day.selected_subject_ids)))
+
+        # Lessons still to teach, in order (taught in earlier weeks excluded)
+        week_start = day_ordinal(week_num, 0)
+        if history is None:
+            history = TeachingHistory(self.subject_service.get_subject_graph(), schedule, before=week_start)
+        queues: Dict[str, List[Tuple[str, int]]] = {}
+        for subject_id, subject in subjects.items():
+            already = history.taught_before(subject_id, week_start)
+            queues[subject_id] = [
+                (lesson.lesson_id, round(subject.get_lesson_duration(lesson) * 60))
+                for lesson in subject.lessons
+                if lesson.lesson_id not in already and subject.get_lesson_duration(lesson) > 0
+            ]
+
+        # Lessons whose instructors/equipment other schedules use to capacity are not placed
+        can_place = None
+        resources = self._resource_snapshot(schedule)
+        if resources is not None:
+            lessons_by_id = {sid: {l.lesson_id: l for l in subject.lessons} for sid, subject in subjects.items()}
+
+            def can_place(day_index: int, subject_id: str, lesson_id: str, parts: List[Tuple[int, int]]) -> bool:
+                subject = subjects[subject_id]
+                lesson = lessons_by_id[subject_id].get(lesson_id)
+                day_date = week.days[day_index].date
+                return not any(
+                    self._busy_in(
+                        resources, day_date, subject, lesson,
+                        time(start // 60, start % 60), time((start + minutes) // 60, (start + minutes) % 60)
+                    )
+                    for start, minutes in parts
+                )
+
+        plan = plan_week(days, queues, time_limit, can_place)
+        logger.info(
+            "Week planner: week %s, gap %s min, %s, %s nodes",
+            week_num, plan.gap_minutes, "optimal" if plan.complete else "time limit", plan.nodes
+        )
+        for day_input in days:
+            day = week.own_day(day_input.day_index)
+            for subject_id in day.selected_subject_ids:
+                day.subject_lesson_map.pop(subject_id, None)
+                day.subject_time_slots.pop(subject_id, None)
+                day.subject_slot_durations.pop(subject_id, None)
+            lesson_lists: Dict[str, List[str]] = {}
+            time_lists: Dict[str, List[str]] = {}
+            duration_lists: Dict[str, List[Optional[float]]] = {}
+            for placement in plan.days.get(day_input.day_index, []):
+                split = len(placement.parts) > 1
+                for start_minute, minutes in placement.parts:
+                    lesson_lists.setdefault(placement.subject_id, []).append(placement.lesson_id)
+                    time_lists.setdefault(placement.subject_id, []).append(
+                        time(start_minute // 60, start_minute % 60).strftime("%H:%M")
+                    )
+                    duration_lists.setdefault(placement.subject_id, []).append(minutes / 60 if split else None)
+            for subject_id, lesson_ids in lesson_lists.items():
+                day.subject_lesson_map[subject_id] = lesson_ids
+                day.subject_time_slots[subject_id] = time_lists[subject_id]
+                if any(d is not None for d in duration_lists[subject_id]):
+                    day.subject_slot_durations[subject_id] = duration_lists[subject_id]
+
     def auto_fill_week_times_and_lessons(
-        self, schedule: Schedule, week_num: int
+        self, schedule: Schedule, week_num: int, use_solver: bool = False,
+        time_limit: float = SOLVER_TIME_LIMIT, history: Optional[TeachingHistory] = None
     ) -> Tuple[bool, Optional[str], List[Tuple[str, str, str]]]:
         """Auto-fill subject_time_slots and subject_lesson_map for all days in the week.
+        use_solver: search the whole week for a plan that fills every day exactly (lessons in
+        order), returning the best plan found within time_limit seconds, instead of the greedy fill.
+        history: teaching history of the days before the week, to fill weeks one after another
+        without re-reading the earlier ones; the filled week is recorded into it.
         Returns: (success, error, days_with_issues). days_with_issues = [(day_name, date, suggestion), ...] cho các ngày chưa đạt đủ tổng giờ."""
         if week_num < 1 or week_num > len(schedule.weeks):
             return False, "Số tuần không hợp lệ", []
 
         week = schedule.weeks[week_num - 1]
-        for day_index, day in enumerate(week.days):
-            if day.selected_subject_ids:
-                self._fill_day_times_and_lessons(day, schedule, week_num, day_index)
+        graph = self.subject_service.get_subject_graph()
+        # The days before this week, unchanged by the fill
+        before_week = (history.copy() if history is not None
+                       else TeachingHistory(graph, schedule, before=day_ordinal(week_num, 0)))
+        if use_solver:
+            self._plan_week_with_solver(schedule, week_num, time_limit, before_week)
+        else:
+            filling = before_week.copy()
+            for day_index, day in enumerate(week.days):
+                if day.selected_subject_ids:
+                    day = week.own_day(day_index)
+                    self._fill_day_times_and_lessons(day, schedule, week_num, day_index, filling)
+                filling.record_day(day_ordinal(week_num, day_index), day)
+        if history is not None:
+            history.record_week(week_num, week.days)
 
         success, summary, _ = self.build_week_items(schedule, week_num)
         if not success:
@@ -840,8 +1253,15 @@ class ScheduleService:
                 day_date = day.date.isoformat()
                 days_with_issues.append((day_name, day_date, suggestion))
 
+        # Subjects started before their prerequisites are complete
+        prerequisite_issues, _ = sequencing_issues(schedule, graph, [week_num], before_week)
+        for ordinal, message in prerequisite_issues:
+            day_index = ordinal % 7
+            days_with_issues.append((day_names[day_index], week.days[day_index].date.isoformat(), message))
+
         return True, None, days_with_issues
 
+    @timed("schedule_service.validate_day_schedule")
     def validate_day_schedule(self, day: DaySchedule) -> Tuple[bool, float, Optional[str]]:
         """Validate if day schedule meets 8 hours requirement (using season times for this day).
         
@@ -900,83 +1320,184 @@ class ScheduleService:
         return is_valid, total_hours, suggestion
     
     def suggest_adjustments(self, day: DaySchedule, subject: Subject) -> List[Dict]:
-        """Suggest lesson adjustments to meet 8 hours requirement"""
-        suggestions = []
+        """Suggest lesson replacements to meet the daily hours requirement.
+        One suggestion per (current lesson, suggested lesson), best first: the change
+        closest to the shortage/excess, then the smallest change."""
         is_valid, total_hours, _ = self.validate_day_schedule(day)
+        if is_valid:
+            return []
         
+        times = self._get_schedule_times_for_date(day.date)
+        shortage = times["daily_total_hours"] - total_hours
+        index = self._lesson_indexes.get(subject)
+        
+        ranked = {}
+        current_ids = {item.lesson_id for item in day.items if item.subject_id == subject.subject_id}
+        for lesson_id in current_ids:
+            current_lesson = index.lesson(lesson_id)
+            if not current_lesson:
+                continue
+            # Longer lessons when short of hours, shorter ones when over (within 0.5h)
+            if shortage > 0:
+                candidates = index.replacements(lesson_id, 0, shortage + 0.5)
+            else:
+                candidates = index.replacements(lesson_id, shortage - 0.5, 0)
+            for change, lesson in candidates:
+                if lesson.lesson_id in current_ids:
+                    continue
+                if shortage > 0:
+                    reason = f"Tăng thời lượng thêm {change:.1f} giờ"
+                else:
+                    reason = f"Giảm thời lượng {-change:.1f} giờ"
+                rank = (abs(shortage - change), abs(change), current_lesson.name, lesson.name)
+                ranked[(lesson_id, lesson.lesson_id)] = (rank, {
+                    "type": "replace",
+                    "current_lesson": current_lesson.name,
+                    "suggested_lesson": lesson.name,
+                    "hours_change": round(change, 2),
+                    "reason": reason
+                })
+        return [suggestion for _, suggestion in sorted(ranked.values(), key=lambda entry: entry[0])]
+    
+    def suggest_day_swaps(self, day: DaySchedule, time_budget: float = 0.05,
+                          limit: int = 5) -> List[Dict]:
+        """Suggest sets of lesson replacements over all subjects of the day that together
+        meet the daily hours requirement. The search stops after time_budget seconds
+        and returns the best sets found so far (closest to the requirement, fewest swaps)."""
+        is_valid, total_hours, _ = self.validate_day_schedule(day)
         if is_valid:
-            return suggestions
+            return []
         
         times = self._get_schedule_times_for_date(day.date)
-        daily_total = times["daily_total_hours"]
-        shortage = daily_total - total_hours
+        shortage = times["daily_total_hours"] - total_hours
         
-        # Find lessons in the day from this subject
-        subject_items = [item for item in day.items 
-                        if item.subject_id == subject.subject_id]
+        subjects: Dict[str, Optional[Subject]] = {}
+        slots = []
+        slot_items = []
+        for item in day.items:
+            if not item.subject_id or not item.lesson_id:
+                continue
+            if item.subject_id not in subjects:
+                subjects[item.subject_id] = self.subject_service.get_subject(item.subject_id)
+            subject = subjects[item.subject_id]
+            if subject is None:
+                continue
+            index = self._lesson_indexes.get(subject)
+            if index.lesson(item.lesson_id) is None:
+                continue
+            slots.append((item.lesson_id, index))
+            slot_items.append(item)
         
-        if shortage > 0:
-            # Need longer lessons
-            for item in subject_items:
-                current_lesson = next(
-                    (l for l in subject.lessons if l.lesson_id == item.lesson_id),
-                    None
-                )
-                if not current_lesson:
-                    continue
-                
-                # Find longer lessons in same subject
-                for lesson in subject.lessons:
-                    if lesson.lesson_id == item.lesson_id:
-                        continue
-                    
-                    lesson_duration = subject.get_lesson_duration(lesson)
-                    current_duration = subject.get_lesson_duration(current_lesson)
-                    
-                    if lesson_duration > current_duration:
-                        diff = lesson_duration - current_duration
-                        if diff <= shortage + 0.5:  # Within reasonable range
-                            suggestions.append({
-                                "type": "replace",
-                                "current_lesson": current_lesson.name,
-                                "suggested_lesson": lesson.name,
-                                "reason": f"Tăng thời lượng thêm {diff:.1f} giờ"
-                            })
+        taken = {item.lesson_id for item in slot_items}
+        suggestions = []
+        for remaining, swaps in search_swap_combinations(slots, shortage, time_budget=time_budget,
+                                                         limit=limit, taken=taken):
+            change = sum(c for _, _, c in swaps)
+            suggestions.append({
+                "type": "multi_replace",
+                "swaps": [{
+                    "subject": slot_items[slot].subject_name,
+                    "current_lesson": slot_items[slot].lesson_name,
+                    "suggested_lesson": lesson.name,
+                    "hours_change": round(c, 2),
+                } for slot, lesson, c in swaps],
+                "hours_change": round(change, 2),
+                "remaining_hours": remaining,
+                "reason": f"Đổi {len(swaps)} bài, thay đổi {change:+.1f} giờ"
+            })
+        return suggestions
+
+    def mark_completed(
+        self,
+        schedule: Schedule,
+        dates: Optional[Iterable[date]] = None,
+        date_range: Optional[Tuple[date, date]] = None,
+        predicate: Optional[Callable[[DaySchedule], bool]] = None,
+        completed: bool = True,
+    ) -> Tuple[bool, Optional[str], Dict[str, int]]:
+        """Set is_completed on many days at once and persist with a single save.
+        Days are selected by explicit dates, an inclusive date_range (start, end) and/or a predicate;
+        when several selectors are given a day must match all of them.
+        Returns: (success, error, counts) with counts = {"matched", "changed", "already", "missing"}.
+        Nothing is written when no day changes."""
+        counts = {"matched": 0, "changed": 0, "already": 0, "missing": 0}
+        if dates is None and date_range is None and predicate is None:
+            return False, "Chưa chọn ngày cần đánh dấu", counts
+
+        if dates is not None:
+            candidates: List[date] = sorted(set(dates))
+            if date_range is not None:
+                start, end = date_range
+                candidates = [d for d in candidates if start <= d <= end]
+        elif date_range is not None:
+            start, end = date_range
+            if schedule.start_date and start < schedule.start_date:
+                start = schedule.start_date
+            if schedule.end_date and end > schedule.end_date:
+                end = schedule.end_date
+            candidates = [start + timedelta(days=i) for i in range((end - start).days + 1)]
         else:
-            # Need shorter lessons
-            excess = -shortage
-            for item in subject_items:
-                current_lesson = next(
-                    (l for l in subject.lessons if l.lesson_id == item.lesson_id),
-                    None
-                )
-                if not current_lesson:
+            candidates = None
+
+        if candidates is None:
+            days = list(schedule.iter_days())
+        else:
+            days = []
+            for d in candidates:
+                day = schedule.get_day(d)
+                if day is None:
+                    # Sundays inside a range are never scheduled; only count explicit dates
+                    if dates is not None:
+                        counts["missing"] += 1
                     continue
-                
-                # Find shorter lessons in same subject
-                for lesson in subject.lessons:
-                    if lesson.lesson_id == item.lesson_id:
-                        continue
-                    
-                    lesson_duration = subject.get_lesson_duration(lesson)
-                    current_duration = subject.get_lesson_duration(current_lesson)
-                    
-                    if lesson_duration < current_duration:
-                        diff = current_duration - lesson_duration
-                        if diff <= excess + 0.5:
-                            suggestions.append({
-                                "type": "replace",
-                                "current_lesson": current_lesson.name,
-                                "suggested_lesson": lesson.name,
-                                "reason": f"Giảm thời lượng {diff:.1f} giờ"
-                            })
-        
-        return suggestions
-    
+                days.append(day)
+
+        dirty: List[DaySchedule] = []
+        for day in days:
+            if predicate is not None and not predicate(day):
+                continue
+            counts["matched"] += 1
+            if day.is_completed == completed:
+                counts["already"] += 1
+                continue
+            day.is_completed = completed
+            dirty.append(day)
+        counts["changed"] = len(dirty)
+
+        if not dirty:
+            return True, None, counts
+
+        from datetime import datetime
+        schedule.updated_at = datetime.now()
+        success, error = self.save_schedule(schedule)
+        if not success:
+            # Roll back so the in-memory schedule matches what is on disk
+            for day in dirty:
+                day.is_completed = not completed
+            counts["changed"] = 0
+            return False, error, counts
+
+        logger.info(
+            "Marked %s day(s) as %s in schedule %s",
+            len(dirty), "completed" if completed else "pending", schedule.schedule_id
+        )
+        return True, None, counts
+
     def save_schedule(self, schedule: Schedule) -> Tuple[bool, Optional[str]]:
         """Save schedule"""
         try:
+            was_current = self._location_index_current()
+            calendar_current = self._resource_calendar_current()
             if self.file_service.save_schedule(schedule):
+                self._index_saved_schedule(lambda index: index.add_schedule(schedule), was_current)
+                self._update_resource_calendar(
+                    lambda calendar: calendar.add_schedule(schedule, self._item_requirements(calendar)),
+                    calendar_current
+                )
+                journal = self._journals.get(schedule.schedule_id)
+                if journal is not None:
+                    # The document now holds every edit: the log starts over
+                    journal.compact(schedule, saved=True)
                 logger.info(f"Saved schedule: {schedule.schedule_id}")
                 return True, None
             else:
@@ -989,6 +1510,11 @@ class ScheduleService:
         """Load schedule by ID"""
         return self.file_service.load_schedule(schedule_id)
     
+    def diff_with_saved(self, schedule: Schedule) -> Optional[ScheduleDiff]:
+        """Changes of schedule since it was last saved (None if it never was)"""
+        saved = self.load_schedule(schedule.schedule_id)
+        return diff_schedules(saved, schedule) if saved else None
+
     def get_all_schedules(self) -> List[Schedule]:
         """Get all schedules"""
         return self.file_service.load_all_schedules()
@@ -996,7 +1522,14 @@ class ScheduleService:
     def delete_schedule(self, schedule_id: str) -> Tuple[bool, Optional[str]]:
         """Delete schedule"""
         try:
+            was_current = self._location_index_current()
+            calendar_current = self._resource_calendar_current()
             if self.file_service.delete_schedule(schedule_id):
+                self._index_saved_schedule(lambda index: index.remove_schedule(schedule_id), was_current)
+                self._update_resource_calendar(
+                    lambda calendar: calendar.remove_schedule(schedule_id), calendar_current
+                )
+                self.close_journal(schedule_id, discard=True)
                 logger.info(f"Deleted schedule: {schedule_id}")
                 return True, None
             else:
@@ -1005,3 +1538,90 @@ class ScheduleService:
             logger.error(f"Error deleting schedule: {e}")
             return False, f"Lỗi: {str(e)}"
 
+    # Edit journal (undo/redo, crash recovery)
+    def _journal_dir(self) -> Path:
+        return self.file_service.schedules_dir / "journal"
+
+    def _journal_path(self, schedule_id: str) -> Path:
+        return self._journal_dir() / f"{schedule_id}.jsonl"
+
+    def open_journal(self, schedule: Schedule) -> ScheduleJournal:
+        """Start journaling edits of a schedule (edits made through edit_schedule are logged)"""
+        journal = self._journals.get(schedule.schedule_id)
+        if journal is None:
+            journal = ScheduleJournal(self._journal_path(schedule.schedule_id), lambda s: self.save_schedule(s)[0])
+            journal.start(schedule, self.file_service.schedule_exists(schedule.schedule_id))
+            self._journals[schedule.schedule_id] = journal
+        return journal
+
+    def get_journal(self, schedule: Optional[Schedule]) -> Optional[ScheduleJournal]:
+        return self._journals.get(schedule.schedule_id) if schedule else None
+
+    def close_journal(self, schedule_id: str, discard: bool = False):
+        """Stop journaling a schedule; discard also removes its log"""
+        journal = self._journals.pop(schedule_id, None)
+        if discard:
+            if journal is None:
+                journal = ScheduleJournal(self._journal_path(schedule_id), lambda s: False)
+            journal.discard()
+
+    def edit_schedule(self, schedule: Schedule, name: str, *args, **kwargs) -> tuple:
+        """Run an edit method (a key of JOURNALED_EDITS) on schedule and log it when journaled.
+        Returns what the method returns."""
+        method = getattr(self, name)
+        journal = self._journals.get(schedule.schedule_id)
+        if journal is None:
+            return method(schedule, *args, **kwargs)
+        days = JOURNALED_EDITS[name](schedule, *args, **kwargs)
+        return journal.record(schedule, name, days, lambda: method(schedule, *args, **kwargs))
+
+    def undo_edit(self, schedule: Schedule) -> Optional[str]:
+        """Undo the last journaled edit; returns its name, None if there is nothing to undo"""
+        journal = self._journals.get(schedule.schedule_id)
+        return journal.undo(schedule) if journal else None
+
+    def redo_edit(self, schedule: Schedule) -> Optional[str]:
+        """Redo the last undone edit; returns its name, None if there is nothing to redo"""
+        journal = self._journals.get(schedule.schedule_id)
+        return journal.redo(schedule) if journal else None
+
+    def recoverable_journals(self) -> List[Tuple[str, Optional[str], bool]]:
+        """(schedule id, name, saved) of journals left with edits (e.g. after a crash), not open here"""
+        found = []
+        for schedule_id, path in journal_schedule_ids(self._journal_dir()).items():
+            if schedule_id in self._journals:
+                continue
+            header, lines = read_journal(path)
+            if header is None:
+                continue
+            if header.get("saved") and not lines:
+                continue
+            name = (header.get("schedule") or {}).get("name")
+            if name is None and header.get("saved"):
+                schedule = self.load_schedule(schedule_id)
+                name = schedule.name if schedule else None
+            found.append((schedule_id, name, bool(header.get("saved"))))
+        return found
+
+    def recover_schedule(self, schedule_id: str) -> Optional[Schedule]:
+        """Rebuild a schedule from its document (or draft header) and journal, and keep journaling it.
+        The journal is compacted right away (a saved schedule's document is rewritten)."""
+        header, lines = read_journal(self._journal_path(schedule_id))
+        if header is None:
+            return None
+        if header.get("saved"):
+            schedule = self.load_schedule(schedule_id)
+        else:
+            schedule = Schedule.from_dict(header["schedule"]) if header.get("schedule") else None
+        if schedule is None:
+            return None
+        journal = ScheduleJournal(self._journal_path(schedule_id), lambda s: self.save_schedule(s)[0])
+        try:
+            journal.replay(schedule, header, lines)
+        except (IndexError, KeyError, ValueError, TypeError) as e:
+            logger.error(f"Error replaying journal of {schedule_id}: {e}")
+            return None
+        self._journals[schedule_id] = journal
+        journal.compact(schedule)
+        logger.info("Recovered schedule %s from its journal (%s lines)", schedule_id, len(lines))
+        return schedule
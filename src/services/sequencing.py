@@ -0,0 +1,210 @@
+"""Teaching order: subject prerequisites and lesson order.
+
+SubjectGraph is built once per subject catalog version: prerequisites are
+sorted topologically (subjects in a prerequisite cycle are listed in cyclic
+and the edges between them ignored) and every lesson gets its position in its subject.
+
+TeachingHistory records, in one pass over a schedule, when each lesson is
+first taught and when each subject is complete, so checks during auto-fill
+and validation are dictionary lookups instead of re-scanning earlier weeks.
+Days are numbered (week index * 7 + day index).
+"""
+
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Set, Tuple
+from ..models.schedule import Schedule, DaySchedule
+from ..models.subject import Subject
+
+
+def day_ordinal(week_num: int, day_index: int) -> int:
+    """Position of a day in the schedule (week_num is 1-based)"""
+    return (week_num - 1) * 7 + day_index
+
+
+class SubjectGraph:
+    """Prerequisites between subjects and lesson positions within each subject"""
+
+    def __init__(self, subjects: Iterable[Subject]):
+        subjects = list(subjects)
+        self.names: Dict[str, str] = {s.subject_id: s.name for s in subjects}
+        # subject -> lesson_id -> position in the subject's lesson list
+        self.lesson_position: Dict[str, Dict[str, int]] = {
+            s.subject_id: {lesson.lesson_id: i for i, lesson in enumerate(s.lessons)} for s in subjects
+        }
+        prerequisites = {
+            s.subject_id: tuple(dict.fromkeys(p for p in s.prerequisites if p in self.names and p != s.subject_id))
+            for s in subjects
+        }
+
+        # Kahn's algorithm; ties by name for a stable order
+        dependents: Dict[str, List[str]] = {subject_id: [] for subject_id in self.names}
+        pending = {subject_id: len(prereqs) for subject_id, prereqs in prerequisites.items()}
+        for subject_id, prereqs in prerequisites.items():
+            for prereq in prereqs:
+                dependents[prereq].append(subject_id)
+        ready = sorted((s for s, n in pending.items() if n == 0), key=lambda s: (self.names[s], s))
+        self.order: List[str] = []
+        while ready:
+            subject_id = ready.pop(0)
+            self.order.append(subject_id)
+            released = []
+            for dependent in dependents[subject_id]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    released.append(dependent)
+            if released:
+                ready = sorted(ready + released, key=lambda s: (self.names[s], s))
+        placed = set(self.order)
+        self.cyclic: Set[str] = {s for s in self.names if s not in placed}
+        # Subjects in (or depending on) a cycle go last; edges between them are ignored
+        self.order.extend(sorted(self.cyclic, key=lambda s: (self.names[s], s)))
+        self.rank: Dict[str, int] = {s: i for i, s in enumerate(self.order)}
+        self.prerequisites: Dict[str, Tuple[str, ...]] = {
+            s: tuple(p for p in prereqs if p not in self.cyclic) for s, prereqs in prerequisites.items()
+        }
+
+        # All (transitive) prerequisites, filled in topological order
+        self.ancestors: Dict[str, FrozenSet[str]] = {}
+        for subject_id in self.order:
+            closure: Set[str] = set()
+            for prereq in self.prerequisites[subject_id]:
+                closure.add(prereq)
+                closure.update(self.ancestors[prereq])
+            self.ancestors[subject_id] = frozenset(closure)
+
+    def requires(self, subject_id: str, other_id: str) -> bool:
+        """True if other_id must be completed (directly or transitively) before subject_id"""
+        return other_id in self.ancestors.get(subject_id, ())
+
+    def lesson_count(self, subject_id: str) -> int:
+        return len(self.lesson_position.get(subject_id, ()))
+
+
+def _day_lessons(day: DaySchedule) -> Dict[str, List[str]]:
+    """subject -> lesson ids of a day (selected lessons and built items), in time order where known"""
+    lessons: Dict[str, List[str]] = {}
+    for item in sorted(day.items, key=lambda i: i.start_time):
+        if item.subject_id and item.lesson_id:
+            lessons.setdefault(item.subject_id, []).append(item.lesson_id)
+    for subject_id in day.selected_subject_ids:
+        for lesson_id in day.get_lesson_ids(subject_id):
+            if lesson_id and lesson_id not in lessons.get(subject_id, ()):
+                lessons.setdefault(subject_id, []).append(lesson_id)
+    return lessons
+
+
+class TeachingHistory:
+    """First day each lesson is taught in a schedule, and the day each subject is complete"""
+
+    def __init__(self, graph: SubjectGraph, schedule: Optional[Schedule] = None,
+                 before: Optional[int] = None):
+        """before: only record days with an ordinal below this"""
+        self.graph = graph
+        self._first_taught: Dict[str, Dict[str, int]] = {}
+        self._completed_at: Dict[str, int] = {}
+        if schedule is not None:
+            for week_index, week in enumerate(schedule.weeks):
+                for day_index, day in enumerate(week.days):
+                    ordinal = day_ordinal(week_index + 1, day_index)
+                    if before is not None and ordinal >= before:
+                        return
+                    self.record_day(ordinal, day)
+
+    def copy(self) -> "TeachingHistory":
+        """Independent copy, to extend without changing this history"""
+        history = TeachingHistory(self.graph)
+        history._first_taught = {s: dict(taught) for s, taught in self._first_taught.items()}
+        history._completed_at = dict(self._completed_at)
+        return history
+
+    def record_week(self, week_num: int, days: Sequence[DaySchedule]):
+        for day_index, day in enumerate(days):
+            self.record_day(day_ordinal(week_num, day_index), day)
+
+    def furthest_positions(self) -> Dict[str, int]:
+        """subject -> highest lesson position taught so far"""
+        furthest = {}
+        for subject_id, taught in self._first_taught.items():
+            positions = self.graph.lesson_position.get(subject_id, {})
+            known = [positions[lesson_id] for lesson_id in taught if lesson_id in positions]
+            if known:
+                furthest[subject_id] = max(known)
+        return furthest
+
+    def record_day(self, ordinal: int, day: DaySchedule):
+        for subject_id, lesson_ids in _day_lessons(day).items():
+            self.record(ordinal, subject_id, lesson_ids)
+
+    def record(self, ordinal: int, subject_id: str, lesson_ids: Iterable[str]):
+        taught = self._first_taught.setdefault(subject_id, {})
+        for lesson_id in lesson_ids:
+            if taught.get(lesson_id, ordinal + 1) > ordinal:
+                taught[lesson_id] = ordinal
+        positions = self.graph.lesson_position.get(subject_id)
+        if positions and all(lesson_id in taught for lesson_id in positions):
+            self._completed_at[subject_id] = max(taught[lesson_id] for lesson_id in positions)
+
+    def taught_before(self, subject_id: str, ordinal: int) -> Set[str]:
+        """Lessons of subject_id first taught on a day before ordinal"""
+        return {lesson_id for lesson_id, day in self._first_taught.get(subject_id, {}).items() if day < ordinal}
+
+    def completed_before(self, subject_id: str, ordinal: int) -> bool:
+        return self._completed_at.get(subject_id, ordinal) < ordinal
+
+    def blocking_prerequisites(self, subject_id: str, ordinal: int) -> List[str]:
+        """Direct prerequisites of subject_id not completed before day ordinal"""
+        return [p for p in self.graph.prerequisites.get(subject_id, ()) if not self.completed_before(p, ordinal)]
+
+
+def sequencing_issues(schedule: Schedule, graph: SubjectGraph,
+                      weeks: Optional[Sequence[int]] = None,
+                      history: Optional[TeachingHistory] = None) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+    """One chronological pass over the schedule. Returns (prerequisite issues, lesson order warnings)
+    as (day ordinal, message) for the given weeks (1-based; default all). A subject may start only
+    after the day its prerequisites are complete; a lesson taught after a later lesson of the same
+    subject is out of order. The pass stops after the last given week; history (of the days before
+    the first given week, left unchanged) lets it start at that week."""
+    reported = set(weeks) if weeks is not None else None
+    first_week = 1
+    if history is not None and reported:
+        history, first_week = history.copy(), min(reported)
+    else:
+        history = TeachingHistory(graph)
+    last_week = max(reported) if reported else len(schedule.weeks)
+    # subject -> highest lesson position taught so far
+    furthest: Dict[str, int] = history.furthest_positions()
+    prerequisite_issues: List[Tuple[int, str]] = []
+    order_warnings: List[Tuple[int, str]] = []
+    seen_blocks: Set[Tuple[int, str, str]] = set()
+    for week_index in range(first_week - 1, min(last_week, len(schedule.weeks))):
+        week = schedule.weeks[week_index]
+        report = reported is None or week_index + 1 in reported
+        for day_index, day in enumerate(week.days):
+            ordinal = day_ordinal(week_index + 1, day_index)
+            day_lessons = _day_lessons(day)
+            for subject_id, lesson_ids in day_lessons.items():
+                if subject_id not in graph.names:
+                    continue
+                positions = graph.lesson_position[subject_id]
+                if report:
+                    for prereq in history.blocking_prerequisites(subject_id, ordinal):
+                        # Once per week and pair of subjects
+                        if (week_index, subject_id, prereq) in seen_blocks:
+                            continue
+                        seen_blocks.add((week_index, subject_id, prereq))
+                        prerequisite_issues.append((ordinal, (
+                            f"Môn \"{graph.names[subject_id]}\" cần học sau khi hoàn thành "
+                            f"môn \"{graph.names[prereq]}\"."
+                        )))
+                for lesson_id in lesson_ids:
+                    position = positions.get(lesson_id)
+                    if position is None:
+                        continue
+                    if report and position < furthest.get(subject_id, -1):
+                        order_warnings.append((ordinal, (
+                            f"Môn \"{graph.names[subject_id]}\": bài thứ {position + 1} được dạy sau "
+                            f"bài thứ {furthest[subject_id] + 1}."
+                        )))
+                    furthest[subject_id] = max(furthest.get(subject_id, -1), position)
+            for subject_id, lesson_ids in day_lessons.items():
+                history.record(ordinal, subject_id, lesson_ids)
+    return prerequisite_issues, order_warnings
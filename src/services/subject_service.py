@@ -5,7 +5,9 @@ from ..models.subject import Subject
 from ..models.lesson import Lesson
 from .file_service import FileService
 from .excel_service import ExcelService
+from .sequencing import SubjectGraph
 from ..utils.logger import setup_logger
+from ..utils.metrics import timed
 from ..utils.constants import MAX_LESSONS_PER_SUBJECT, MIN_SUBJECT_NAME_LENGTH
 
 logger = setup_logger()
@@ -18,6 +20,8 @@ class SubjectService:
         """Initialize subject service"""
         self.file_service = file_service or FileService()
         self.excel_service = ExcelService()
+        # (catalog version, graph) of the last prerequisite graph built
+        self._graph = None
     
     def create_subject(self, subject: Subject) -> tuple[bool, Optional[str]]:
         """Create a new subject"""
@@ -83,6 +87,7 @@ class SubjectService:
             logger.error(f"Error deleting subject: {e}")
             return False, f"Lỗi: {str(e)}"
     
+    @timed("subject_service.get_subject")
     def get_subject(self, subject_id: str) -> Optional[Subject]:
         """Get subject by ID"""
         return self.file_service.load_subject(subject_id)
@@ -91,6 +96,19 @@ class SubjectService:
         """Get all subjects"""
         return self.file_service.load_all_subjects()
     
+    def get_subject_graph(self) -> SubjectGraph:
+        """Prerequisite graph and lesson positions of all subjects (rebuilt when the catalog changes)"""
+        version = self.file_service.subjects_catalog_version()
+        if self._graph is None or self._graph[0] != version:
+            graph = SubjectGraph(self.get_all_subjects())
+            if graph.cyclic:
+                logger.warning(
+                    "Prerequisite cycle between subjects: %s",
+                    ", ".join(graph.names[s] for s in sorted(graph.cyclic))
+                )
+            self._graph = (version, graph)
+        return self._graph[1]
+    
     def search_subjects(self, query: str) -> List[Subject]:
         """Search subjects by name or code"""
         query_lower = query.lower().strip()
@@ -0,0 +1,98 @@
+"""Build and validate the weeks of a schedule in a process pool.
+
+Weeks only depend on the subjects once their selections are made, so each
+worker gets the schedule, the subjects and the settings file once (pool
+initializer) and then builds contiguous chunks of weeks. Only the built items
+and the messages come back; the caller merges them in week order.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+from ..models.schedule import Schedule
+from ..models.subject import Subject
+from .file_service import FileService
+from .subject_service import SubjectService
+from .sequencing import SubjectGraph
+
+# Weeks built in-process below this count (starting workers costs more)
+BUILD_PARALLEL_MIN_WEEKS = 12
+
+# (week_num, items per day as ScheduleItem dicts, build errors, day hour issues)
+WeekResult = Tuple[int, List[List[dict]], List[str], List[str]]
+
+
+class SubjectSnapshotService(SubjectService):
+    """Read-only subject service over subjects loaded once (no file access per lookup)"""
+
+    def __init__(self, file_service: FileService, subjects: Sequence[Subject]):
+        super().__init__(file_service)
+        self._subjects: Dict[str, Subject] = {s.subject_id: s for s in subjects}
+        self._snapshot_graph: Optional[SubjectGraph] = None
+
+    def get_subject(self, subject_id: str) -> Optional[Subject]:
+        return self._subjects.get(subject_id)
+
+    def get_all_subjects(self) -> List[Subject]:
+        return list(self._subjects.values())
+
+    def get_subject_graph(self) -> SubjectGraph:
+        if self._snapshot_graph is None:
+            self._snapshot_graph = SubjectGraph(self._subjects.values())
+        return self._snapshot_graph
+
+
+# Per worker process, set by init_week_worker
+_worker = {}
+
+
+def init_week_worker(base_data_dir: str, settings_file: Optional[str],
+                     subjects_data: List[dict], schedule_data: dict):
+    """Pool initializer: services and the schedule shared by all jobs of this worker"""
+    from .schedule_service import ScheduleService
+    settings = None
+    if settings_file:
+        from ..config.settings import Settings
+        settings = Settings(settings_file)
+    file_service = FileService(base_data_dir=base_data_dir)
+    subject_service = SubjectSnapshotService(file_service, [Subject.from_dict(d) for d in subjects_data])
+    _worker["service"] = ScheduleService(file_service, subject_service, settings)
+    _worker["schedule"] = Schedule.from_dict(schedule_data)
+
+
+def build_weeks_job(job: Tuple[List[int], bool]) -> List[WeekResult]:
+    """Build (and optionally check the day hours of) some weeks. Runs in worker processes."""
+    week_nums, validate = job
+    return build_weeks(_worker["service"], _worker["schedule"], week_nums, validate)
+
+
+def build_weeks(schedule_service, schedule: Schedule, week_nums: Sequence[int],
+                validate: bool) -> List[WeekResult]:
+    """Build the given weeks in place and return their results"""
+    results = []
+    for week_num in week_nums:
+        _, _, errors = schedule_service.build_week_items(schedule, week_num)
+        issues = schedule_service.validate_week_days(schedule, week_num) if validate else []
+        items = [[item.to_dict() for item in day.items] for day in schedule.weeks[week_num - 1].days]
+        results.append((week_num, items, errors, issues))
+    return results
+
+
+def build_weeks_in_pool(schedule_service, schedule: Schedule, validate: bool,
+                        workers: int) -> List[WeekResult]:
+    """Results of every week, in week order, built by `workers` processes"""
+    week_nums = list(range(1, len(schedule.weeks) + 1))
+    chunk_size = max(1, -(-len(week_nums) // (workers * 2)))
+    jobs = [(week_nums[i:i + chunk_size], validate) for i in range(0, len(week_nums), chunk_size)]
+    settings = schedule_service.settings
+    initargs = (
+        str(schedule_service.file_service.base_dir),
+        str(settings.config_file) if settings is not None else None,
+        [s.to_dict() for s in schedule_service.subject_service.get_all_subjects()],
+        schedule.to_dict(),
+    )
+    # spawn: never fork the GUI process (Qt and the logging thread are not fork-safe)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=init_week_worker, initargs=initargs) as executor:
+        return [result for chunk in executor.map(build_weeks_job, jobs) for result in chunk]
@@ -0,0 +1,188 @@
+"""Search-based week planner (optional alternative to the greedy auto-fill).
+
+Each day's free time (work hours minus fixed items) is split into segments; a
+lesson may run over the lunch break like in the greedy fill, so the last
+morning interval and the first afternoon interval form one segment.
+
+The planner runs a depth-first search over "which subject teaches which lesson
+now" for the whole week, with:
+- lessons strictly in order: a subject can only teach its next untaught lesson
+  (like the greedy fill and the teaching order check of sequencing.py);
+- cost = unfilled minutes + a penalty per selected subject left without a lesson
+  on its day (while it still had lessons to teach), and branches cut once they
+  cannot beat the best plan found;
+- a visited-state table (day, segment, time left, lesson positions, subjects
+  used) so equivalent partial plans are explored once;
+- a time limit, after which the best plan found so far is returned;
+- an optional can_place check (e.g. instructors already busy), which skips
+  placements it rejects.
+Durations are handled in whole minutes so "exactly daily_total_hours" is exact.
+"""
+
+import time as _time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Seconds the planner may search for one week
+SOLVER_TIME_LIMIT = 2.0
+# Cost (in minutes) of a selected subject getting no lesson on its day
+UNUSED_SUBJECT_PENALTY = 30
+# Visited states kept for pruning (the table is cleared when full, bounding memory)
+MAX_SEEN_STATES = 200_000
+
+# (start minute, end minute) since midnight
+Interval = Tuple[int, int]
+# (day index, subject id, lesson id, parts as (start minute, minutes)) -> placement allowed
+PlacementCheck = Callable[[int, str, str, List[Tuple[int, int]]], bool]
+
+
+@dataclass
+class DayInput:
+    """Free time and selected subjects (in order) of one day"""
+    day_index: int
+    segments: List[List[Interval]]
+    subject_ids: List[str]
+
+
+@dataclass
+class Placement:
+    """A lesson placed in a day: parts are (start minute, minutes), two when split over the break"""
+    subject_id: str
+    lesson_id: str
+    parts: List[Tuple[int, int]]
+
+
+@dataclass
+class WeekPlan:
+    """Best plan found: placements per day index"""
+    days: Dict[int, List[Placement]] = field(default_factory=dict)
+    gap_minutes: int = 0
+    cost: int = 0
+    # True when the search finished (the plan is optimal), False when stopped by the time limit
+    complete: bool = True
+    nodes: int = 0
+
+
+class _TimeUp(Exception):
+    pass
+
+
+class _Solved(Exception):
+    pass
+
+
+def _segment_parts(segment: List[Interval], offset: int, minutes: int) -> List[Tuple[int, int]]:
+    """Map [offset, offset + minutes) of a segment onto its intervals"""
+    parts = []
+    for start, end in segment:
+        length = end - start
+        if offset >= length:
+            offset -= length
+            continue
+        take = min(minutes, length - offset)
+        if take > 0 or not parts:
+            parts.append((start + offset, take))
+        minutes -= take
+        offset = 0
+        if minutes <= 0:
+            break
+    return parts
+
+
+def plan_week(days: Sequence[DayInput], lesson_queues: Dict[str, List[Tuple[str, int]]],
+              time_limit: float = SOLVER_TIME_LIMIT, can_place: Optional[PlacementCheck] = None) -> WeekPlan:
+    """Plan the days of a week. lesson_queues: subject id -> [(lesson id, minutes), ...]
+    still to teach, in teaching order."""
+    deadline = _time.perf_counter() + time_limit
+    subjects = sorted({s for day in days for s in day.subject_ids if s in lesson_queues})
+    position = {s: i for i, s in enumerate(subjects)}
+    queues = [lesson_queues[s] for s in subjects]
+    day_subjects = [[position[s] for s in day.subject_ids if s in position] for day in days]
+    capacities = [[sum(end - start for start, end in segment) for segment in day.segments] for day in days]
+
+    best = {"cost": None, "stack": [], "gap": 0}
+    # placements so far: (day, segment, offset, subject, lesson index, minutes)
+    # ptrs[i] = index of subject i's next lesson to teach
+    stack: List[Tuple[int, int, int, int, int, int]] = []
+    seen: Dict[tuple, int] = {}
+    nodes = 0
+
+    def record(cost: int, gap: int):
+        best["cost"], best["stack"], best["gap"] = cost, list(stack), gap
+        if cost == 0:
+            raise _Solved()
+
+    def visit(d: int, s: int, left: int, ptrs: Tuple[int, ...], used: int, last: int, cost: int, gap: int):
+        nonlocal nodes
+        nodes += 1
+        if nodes & 0xFF == 0 and _time.perf_counter() > deadline:
+            raise _TimeUp()
+        if best["cost"] is not None and cost >= best["cost"]:
+            return
+        if d == len(days):
+            record(cost, gap)
+            return
+        if s == len(capacities[d]):
+            # Only subjects that still had a lesson to teach count as left out
+            unused = sum(UNUSED_SUBJECT_PENALTY for i in day_subjects[d]
+                         if not used >> i & 1 and ptrs[i] < len(queues[i]))
+            next_left = capacities[d + 1][0] if d + 1 < len(days) and capacities[d + 1] else 0
+            visit(d + 1, 0, next_left, ptrs, 0, -1, cost + unused, gap)
+            return
+        key = (d, s, left, ptrs, used)
+        if seen.get(key, cost + 1) <= cost:
+            return
+        if len(seen) >= MAX_SEEN_STATES:
+            seen.clear()
+        seen[key] = cost
+
+        offset = capacities[d][s] - left
+        candidates = day_subjects[d]
+        # Try subjects round-robin from the one after the last placed (like the greedy fill)
+        start = (candidates.index(last) + 1) if last in candidates else 0
+        for k in range(len(candidates)):
+            i = candidates[(start + k) % len(candidates)]
+            p = ptrs[i]
+            if p >= len(queues[i]):
+                continue
+            lesson_id, minutes = queues[i][p]
+            if minutes > left:
+                continue
+            if can_place is not None and not can_place(
+                days[d].day_index, subjects[i], lesson_id, _segment_parts(days[d].segments[s], offset, minutes)
+            ):
+                continue
+            stack.append((d, s, offset, i, p, minutes))
+            next_ptrs = ptrs[:i] + (p + 1,) + ptrs[i + 1:]
+            if minutes == left:
+                visit_next_segment(d, s, next_ptrs, used | (1 << i), i, cost, gap)
+            else:
+                visit(d, s, left - minutes, next_ptrs, used | (1 << i), i, cost, gap)
+            stack.pop()
+        # Leave the rest of the segment empty
+        visit_next_segment(d, s, ptrs, used, last, cost + left, gap + left)
+
+    def visit_next_segment(d, s, ptrs, used, last, cost, gap):
+        next_left = capacities[d][s + 1] if s + 1 < len(capacities[d]) else 0
+        visit(d, s + 1, next_left, ptrs, used, last, cost, gap)
+
+    plan = WeekPlan()
+    first_left = capacities[0][0] if days and capacities[0] else 0
+    try:
+        visit(0, 0, first_left, tuple(0 for _ in subjects), 0, -1, 0, 0)
+    except _Solved:
+        pass
+    except _TimeUp:
+        plan.complete = False
+    plan.nodes = nodes
+
+    if best["cost"] is None:
+        # Stopped before any complete plan: nothing placed
+        plan.gap_minutes = plan.cost = sum(sum(c) for c in capacities)
+        return plan
+    plan.cost, plan.gap_minutes = best["cost"], best["gap"]
+    for d, s, offset, i, p, minutes in best["stack"]:
+        lesson_id = queues[i][p][0]
+        parts = _segment_parts(days[d].segments[s], offset, minutes)
+        plan.days.setdefault(days[d].day_index, []).append(Placement(subjects[i], lesson_id, parts))
+    return plan
@@ -0,0 +1,80 @@
+"""Week template service (named standard weeks applied to many weeks of a schedule)"""
+
+from typing import List, Optional, Tuple
+from ..models.schedule import Schedule, DayPlan, WeekTemplate
+from .file_service import FileService
+from ..utils.logger import setup_logger
+
+logger = setup_logger()
+
+
+class WeekTemplateService:
+    """Service for week template management"""
+
+    def __init__(self, file_service: Optional[FileService] = None):
+        """Initialize week template service"""
+        self.file_service = file_service or FileService()
+
+    def create_from_week(self, schedule: Schedule, week_num: int, name: str,
+                         include_lessons: bool = False) -> Tuple[bool, Optional[str], Optional[WeekTemplate]]:
+        """Save the subjects and start times of a week as a new template.
+        Lessons are left out unless include_lessons (like copying the previous week)."""
+        if week_num < 1 or week_num > len(schedule.weeks):
+            return False, "Số tuần không hợp lệ", None
+        days = [DayPlan.copy_of(day) for day in schedule.weeks[week_num - 1].days]
+        if not include_lessons:
+            for day in days:
+                day.subject_lesson_map = {}
+                day.subject_slot_durations = {}
+        template = WeekTemplate(name=(name or "").strip(), days=days)
+        success, error = self.create_template(template)
+        return success, error, template if success else None
+
+    def create_template(self, template: WeekTemplate) -> Tuple[bool, Optional[str]]:
+        """Create a new week template"""
+        try:
+            error = self._validate_template(template)
+            if error:
+                return False, error
+
+            if self.file_service.save_week_template(template):
+                logger.info(f"Created week template: {template.name} ({template.template_id})")
+                return True, None
+            else:
+                return False, "Lỗi khi lưu mẫu tuần"
+
+        except Exception as e:
+            logger.error(f"Error creating week template: {e}")
+            return False, f"Lỗi: {str(e)}"
+
+    def delete_template(self, template_id: str) -> Tuple[bool, Optional[str]]:
+        """Delete a week template (weeks already using it keep it)"""
+        try:
+            if not self.file_service.load_week_template(template_id):
+                return False, "Mẫu tuần không tồn tại"
+
+            if self.file_service.delete_week_template(template_id):
+                logger.info(f"Deleted week template: {template_id}")
+                return True, None
+            else:
+                return False, "Lỗi khi xóa mẫu tuần"
+
+        except Exception as e:
+            logger.error(f"Error deleting week template: {e}")
+            return False, f"Lỗi: {str(e)}"
+
+    def get_template(self, template_id: str) -> Optional[WeekTemplate]:
+        """Get week template by ID"""
+        return self.file_service.load_week_template(template_id)
+
+    def get_all_templates(self) -> List[WeekTemplate]:
+        """Get all week templates"""
+        return self.file_service.load_all_week_templates()
+
+    def _validate_template(self, template: WeekTemplate) -> Optional[str]:
+        """Validate week template data"""
+        if not template.name or not template.name.strip():
+            return "Tên mẫu tuần là bắt buộc"
+        if not template.days:
+            return "Mẫu tuần không có ngày nào"
+        return None
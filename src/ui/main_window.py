@@ -12,14 +12,12 @@ from src.services.file_service import FileService
 from src.services.subject_service import SubjectService
 from src.services.schedule_service import ScheduleService
 from src.ui.dialogs.login_dialog import LoginDialog
-from src.ui.widgets.subject_manager import SubjectManager
-from src.ui.widgets.schedule_creator import ScheduleCreator
-from src.ui.widgets.schedule_viewer import ScheduleViewer
-from src.ui.widgets.progress_tracker import ProgressTracker
-from src.ui.widgets.settings_widget import SettingsWidget
 from src.config.settings import Settings
 from src.utils.logger import setup_logger
-from src.utils.i18n import tr, set_language, get_language, SUPPORTED_LANGUAGES
+from src.utils.i18n import (
+    tr, set_language, get_language, bind_text, on_language_changed, SUPPORTED_LANGUAGES
+)
+from src.utils import startup_timing
 
 logger = setup_logger()
 
@@ -32,10 +30,10 @@ class MainWindow(QMainWindow):
         super().__init__(parent)
         
         # Initialize services
-        self.file_service = FileService()
+        self.settings = Settings()
+        self.file_service = FileService(storage_profile=self.settings.get_storage_profile())
         self.auth_service = AuthService(self.file_service)
         self.subject_service = SubjectService(self.file_service)
-        self.settings = Settings()
         self.schedule_service = ScheduleService(
             self.file_service, self.subject_service, self.settings
         )
@@ -53,6 +51,9 @@ class MainWindow(QMainWindow):
         self.setup_toolbar()
         self.setup_statusbar()
         
+        # Static texts are bound with bind_text; this refreshes the rest after a language change
+        on_language_changed(self.update_ui_language)
+        
         logger.info("Main window initialized")
     
     def set_window_icon(self):
@@ -78,13 +79,16 @@ class MainWindow(QMainWindow):
         """Check if user is authenticated"""
         if not self.auth_service.is_authenticated():
             dialog = LoginDialog(self.auth_service, self)
-            if dialog.exec() != QDialog.DialogCode.Accepted:
+            startup_timing.mark("login_dialog")
+            accepted = dialog.exec() == QDialog.DialogCode.Accepted
+            startup_timing.mark("login")
+            if not accepted:
                 return False
         return True
     
     def setup_ui(self):
         """Setup UI components"""
-        self.setWindowTitle(tr("app_name"))
+        bind_text(self, "setWindowTitle", "app_name")
         self.setMinimumSize(1200, 800)
         
         # Set window icon
@@ -101,94 +105,152 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         layout.addWidget(self.stacked_widget)
         
-        # Create and add widgets
-        self.subject_manager = SubjectManager(self.subject_service)
-        self.stacked_widget.addWidget(self.subject_manager)
-        
-        self.schedule_creator = ScheduleCreator(
-            self.schedule_service, self.subject_service
-        )
-        self.schedule_creator.schedule_created.connect(self.on_schedule_created)
-        self.stacked_widget.addWidget(self.schedule_creator)
-        
-        self.schedule_viewer = ScheduleViewer(self.schedule_service)
-        self.stacked_widget.addWidget(self.schedule_viewer)
-        
-        self.progress_tracker = ProgressTracker(self.schedule_service)
-        self.stacked_widget.addWidget(self.progress_tracker)
-        
-        self.settings_widget = SettingsWidget(self.settings)
-        self.stacked_widget.addWidget(self.settings_widget)
+        # Pages are built (and their modules imported) the first time they are shown.
+        # Until then the stack holds empty placeholders so view indexes stay the same.
+        self.subject_manager = None
+        self.schedule_creator = None
+        self.schedule_viewer = None
+        self.progress_tracker = None
+        self.settings_widget = None
+        self.performance_panel = None
+        self._page_factories = [
+            ("subject_manager", self._create_subject_manager),
+            ("schedule_creator", self._create_schedule_creator),
+            ("schedule_viewer", self._create_schedule_viewer),
+            ("progress_tracker", self._create_progress_tracker),
+            ("settings_widget", self._create_settings_widget),
+            ("performance_panel", self._create_performance_panel),
+        ]
+        for _ in self._page_factories:
+            self.stacked_widget.addWidget(QWidget())
         
         # Show subject manager by default
-        self.stacked_widget.setCurrentWidget(self.subject_manager)
+        self.stacked_widget.setCurrentWidget(self._ensure_page(0))
+    
+    def _create_subject_manager(self) -> QWidget:
+        from src.ui.widgets.subject_manager import SubjectManager
+        return SubjectManager(self.subject_service)
+    
+    def _create_schedule_creator(self) -> QWidget:
+        from src.ui.widgets.schedule_creator import ScheduleCreator
+        widget = ScheduleCreator(self.schedule_service, self.subject_service)
+        widget.schedule_created.connect(self.on_schedule_created)
+        return widget
+    
+    def _create_schedule_viewer(self) -> QWidget:
+        from src.ui.widgets.schedule_viewer import ScheduleViewer
+        return ScheduleViewer(self.schedule_service)
+    
+    def _create_progress_tracker(self) -> QWidget:
+        from src.ui.widgets.progress_tracker import ProgressTracker
+        return ProgressTracker(self.schedule_service)
+    
+    def _create_settings_widget(self) -> QWidget:
+        from src.ui.widgets.settings_widget import SettingsWidget
+        return SettingsWidget(self.settings, self.file_service)
+    
+    def _create_performance_panel(self) -> QWidget:
+        from src.ui.widgets.performance_panel import PerformancePanel
+        return PerformancePanel()
+    
+    def _ensure_page(self, index: int) -> QWidget:
+        """Return the page at index, building it in place of its placeholder on first use"""
+        attr, factory = self._page_factories[index]
+        page = getattr(self, attr)
+        if page is None:
+            page = factory()
+            placeholder = self.stacked_widget.widget(index)
+            self.stacked_widget.removeWidget(placeholder)
+            placeholder.deleteLater()
+            self.stacked_widget.insertWidget(index, page)
+            setattr(self, attr, page)
+            logger.info(f"Page '{attr}' created on first use")
+        return page
+    
+    def _make_action(self, key: str) -> QAction:
+        """Create an action whose text follows the current language"""
+        action = QAction(self)
+        bind_text(action, "setText", key)
+        return action
+    
+    def _add_menu(self, menubar, key: str):
+        """Add a menu whose title follows the current language"""
+        menu = menubar.addMenu("")
+        bind_text(menu, "setTitle", key)
+        return menu
     
     def setup_menu(self):
         """Setup menu bar"""
         menubar = self.menuBar()
         
         # File menu
-        file_menu = menubar.addMenu(tr("file_menu"))
+        file_menu = self._add_menu(menubar, "file_menu")
         self.menu_actions['file_menu'] = file_menu
         
-        logout_action = QAction(tr("logout"), self)
+        logout_action = self._make_action("logout")
         logout_action.setShortcut("Ctrl+L")
         logout_action.triggered.connect(self.logout)
         file_menu.addAction(logout_action)
         self.menu_actions['logout'] = logout_action
         
-        exit_action = QAction(tr("exit"), self)
+        exit_action = self._make_action("exit")
         exit_action.setShortcut("Ctrl+Q")
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
         self.menu_actions['exit'] = exit_action
         
         # View menu
-        view_menu = menubar.addMenu(tr("view_menu"))
+        view_menu = self._add_menu(menubar, "view_menu")
         self.menu_actions['view_menu'] = view_menu
         
-        subjects_action = QAction(tr("subjects"), self)
+        subjects_action = self._make_action("subjects")
         subjects_action.setShortcut("Ctrl+1")
         subjects_action.triggered.connect(lambda: self.show_view(0))
         view_menu.addAction(subjects_action)
         self.menu_actions['subjects'] = subjects_action
         
-        create_schedule_action = QAction(tr("create_schedule"), self)
+        create_schedule_action = self._make_action("create_schedule")
         create_schedule_action.setShortcut("Ctrl+2")
         create_schedule_action.triggered.connect(lambda: self.show_view(1))
         view_menu.addAction(create_schedule_action)
         self.menu_actions['create_schedule'] = create_schedule_action
         
-        view_schedule_action = QAction(tr("view_schedule"), self)
+        view_schedule_action = self._make_action("view_schedule")
         view_schedule_action.setShortcut("Ctrl+3")
         view_schedule_action.triggered.connect(lambda: self.show_view(2))
         view_menu.addAction(view_schedule_action)
         self.menu_actions['view_schedule'] = view_schedule_action
         
-        progress_action = QAction(tr("progress"), self)
+        progress_action = self._make_action("progress")
         progress_action.setShortcut("Ctrl+4")
         progress_action.triggered.connect(lambda: self.show_view(3))
         view_menu.addAction(progress_action)
         self.menu_actions['progress'] = progress_action
         
-        settings_action = QAction(tr("settings"), self)
+        settings_action = self._make_action("settings")
         settings_action.setShortcut("Ctrl+5")
         settings_action.triggered.connect(lambda: self.show_view(4))
         view_menu.addAction(settings_action)
         self.menu_actions['settings'] = settings_action
         
+        performance_action = self._make_action("performance")
+        performance_action.setShortcut("Ctrl+6")
+        performance_action.triggered.connect(lambda: self.show_view(5))
+        view_menu.addAction(performance_action)
+        self.menu_actions['performance'] = performance_action
+        
         # Language menu
-        language_menu = menubar.addMenu(tr("language"))
+        language_menu = self._add_menu(menubar, "language")
         self.menu_actions['language_menu'] = language_menu
         
-        vi_action = QAction(tr("language_vietnamese"), self)
+        vi_action = self._make_action("language_vietnamese")
         vi_action.setCheckable(True)
         vi_action.setChecked(get_language() == "vi")
         vi_action.triggered.connect(lambda: self.change_language("vi"))
         language_menu.addAction(vi_action)
         self.menu_actions['vi'] = vi_action
         
-        en_action = QAction(tr("language_english"), self)
+        en_action = self._make_action("language_english")
         en_action.setCheckable(True)
         en_action.setChecked(get_language() == "en")
         en_action.triggered.connect(lambda: self.change_language("en"))
@@ -196,50 +258,56 @@ class MainWindow(QMainWindow):
         self.menu_actions['en'] = en_action
         
         # Help menu
-        help_menu = menubar.addMenu(tr("help_menu"))
+        help_menu = self._add_menu(menubar, "help_menu")
         self.menu_actions['help_menu'] = help_menu
         
-        about_action = QAction(tr("about"), self)
+        about_action = self._make_action("about")
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
         self.menu_actions['about'] = about_action
     
     def setup_toolbar(self):
         """Setup toolbar"""
-        toolbar = QToolBar(tr("app_name"))
+        toolbar = QToolBar()
+        bind_text(toolbar, "setWindowTitle", "app_name")
         self.addToolBar(toolbar)
         self.toolbar = toolbar
         
         # View actions
-        subjects_action = QAction(tr("subjects"), self)
+        subjects_action = self._make_action("subjects")
         subjects_action.triggered.connect(lambda: self.show_view(0))
         toolbar.addAction(subjects_action)
         self.menu_actions['toolbar_subjects'] = subjects_action
         
-        create_schedule_action = QAction(tr("create_schedule"), self)
+        create_schedule_action = self._make_action("create_schedule")
         create_schedule_action.triggered.connect(lambda: self.show_view(1))
         toolbar.addAction(create_schedule_action)
         self.menu_actions['toolbar_create_schedule'] = create_schedule_action
         
-        view_schedule_action = QAction(tr("view_schedule"), self)
+        view_schedule_action = self._make_action("view_schedule")
         view_schedule_action.triggered.connect(lambda: self.show_view(2))
         toolbar.addAction(view_schedule_action)
         self.menu_actions['toolbar_view_schedule'] = view_schedule_action
         
-        progress_action = QAction(tr("progress"), self)
+        progress_action = self._make_action("progress")
         progress_action.triggered.connect(lambda: self.show_view(3))
         toolbar.addAction(progress_action)
         self.menu_actions['toolbar_progress'] = progress_action
         
-        settings_action = QAction(tr("settings"), self)
+        settings_action = self._make_action("settings")
         settings_action.triggered.connect(lambda: self.show_view(4))
         toolbar.addAction(settings_action)
         self.menu_actions['toolbar_settings'] = settings_action
         
+        performance_action = self._make_action("performance")
+        performance_action.triggered.connect(lambda: self.show_view(5))
+        toolbar.addAction(performance_action)
+        self.menu_actions['toolbar_performance'] = performance_action
+        
         toolbar.addSeparator()
         
         # Refresh action
-        refresh_action = QAction(tr("refresh"), self)
+        refresh_action = self._make_action("refresh")
         refresh_action.triggered.connect(self.refresh_current_view)
         toolbar.addAction(refresh_action)
         self.menu_actions['toolbar_refresh'] = refresh_action
@@ -260,10 +328,10 @@ class MainWindow(QMainWindow):
     def show_view(self, index: int):
         """Show view by index"""
         if 0 <= index < self.stacked_widget.count():
-            self.stacked_widget.setCurrentIndex(index)
+            self.stacked_widget.setCurrentWidget(self._ensure_page(index))
             
             # Update status
-            view_names = [tr("subjects"), tr("create_schedule"), tr("view_schedule"), tr("progress"), tr("settings")]
+            view_names = [tr("subjects"), tr("create_schedule"), tr("view_schedule"), tr("progress"), tr("settings"), tr("performance")]
             if index < len(view_names):
                 self.statusBar().showMessage(f"{tr('view')}: {view_names[index]}")
     
@@ -271,14 +339,16 @@ class MainWindow(QMainWindow):
         """Refresh current view"""
         current_widget = self.stacked_widget.currentWidget()
         
-        if isinstance(current_widget, SubjectManager):
+        if current_widget is self.subject_manager:
             current_widget.load_subjects()
-        elif isinstance(current_widget, ScheduleViewer):
+        elif current_widget is self.schedule_viewer:
             current_widget.load_schedules()
-        elif isinstance(current_widget, ProgressTracker):
+        elif current_widget is self.progress_tracker:
             current_widget.load_schedules()
-        elif isinstance(current_widget, SettingsWidget):
+        elif current_widget is self.settings_widget:
             current_widget.load_values()
+        elif current_widget is self.performance_panel:
+            current_widget.refresh()
         
         self.statusBar().showMessage(tr("refreshed"), 2000)
     
@@ -319,58 +389,20 @@ class MainWindow(QMainWindow):
     def change_language(self, language: str):
         """Change application language"""
         if language in SUPPORTED_LANGUAGES:
-            set_language(language)
-            self.update_ui_language()
+            # Retranslate with painting suspended so the window repaints once
+            self.setUpdatesEnabled(False)
+            try:
+                set_language(language)
+            finally:
+                self.setUpdatesEnabled(True)
     
     def update_ui_language(self):
-        """Update all UI text to current language"""
-        # Update window title
-        self.setWindowTitle(tr("app_name"))
-        
-        # Update menu bar
+        """Update texts that are not bound with bind_text (called after a language change)"""
         if hasattr(self, 'menu_actions'):
-            if 'file_menu' in self.menu_actions:
-                self.menu_actions['file_menu'].setTitle(tr("file_menu"))
-            if 'logout' in self.menu_actions:
-                self.menu_actions['logout'].setText(tr("logout"))
-            if 'exit' in self.menu_actions:
-                self.menu_actions['exit'].setText(tr("exit"))
-            if 'view_menu' in self.menu_actions:
-                self.menu_actions['view_menu'].setTitle(tr("view_menu"))
-            if 'subjects' in self.menu_actions:
-                self.menu_actions['subjects'].setText(tr("subjects"))
-            if 'create_schedule' in self.menu_actions:
-                self.menu_actions['create_schedule'].setText(tr("create_schedule"))
-            if 'view_schedule' in self.menu_actions:
-                self.menu_actions['view_schedule'].setText(tr("view_schedule"))
-            if 'progress' in self.menu_actions:
-                self.menu_actions['progress'].setText(tr("progress"))
-            if 'settings' in self.menu_actions:
-                self.menu_actions['settings'].setText(tr("settings"))
-            if 'language_menu' in self.menu_actions:
-                self.menu_actions['language_menu'].setTitle(tr("language"))
             if 'vi' in self.menu_actions:
-                self.menu_actions['vi'].setText(tr("language_vietnamese"))
                 self.menu_actions['vi'].setChecked(get_language() == "vi")
             if 'en' in self.menu_actions:
-                self.menu_actions['en'].setText(tr("language_english"))
                 self.menu_actions['en'].setChecked(get_language() == "en")
-            if 'help_menu' in self.menu_actions:
-                self.menu_actions['help_menu'].setTitle(tr("help_menu"))
-            if 'about' in self.menu_actions:
-                self.menu_actions['about'].setText(tr("about"))
-            if 'toolbar_subjects' in self.menu_actions:
-                self.menu_actions['toolbar_subjects'].setText(tr("subjects"))
-            if 'toolbar_create_schedule' in self.menu_actions:
-                self.menu_actions['toolbar_create_schedule'].setText(tr("create_schedule"))
-            if 'toolbar_view_schedule' in self.menu_actions:
-                self.menu_actions['toolbar_view_schedule'].setText(tr("view_schedule"))
-            if 'toolbar_progress' in self.menu_actions:
-                self.menu_actions['toolbar_progress'].setText(tr("progress"))
-            if 'toolbar_settings' in self.menu_actions:
-                self.menu_actions['toolbar_settings'].setText(tr("settings"))
-            if 'toolbar_refresh' in self.menu_actions:
-                self.menu_actions['toolbar_refresh'].setText(tr("refresh"))
         
         # Update status bar
         self.statusBar().showMessage(tr("ready"))
@@ -385,19 +417,11 @@ class MainWindow(QMainWindow):
         # Update current view status
         current_index = self.stacked_widget.currentIndex()
         if current_index >= 0:
-            view_names = [tr("subjects"), tr("create_schedule"), tr("view_schedule"), tr("progress"), tr("settings")]
+            view_names = [tr("subjects"), tr("create_schedule"), tr("view_schedule"), tr("progress"), tr("settings"), tr("performance")]
             if current_index < len(view_names):
                 self.statusBar().showMessage(f"{tr('view')}: {view_names[current_index]}")
-        
-        # Update child widgets - they should reload their UI
-        if hasattr(self, 'subject_manager') and hasattr(self.subject_manager, 'update_ui_language'):
-            self.subject_manager.update_ui_language()
-        elif hasattr(self, 'subject_manager'):
-            self.subject_manager.load_subjects()
-        if hasattr(self, 'schedule_viewer'):
-            self.schedule_viewer.load_schedules()
-        if hasattr(self, 'progress_tracker'):
-            self.progress_tracker.load_schedules()
+        # Pages subscribe with on_language_changed themselves; pages not built yet
+        # pick up the language when they are created
     
     def closeEvent(self, event):
         """Handle close event"""
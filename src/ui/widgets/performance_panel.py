@@ -0,0 +1,91 @@
+"""Performance panel - latency histograms and counters collected by src.utils.metrics"""
+
+from datetime import datetime
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox
+)
+from src.utils import metrics
+from src.utils.i18n import tr
+
+
+class PerformancePanel(QWidget):
+    """Widget showing timing statistics of instrumented operations"""
+
+    COLUMNS = ("perf_metric", "perf_count", "perf_mean", "perf_p50", "perf_p95", "perf_max", "perf_total")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        layout.addWidget(QLabel(tr("perf_help")))
+
+        self.timings_table = QTableWidget(0, len(self.COLUMNS))
+        self.timings_table.setHorizontalHeaderLabels([tr(key) for key in self.COLUMNS])
+        self.timings_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.timings_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.timings_table)
+
+        self.counters_table = QTableWidget(0, 2)
+        self.counters_table.setHorizontalHeaderLabels([tr("perf_counter"), tr("perf_value")])
+        self.counters_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.counters_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.counters_table.setMaximumHeight(160)
+        layout.addWidget(self.counters_table)
+
+        button_layout = QHBoxLayout()
+        self.refresh_btn = QPushButton(tr("refresh_button"))
+        self.refresh_btn.clicked.connect(self.refresh)
+        button_layout.addWidget(self.refresh_btn)
+        self.reset_btn = QPushButton(tr("perf_reset"))
+        self.reset_btn.clicked.connect(self.reset)
+        button_layout.addWidget(self.reset_btn)
+        self.export_btn = QPushButton(tr("perf_export"))
+        self.export_btn.clicked.connect(self.export_snapshot)
+        button_layout.addWidget(self.export_btn)
+        button_layout.addStretch()
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def refresh(self):
+        """Reload the tables from the current metrics snapshot"""
+        snapshot = metrics.snapshot()
+
+        histograms = snapshot["histograms"]
+        self.timings_table.setRowCount(len(histograms))
+        for row, (name, h) in enumerate(histograms.items()):
+            values = [
+                name, str(h["count"]), f"{h['mean_ms']:.2f}", f"{h['p50_ms']:.2f}",
+                f"{h['p95_ms']:.2f}", f"{h['max_ms']:.2f}", f"{h['total_ms']:.1f}",
+            ]
+            for col, value in enumerate(values):
+                self.timings_table.setItem(row, col, QTableWidgetItem(value))
+
+        counters = snapshot["counters"]
+        self.counters_table.setRowCount(len(counters))
+        for row, (name, value) in enumerate(counters.items()):
+            self.counters_table.setItem(row, 0, QTableWidgetItem(name))
+            self.counters_table.setItem(row, 1, QTableWidgetItem(str(value)))
+
+    def reset(self):
+        metrics.reset()
+        self.refresh()
+
+    def export_snapshot(self):
+        """Save the current metrics as a JSON file"""
+        default_name = f"performance_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.json"
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, tr("perf_export"), default_name, tr("json_files")
+        )
+        if not file_path:
+            return
+        error = metrics.export_snapshot(file_path)
+        if error:
+            QMessageBox.warning(self, tr("error"), f"{tr('perf_export_failed')}: {error}")
+        else:
+            QMessageBox.information(self, tr("success"), f"{tr('perf_exported')}: {file_path}")
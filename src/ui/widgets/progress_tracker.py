@@ -6,10 +6,11 @@ from PySide6.QtWidgets import (
     QCalendarWidget, QMessageBox, QCheckBox, QHeaderView
 )
 from PySide6.QtCore import Qt, QDate, Signal
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict
 from src.models.schedule import Schedule, DaySchedule, ScheduleItem
 from src.services.schedule_service import ScheduleService
+from src.utils.i18n import on_language_changed
 
 
 class ProgressTracker(QWidget):
@@ -22,6 +23,7 @@ class ProgressTracker(QWidget):
         self.current_schedule: Optional[Schedule] = None
         self.setup_ui()
         self.load_schedules()
+        on_language_changed(self.load_schedules)
     
     def setup_ui(self):
         """Setup UI components"""
@@ -160,14 +162,7 @@ class ProgressTracker(QWidget):
             return
         
         # Find today's schedule
-        today_schedule = None
-        for week in self.current_schedule.weeks:
-            for day in week.days:
-                if day.date == today:
-                    today_schedule = day
-                    break
-            if today_schedule:
-                break
+        today_schedule = self.current_schedule.get_day(today)
         
         if not today_schedule or not today_schedule.items:
             self.today_label.setText("Hôm nay không có lịch")
@@ -194,14 +189,7 @@ class ProgressTracker(QWidget):
             return
         
         # Find schedule for date
-        day_schedule = None
-        for week in self.current_schedule.weeks:
-            for day in week.days:
-                if day.date == selected_date:
-                    day_schedule = day
-                    break
-            if day_schedule:
-                break
+        day_schedule = self.current_schedule.get_day(selected_date)
         
         if not day_schedule:
             QMessageBox.information(
@@ -228,34 +216,17 @@ class ProgressTracker(QWidget):
         if not self.current_schedule:
             return
         
-        # Find today's schedule
-        today_schedule = None
-        week_index = None
-        day_index = None
-        
-        for w_idx, week in enumerate(self.current_schedule.weeks):
-            for d_idx, day in enumerate(week.days):
-                if day.date == today:
-                    today_schedule = day
-                    week_index = w_idx
-                    day_index = d_idx
-                    break
-            if today_schedule:
-                break
-        
-        if not today_schedule:
+        success, error, counts = self.schedule_service.mark_completed(
+            self.current_schedule, dates=[today]
+        )
+        if counts["missing"]:
             QMessageBox.warning(self, "Cảnh báo", "Hôm nay không có lịch")
             return
         
-        if today_schedule.is_completed:
+        if success and counts["changed"] == 0:
             QMessageBox.information(self, "Thông tin", "Ngày này đã được đánh dấu hoàn thành")
             return
         
-        # Mark as completed
-        today_schedule.is_completed = True
-        
-        # Save schedule
-        success, error = self.schedule_service.save_schedule(self.current_schedule)
         if success:
             QMessageBox.information(self, "Thành công", "Đã đánh dấu hoàn thành")
             self.update_today_schedule()
@@ -318,29 +289,22 @@ class ProgressTracker(QWidget):
     
     def mark_all_past_dates_complete(self):
         """Mark all past dates as completed"""
-        if not self.current_schedule:
+        if not self.current_schedule or not self.current_schedule.start_date:
             return
         
-        today = date.today()
-        marked_count = 0
-        
-        # Iterate through all weeks and days
-        for week in self.current_schedule.weeks:
-            for day in week.days:
-                # Check if date is in the past and not already completed
-                if day.date < today and not day.is_completed:
-                    day.is_completed = True
-                    marked_count += 1
+        yesterday = date.today() - timedelta(days=1)
+        success, error, counts = self.schedule_service.mark_completed(
+            self.current_schedule, date_range=(self.current_schedule.start_date, yesterday)
+        )
+        marked_count = counts["changed"]
         
-        if marked_count == 0:
+        if success and marked_count == 0:
             QMessageBox.information(
                 self, "Thông tin", 
                 "Không có ngày quá khứ nào cần đánh dấu hoàn thành"
             )
             return
         
-        # Save schedule
-        success, error = self.schedule_service.save_schedule(self.current_schedule)
         if success:
             QMessageBox.information(
                 self, "Thành công", 
@@ -351,4 +315,3 @@ class ProgressTracker(QWidget):
             self.update_progress_table()
         else:
             QMessageBox.warning(self, "Lỗi", error or "Không thể lưu")
-
@@ -4,9 +4,10 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QDateEdit, QTableWidget, QTableWidgetItem, QComboBox,
     QMessageBox, QGroupBox, QDialog, QDialogButtonBox,
-    QStackedWidget, QHeaderView, QListView
+    QStackedWidget, QHeaderView, QListView, QCheckBox, QApplication, QInputDialog
 )
-from PySide6.QtCore import Qt, QDate, Signal
+from PySide6.QtCore import Qt, QDate, Signal, QTimer
+from PySide6.QtGui import QKeySequence, QShortcut
 from datetime import date, time
 from typing import Optional, List, Tuple
 from src.models.schedule import Schedule
@@ -18,6 +19,7 @@ from src.models.subject import (
 from src.models.lesson import Lesson
 from src.services.schedule_service import ScheduleService
 from src.services.subject_service import SubjectService
+from src.services.week_template_service import WeekTemplateService
 from src.utils.i18n import tr
 from src.utils.logger import setup_logger
 
@@ -35,10 +37,13 @@ class ScheduleCreator(QWidget):
         super().__init__(parent)
         self.schedule_service = schedule_service
         self.subject_service = subject_service
+        self.week_template_service = WeekTemplateService(schedule_service.file_service)
         self.current_schedule: Optional[Schedule] = None
         self.current_week_index = 0
         self.current_step_index = 0
         self.setup_ui()
+        # Offer edits left in journals (e.g. after a crash) once the widget is shown
+        QTimer.singleShot(0, self.offer_recovery)
     
     def setup_ui(self):
         """Setup UI components"""
@@ -133,6 +138,14 @@ class ScheduleCreator(QWidget):
         self.copy_prev_week_btn.clicked.connect(self.copy_previous_week_subjects)
         self.copy_prev_week_btn.setEnabled(False)
 
+        self.save_template_btn = QPushButton("Lưu tuần làm mẫu")
+        self.save_template_btn.clicked.connect(self.save_week_as_template)
+        self.save_template_btn.setEnabled(False)
+
+        self.apply_template_btn = QPushButton("Áp dụng mẫu tuần")
+        self.apply_template_btn.clicked.connect(self.apply_week_template)
+        self.apply_template_btn.setEnabled(False)
+
         self.move_up_btn = QPushButton("Lên")
         self.move_up_btn.clicked.connect(self.move_subject_up)
         self.move_up_btn.setEnabled(False)
@@ -148,6 +161,8 @@ class ScheduleCreator(QWidget):
         self.auto_fill_btn = QPushButton(tr("auto_fill_times_lessons"))
         self.auto_fill_btn.clicked.connect(self.auto_fill_week_times_and_lessons)
         self.auto_fill_btn.setEnabled(False)
+        self.auto_fill_solver_check = QCheckBox(tr("auto_fill_use_solver"))
+        self.auto_fill_solver_check.setToolTip(tr("auto_fill_use_solver_tooltip"))
 
         self.prev_step_btn = QPushButton("Quay lại")
         self.prev_step_btn.clicked.connect(self.prev_step)
@@ -165,14 +180,28 @@ class ScheduleCreator(QWidget):
         self.save_btn.clicked.connect(self.save_schedule)
         self.save_btn.setEnabled(False)
 
+        self.undo_btn = QPushButton(tr("undo"))
+        self.undo_btn.clicked.connect(self.undo_edit)
+        self.undo_btn.setEnabled(False)
+        self.redo_btn = QPushButton(tr("redo"))
+        self.redo_btn.clicked.connect(self.redo_edit)
+        self.redo_btn.setEnabled(False)
+        QShortcut(QKeySequence.StandardKey.Undo, self, activated=self.undo_edit)
+        QShortcut(QKeySequence.StandardKey.Redo, self, activated=self.redo_edit)
+
         action_layout.addWidget(self.add_subject_btn)
         action_layout.addWidget(self.remove_subject_btn)
         action_layout.addWidget(self.copy_prev_week_btn)
+        action_layout.addWidget(self.save_template_btn)
+        action_layout.addWidget(self.apply_template_btn)
         action_layout.addWidget(self.move_up_btn)
         action_layout.addWidget(self.move_down_btn)
         action_layout.addWidget(self.choose_lesson_btn)
         action_layout.addWidget(self.auto_fill_btn)
+        action_layout.addWidget(self.auto_fill_solver_check)
         action_layout.addStretch()
+        action_layout.addWidget(self.undo_btn)
+        action_layout.addWidget(self.redo_btn)
         action_layout.addWidget(self.prev_step_btn)
         action_layout.addWidget(self.next_step_btn)
         action_layout.addWidget(self.validate_btn)
@@ -200,9 +229,14 @@ class ScheduleCreator(QWidget):
             return
         
         try:
-            self.current_schedule = self.schedule_service.create_schedule(
+            schedule = self.schedule_service.create_schedule(
                 start_date, end_date, f"{tr('schedule')} {start_date} - {end_date}"
             )
+            if self.current_schedule:
+                # The previous schedule is left: its unsaved edits are dropped
+                self.schedule_service.close_journal(self.current_schedule.schedule_id, discard=True)
+            self.current_schedule = schedule
+            self.schedule_service.open_journal(schedule)
             self.current_week_index = 0
             self.current_step_index = 0
             self.update_ui()
@@ -237,6 +271,40 @@ class ScheduleCreator(QWidget):
         self.save_btn.setEnabled(True)
 
         self.update_step_ui()
+
+    def update_undo_buttons(self):
+        journal = self.schedule_service.get_journal(self.current_schedule)
+        self.undo_btn.setEnabled(bool(journal and journal.can_undo))
+        self.redo_btn.setEnabled(bool(journal and journal.can_redo))
+
+    def undo_edit(self):
+        """Undo the last edit of the current schedule"""
+        if self.current_schedule and self.schedule_service.undo_edit(self.current_schedule):
+            self.update_step_ui()
+
+    def redo_edit(self):
+        """Redo the last undone edit of the current schedule"""
+        if self.current_schedule and self.schedule_service.redo_edit(self.current_schedule):
+            self.update_step_ui()
+
+    def offer_recovery(self):
+        """Ask to restore schedules whose journal still holds edits"""
+        if self.current_schedule:
+            return
+        for schedule_id, name, _ in self.schedule_service.recoverable_journals():
+            answer = QMessageBox.question(
+                self, tr("recover_schedule_title"),
+                tr("recover_schedule_question").format(name=name or schedule_id)
+            )
+            if answer != QMessageBox.StandardButton.Yes or self.current_schedule:
+                self.schedule_service.close_journal(schedule_id, discard=True)
+                continue
+            schedule = self.schedule_service.recover_schedule(schedule_id)
+            if schedule:
+                self.current_schedule = schedule
+                self.current_week_index = 0
+                self.current_step_index = 0
+                self.update_ui()
     
     def prev_week(self):
         """Go to previous week"""
@@ -285,6 +353,8 @@ class ScheduleCreator(QWidget):
         self.add_subject_btn.setEnabled(in_step1)
         self.remove_subject_btn.setEnabled(in_step1)
         self.copy_prev_week_btn.setEnabled(in_step1 and self.current_week_index > 0)
+        self.save_template_btn.setEnabled(in_step1)
+        self.apply_template_btn.setEnabled(in_step1)
 
         self.move_up_btn.setEnabled(in_step2)
         self.move_down_btn.setEnabled(in_step2)
@@ -293,11 +363,14 @@ class ScheduleCreator(QWidget):
             len(day.selected_subject_ids) > 0
             for day in self.current_schedule.weeks[self.current_week_index].days
         )
-        self.auto_fill_btn.setEnabled((in_step2 or in_step3) and has_any_subjects)
+        can_auto_fill = (in_step2 or in_step3) and has_any_subjects
+        self.auto_fill_btn.setEnabled(can_auto_fill)
+        self.auto_fill_solver_check.setEnabled(can_auto_fill)
 
         self.refresh_subject_table()
         self.refresh_order_table()
         self.refresh_lesson_table()
+        self.update_undo_buttons()
 
     def next_step(self):
         if self.current_step_index < 2:
@@ -438,8 +511,8 @@ class ScheduleCreator(QWidget):
 
         new_subjects = list(day.selected_subject_ids)
         new_subjects.append(subject.subject_id)
-        success, error = self.schedule_service.set_day_subjects(
-            self.current_schedule, week_num, day_index, new_subjects
+        success, error = self.schedule_service.edit_schedule(
+            self.current_schedule, "set_day_subjects", week_num, day_index, new_subjects
         )
         if not success:
             QMessageBox.warning(self, tr("error"), error or "Không thể thêm môn học")
@@ -465,8 +538,8 @@ class ScheduleCreator(QWidget):
             return
         new_subjects = list(day.selected_subject_ids)
         new_subjects.remove(subject_id)
-        success, error = self.schedule_service.set_day_subjects(
-            self.current_schedule, self.current_week_index + 1, day_index, new_subjects
+        success, error = self.schedule_service.edit_schedule(
+            self.current_schedule, "set_day_subjects", self.current_week_index + 1, day_index, new_subjects
         )
         if not success:
             QMessageBox.warning(self, tr("error"), error or "Không thể xóa môn học")
@@ -507,8 +580,8 @@ class ScheduleCreator(QWidget):
         new_subjects = list(day.selected_subject_ids)
         subject_id = new_subjects.pop(current_index)
         new_subjects.insert(new_index, subject_id)
-        success, error = self.schedule_service.set_day_subjects(
-            self.current_schedule, self.current_week_index + 1, day_index, new_subjects
+        success, error = self.schedule_service.edit_schedule(
+            self.current_schedule, "set_day_subjects", self.current_week_index + 1, day_index, new_subjects
         )
         if not success:
             QMessageBox.warning(self, tr("error"), error or "Không thể sắp xếp môn học")
@@ -578,14 +651,14 @@ class ScheduleCreator(QWidget):
             return
 
         if selected_time:
-            success, error = self.schedule_service.set_day_subject_time(
-                self.current_schedule, self.current_week_index + 1, day_index, subject_id, selected_time, slot_index
+            success, error = self.schedule_service.edit_schedule(
+                self.current_schedule, "set_day_subject_time", self.current_week_index + 1, day_index, subject_id, selected_time, slot_index
             )
             if not success:
                 QMessageBox.warning(self, tr("error"), error or "Không thể đặt giờ")
                 return
-        success, error = self.schedule_service.set_day_subject_lesson(
-            self.current_schedule, self.current_week_index + 1, day_index, subject_id, lesson.lesson_id, slot_index
+        success, error = self.schedule_service.edit_schedule(
+            self.current_schedule, "set_day_subject_lesson", self.current_week_index + 1, day_index, subject_id, lesson.lesson_id, slot_index
         )
         if not success:
             QMessageBox.warning(self, tr("error"), error or "Không thể chọn bài học")
@@ -647,8 +720,8 @@ class ScheduleCreator(QWidget):
     def copy_previous_week_subjects(self):
         if not self.current_schedule or self.current_week_index <= 0:
             return
-        success, error = self.schedule_service.copy_week_subjects_and_times(
-            self.current_schedule, self.current_week_index, self.current_week_index + 1
+        success, error = self.schedule_service.edit_schedule(
+            self.current_schedule, "copy_week_subjects_and_times", self.current_week_index, self.current_week_index + 1
         )
         if not success:
             QMessageBox.warning(self, tr("error"), error or "Không thể sao chép tuần trước")
@@ -656,15 +729,66 @@ class ScheduleCreator(QWidget):
         self.current_step_index = 2
         self.update_step_ui()
 
+    def save_week_as_template(self):
+        """Save the subjects and start times of the current week as a named template"""
+        if not self.current_schedule:
+            return
+        name, ok = QInputDialog.getText(self, "Lưu tuần làm mẫu", "Tên mẫu tuần:")
+        if not ok:
+            return
+        success, error, _ = self.week_template_service.create_from_week(
+            self.current_schedule, self.current_week_index + 1, name
+        )
+        if not success:
+            QMessageBox.warning(self, tr("error"), error or "Không thể lưu mẫu tuần")
+
+    def apply_week_template(self):
+        """Apply a saved template to the current week and, optionally, the weeks after it"""
+        if not self.current_schedule:
+            return
+        templates = self.week_template_service.get_all_templates()
+        if not templates:
+            QMessageBox.information(self, "Áp dụng mẫu tuần", "Chưa có mẫu tuần nào")
+            return
+        names = [t.name for t in templates]
+        name, ok = QInputDialog.getItem(self, "Áp dụng mẫu tuần", "Mẫu tuần:", names, 0, False)
+        if not ok:
+            return
+        first = self.current_week_index + 1
+        week_count = len(self.current_schedule.weeks)
+        last, ok = QInputDialog.getInt(
+            self, "Áp dụng mẫu tuần", f"Áp dụng từ tuần {first} đến tuần:", first, first, week_count
+        )
+        if not ok:
+            return
+        success, error = self.schedule_service.edit_schedule(
+            self.current_schedule, "apply_week_template", templates[names.index(name)],
+            list(range(first, last + 1))
+        )
+        if not success:
+            QMessageBox.warning(self, tr("error"), error or "Không thể áp dụng mẫu tuần")
+            return
+        self.update_step_ui()
+
     def auto_fill_week_times_and_lessons(self):
         """Auto-fill subject_time_slots and subject_lesson_map for current week."""
         if not self.current_schedule:
             return
-        success, error, days_with_issues = self.schedule_service.auto_fill_week_times_and_lessons(
-            self.current_schedule, self.current_week_index + 1
-        )
+        use_solver = self.auto_fill_solver_check.isChecked()
+        if use_solver:
+            # The planner searches for up to a couple of seconds
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            success, error, days_with_issues = self.schedule_service.edit_schedule(
+                self.current_schedule, "auto_fill_week_times_and_lessons", self.current_week_index + 1, use_solver=use_solver
+            )
+        finally:
+            if use_solver:
+                QApplication.restoreOverrideCursor()
         if not success:
             QMessageBox.warning(self, tr("error"), error or tr("auto_fill_failed"))
+            # Days may have been filled before the failure (they can be undone)
+            self.update_step_ui()
             return
         self.update_step_ui()
         if days_with_issues:
@@ -711,13 +835,15 @@ class ScheduleCreator(QWidget):
         if not self.current_schedule:
             return
 
-        for week_index in range(len(self.current_schedule.weeks)):
-            success, error, _ = self.schedule_service.build_week_items(
-                self.current_schedule, week_index + 1
-            )
-            if not success:
-                QMessageBox.warning(self, tr("error"), error or "Không thể tạo kế hoạch huấn luyện")
-                return
+        # Weeks are built in a process pool for long schedules
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            success, error, _ = self.schedule_service.build_all_weeks(self.current_schedule)
+        finally:
+            QApplication.restoreOverrideCursor()
+        if not success:
+            QMessageBox.warning(self, tr("error"), error or "Không thể tạo kế hoạch huấn luyện")
+            return
 
         success, error = self.schedule_service.save_schedule(self.current_schedule)
         if success:
@@ -2,27 +2,19 @@
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QComboBox, QFileDialog,
-    QMessageBox, QGroupBox, QHeaderView
+    QTableView, QComboBox, QFileDialog, QInputDialog,
+    QMessageBox, QGroupBox, QHeaderView, QApplication
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QPixmap, QPainter
 from typing import Optional, List
 from src.models.schedule import Schedule
 from src.services.schedule_service import ScheduleService
 from src.services.excel_service import ExcelService
-from src.utils.i18n import tr
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import cm
-try:
-    from PIL import Image, ImageDraw, ImageFont
-    PIL_AVAILABLE = True
-except ImportError:
-    PIL_AVAILABLE = False
-import io
+from src.utils.i18n import tr, on_language_changed
+from src.ui.widgets.week_grid_model import WeekGridCache, WeekGridModel
+# ReportLab and PIL are imported inside export_to_pdf / export_to_image: they are only needed
+# when exporting and importing them here slowed down application startup.
 
 
 class ScheduleViewer(QWidget):
@@ -33,8 +25,14 @@ class ScheduleViewer(QWidget):
         super().__init__(parent)
         self.schedule_service = schedule_service
         self.excel_service = ExcelService()
+        self.schedules: List[Schedule] = []
         self.current_schedule: Optional[Schedule] = None
+        self.week_grids = WeekGridCache()
+        # Created on first PDF export (keeps the rendered-week cache for the session)
+        self.pdf_export_service = None
+        self.image_export_service = None
         self.setup_ui()
+        on_language_changed(self.load_schedules)
     
     def setup_ui(self):
         """Setup UI components"""
@@ -62,13 +60,11 @@ class ScheduleViewer(QWidget):
         week_layout.addStretch()
         layout.addLayout(week_layout)
         
-        # Schedule table
-        self.table = QTableWidget()
-        self.table.setColumnCount(6)
-        self.table.setHorizontalHeaderLabels([
-            tr("monday"), tr("tuesday"), tr("wednesday"), 
-            tr("thursday"), tr("friday"), tr("saturday")
-        ])
+        # Schedule table (rows = time bands, columns = Monday..Saturday)
+        self.week_model = WeekGridModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.week_model)
+        self.table.setWordWrap(True)
         header = self.table.horizontalHeader()
         header.setStretchLastSection(False)
         header.setSectionResizeMode(QHeaderView.Stretch)
@@ -85,6 +81,9 @@ class ScheduleViewer(QWidget):
         export_layout.addWidget(self.export_pdf_btn)
         export_layout.addWidget(self.export_excel_btn)
         export_layout.addWidget(self.export_image_btn)
+        self.export_all_images_btn = QPushButton(tr("export_all_weeks_image"))
+        self.export_all_images_btn.clicked.connect(self.export_all_weeks_to_image)
+        export_layout.addWidget(self.export_all_images_btn)
         export_layout.addStretch()
         layout.addLayout(export_layout)
         
@@ -94,72 +93,65 @@ class ScheduleViewer(QWidget):
     def load_schedules(self):
         """Load all schedules"""
         self.schedule_combo.clear()
-        schedules = self.schedule_service.get_all_schedules()
+        self.week_grids.clear()
+        self.schedules = self.schedule_service.get_all_schedules()
         
-        for schedule in schedules:
+        for schedule in self.schedules:
             name = schedule.name or f"{tr('schedule')} {schedule.start_date}"
-            self.schedule_combo.addItem(name, schedule)
+            self.schedule_combo.addItem(name)
         
-        if schedules:
+        if self.schedules:
             self.on_schedule_changed(0)
     
     def on_schedule_changed(self, index):
         """Handle schedule selection change"""
-        if index < 0:
+        if index < 0 or index >= len(self.schedules):
             return
         
-        self.current_schedule = self.schedule_combo.itemData(index)
-        if not self.current_schedule:
-            return
+        self.current_schedule = self.schedules[index]
         
-        # Update week combo
+        # Update week combo (the week is looked up by index, not stored in the combo)
+        self.week_combo.blockSignals(True)
         self.week_combo.clear()
         for week in self.current_schedule.weeks:
             self.week_combo.addItem(
-                f"Tuần {week.week_number} ({week.start_date} - {week.end_date})",
-                week
+                f"Tuần {week.week_number} ({week.start_date} - {week.end_date})"
             )
+        self.week_combo.blockSignals(False)
         
         if self.current_schedule.weeks:
             self.display_week(0)
+        else:
+            self.week_model.set_grid(None)
+            self.table.clearSpans()
     
     def display_week(self, week_index):
         """Display schedule for selected week"""
-        if not self.current_schedule or week_index < 0:
+        if not self.current_schedule or not (0 <= week_index < len(self.current_schedule.weeks)):
+            self.week_model.set_grid(None)
+            self.table.clearSpans()
             return
         
-        week = self.week_combo.itemData(week_index)
-        if not week:
-            return
-        
-        # Clear table
-        self.table.setRowCount(0)
-        
-        # Find max number of items per day
-        max_items = 0
-        for day in week.days:
-            max_items = max(max_items, len(day.items))
+        schedule = self.current_schedule
+        week_layout = self.week_grids.get(schedule.schedule_id, week_index, schedule.weeks[week_index])
+        self.week_model.set_grid(week_layout)
+        self.table.clearSpans()
+        for cell in week_layout.cells:
+            if cell.row_span > 1:
+                self.table.setSpan(cell.row, cell.col, cell.row_span, 1)
+        self.table.resizeRowsToContents()
         
-        if max_items == 0:
+        # Lay out the neighbouring weeks once the event loop is idle
+        QTimer.singleShot(0, lambda: self._prefetch_weeks(schedule, week_index))
+    
+    def _prefetch_weeks(self, schedule: Schedule, week_index: int):
+        """Build the grids of the weeks before and after week_index"""
+        if schedule is not self.current_schedule:
             return
-        
-        self.table.setRowCount(max_items)
-        
-        # Fill table
-        for day_index, day in enumerate(week.days):
-            for item_index, item in enumerate(day.items):
-                text = self._format_item_display(item)
-                
-                table_item = QTableWidgetItem(text)
-                self.table.setItem(item_index, day_index, table_item)
+        for neighbour in (week_index + 1, week_index - 1):
+            if 0 <= neighbour < len(schedule.weeks):
+                self.week_grids.get(schedule.schedule_id, neighbour, schedule.weeks[neighbour])
 
-    def _format_item_display(self, item) -> str:
-        """Format schedule item for display."""
-        content = item.subject_name
-        if item.lesson_name and item.lesson_name != item.subject_name:
-            content = f"{item.subject_name}: {item.lesson_name}"
-        return f"{item.start_time.strftime('%H:%M')} - {item.end_time.strftime('%H:%M')}: {content}"
-    
     def export_to_pdf(self):
         """Export schedule to PDF"""
         if not self.current_schedule:
@@ -173,67 +165,16 @@ class ScheduleViewer(QWidget):
         if not file_path:
             return
         
-        try:
-            doc = SimpleDocTemplate(file_path, pagesize=landscape(A4))
-            story = []
-            styles = getSampleStyleSheet()
-            
-            # Title
-            title = Paragraph(
-                f"<b>{self.current_schedule.name or 'Thời khóa biểu'}</b>",
-                styles['Title']
-            )
-            story.append(title)
-            story.append(Spacer(1, 0.5*cm))
-            
-            # Export all weeks
-            for week in self.current_schedule.weeks:
-                # Week header
-                week_title = Paragraph(
-                    f"<b>Tuần {week.week_number}: {week.start_date} - {week.end_date}</b>",
-                    styles['Heading2']
-                )
-                story.append(week_title)
-                story.append(Spacer(1, 0.3*cm))
-                
-                # Create table data
-                data = [["Thứ Hai", "Thứ Ba", "Thứ Tư", "Thứ Năm", "Thứ Sáu", "Thứ Bảy"]]
-                
-                # Find max items
-                max_items = max(len(day.items) for day in week.days)
-                
-                for i in range(max_items):
-                    row = []
-                    for day in week.days:
-                        if i < len(day.items):
-                            item = day.items[i]
-                            cell_text = self._format_item_display(item)
-                            row.append(cell_text)
-                        else:
-                            row.append("")
-                    data.append(row)
-                
-                # Create table
-                table = Table(data, colWidths=[3*cm]*6)
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ]))
-                
-                story.append(table)
-                story.append(Spacer(1, 0.5*cm))
-            
-            doc.build(story)
+        if self.pdf_export_service is None:
+            from src.services.pdf_export_service import PdfExportService
+            cache_dir = self.schedule_service.file_service.base_dir / "cache" / "pdf_weeks"
+            self.pdf_export_service = PdfExportService(cache_dir=str(cache_dir))
+        
+        success, error = self.pdf_export_service.export_schedule(self.current_schedule, file_path)
+        if success:
             QMessageBox.information(self, "Thành công", f"Đã xuất PDF: {file_path}")
-        except Exception as e:
-            QMessageBox.warning(self, "Lỗi", f"Không thể xuất PDF: {str(e)}")
+        else:
+            QMessageBox.warning(self, "Lỗi", error)
     
     def export_to_excel(self):
         """Export schedule to Excel"""
@@ -259,19 +200,54 @@ class ScheduleViewer(QWidget):
         except Exception as e:
             QMessageBox.warning(self, "Lỗi", f"Không thể xuất Excel: {str(e)}")
     
+    def _image_export_service(self):
+        if self.image_export_service is None:
+            from src.services.image_export_service import ImageExportService
+            self.image_export_service = ImageExportService()
+        return self.image_export_service
+    
     def export_to_image(self):
-        """Export schedule to image"""
-        if not PIL_AVAILABLE:
-            QMessageBox.warning(
-                self, "Lỗi", 
-                "PIL/Pillow không được cài đặt. Vui lòng cài đặt: pip install Pillow"
-            )
+        """Export the selected week to image"""
+        if not self.current_schedule:
+            QMessageBox.warning(self, tr("warning"), tr("please_select_schedule"))
+            return
+        
+        week_index = self.week_combo.currentIndex()
+        if week_index < 0 or week_index >= len(self.current_schedule.weeks):
+            QMessageBox.warning(self, tr("warning"), tr("please_select_week"))
             return
         
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Lưu Ảnh", f"{self.current_schedule.name or 'schedule'}.png",
+            tr("image_files")
+        )
+        if not file_path:
+            return
+        
+        success, error, _ = self._image_export_service().export_weeks(
+            self.current_schedule, file_path, week_indexes=[week_index]
+        )
+        if success:
+            QMessageBox.information(self, "Thành công", f"Đã xuất ảnh: {file_path}")
+        else:
+            QMessageBox.warning(self, "Lỗi", error)
+    
+    def export_all_weeks_to_image(self):
+        """Export every week: one PNG per week or one tall PNG"""
         if not self.current_schedule:
             QMessageBox.warning(self, tr("warning"), tr("please_select_schedule"))
             return
         
+        from src.services.image_export_service import IMAGE_MODE_PAGES, IMAGE_MODE_TALL
+        modes = [(tr("image_export_pages"), IMAGE_MODE_PAGES), (tr("image_export_tall"), IMAGE_MODE_TALL)]
+        label, ok = QInputDialog.getItem(
+            self, tr("export_all_weeks_image"), tr("image_export_mode"),
+            [text for text, _ in modes], 0, False
+        )
+        if not ok:
+            return
+        mode = dict(modes)[label]
+        
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Lưu Ảnh", f"{self.current_schedule.name or 'schedule'}.png",
             tr("image_files")
@@ -279,53 +255,14 @@ class ScheduleViewer(QWidget):
         if not file_path:
             return
         
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
         try:
-            # Get current week
-            week_index = self.week_combo.currentIndex()
-            if week_index < 0:
-                QMessageBox.warning(self, tr("warning"), tr("please_select_week"))
-                return
-            
-            week = self.week_combo.itemData(week_index)
-            if not week:
-                return
-            
-            # Create image
-            cell_width = 200
-            cell_height = 100
-            header_height = 40
-            row_count = max(len(day.items) for day in week.days) + 1
-            
-            img_width = 6 * cell_width
-            img_height = header_height + row_count * cell_height
-            
-            img = Image.new('RGB', (img_width, img_height), color='white')
-            draw = ImageDraw.Draw(img)
-            
-            # Draw header
-            days = ["Thứ Hai", "Thứ Ba", "Thứ Tư", "Thứ Năm", "Thứ Sáu", "Thứ Bảy"]
-            for i, day_name in enumerate(days):
-                x = i * cell_width
-                draw.rectangle([x, 0, x + cell_width, header_height], 
-                              fill='gray', outline='black')
-                # Note: Font rendering would need a font file
-                # For simplicity, using basic text
-                draw.text((x + 10, header_height // 2 - 10), day_name, fill='white')
-            
-            # Draw cells
-            for day_index, day in enumerate(week.days):
-                for item_index, item in enumerate(day.items):
-                    x = day_index * cell_width
-                    y = header_height + item_index * cell_height
-                    
-                    draw.rectangle([x, y, x + cell_width, y + cell_height],
-                                  outline='black')
-                    
-                    text = self._format_item_display(item)
-                    draw.text((x + 5, y + 5), text, fill='black')
-            
-            img.save(file_path)
-            QMessageBox.information(self, "Thành công", f"Đã xuất ảnh: {file_path}")
-        except Exception as e:
-            QMessageBox.warning(self, "Lỗi", f"Không thể xuất ảnh: {str(e)}")
-
+            success, error, paths = self._image_export_service().export_weeks(
+                self.current_schedule, file_path, mode=mode
+            )
+        finally:
+            QApplication.restoreOverrideCursor()
+        if success:
+            QMessageBox.information(self, "Thành công", f"Đã xuất {len(paths)} ảnh: {file_path}")
+        else:
+            QMessageBox.warning(self, "Lỗi", error)
@@ -1,12 +1,15 @@
 """Settings widget - season dates (dd/mm) and schedule times per season"""
 
 from datetime import time
+from typing import Optional
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QGroupBox, QFormLayout, QMessageBox, QDateEdit, QTimeEdit
+    QGroupBox, QFormLayout, QMessageBox, QDateEdit, QTimeEdit, QComboBox
 )
 from PySide6.QtCore import Qt, QDate
 from src.config.settings import Settings
+from src.services.file_service import FileService, STORAGE_PROFILES, ZSTD_AVAILABLE, STORAGE_PROFILE_ZSTD
+from src.utils.logger import setup_logger
 from src.utils.i18n import tr
 from src.utils.season_schedule import (
     DEFAULT_SUMMER_START_MONTH, DEFAULT_SUMMER_START_DAY,
@@ -17,13 +20,16 @@ from src.utils.season_schedule import (
 # Year used for QDateEdit (we only care about month/day)
 _DUMMY_YEAR = 2000
 
+logger = setup_logger()
+
 
 class SettingsWidget(QWidget):
     """Widget for app settings: season dates (dd/mm) and schedule times per season"""
 
-    def __init__(self, settings: Settings, parent=None):
+    def __init__(self, settings: Settings, file_service: Optional[FileService] = None, parent=None):
         super().__init__(parent)
         self.settings = settings
+        self.file_service = file_service
         self.setup_ui()
         self.load_values()
 
@@ -91,6 +97,19 @@ class SettingsWidget(QWidget):
         winter_group.setLayout(winter_layout)
         layout.addWidget(winter_group)
 
+        # Data file format (serialization profile)
+        storage_group = QGroupBox(tr("settings_storage_group"))
+        storage_layout = QFormLayout()
+        self.storage_profile_combo = QComboBox()
+        for profile in STORAGE_PROFILES:
+            if profile == STORAGE_PROFILE_ZSTD and not ZSTD_AVAILABLE:
+                continue
+            self.storage_profile_combo.addItem(tr(f"storage_profile_{profile}"), profile)
+        storage_layout.addRow(tr("settings_storage_profile"), self.storage_profile_combo)
+        storage_layout.addRow(QLabel(tr("settings_storage_help")))
+        storage_group.setLayout(storage_layout)
+        layout.addWidget(storage_group)
+
         # Save button
         btn_layout = QHBoxLayout()
         self.save_btn = QPushButton(tr("save"))
@@ -123,6 +142,9 @@ class SettingsWidget(QWidget):
 
     def load_values(self):
         """Load season dates and times from settings or defaults."""
+        index = self.storage_profile_combo.findData(self.settings.get_storage_profile())
+        self.storage_profile_combo.setCurrentIndex(max(index, 0))
+
         # Dates: dd/mm
         self.summer_start_date.setDate(QDate(
             _DUMMY_YEAR,
@@ -211,4 +233,18 @@ class SettingsWidget(QWidget):
             self.winter_afternoon_start, self.winter_afternoon_end,
         )))
 
-        QMessageBox.information(self, tr("success"), tr("settings_saved"))
+        message = tr("settings_saved")
+        profile = self.storage_profile_combo.currentData()
+        if profile and profile != self.settings.get_storage_profile():
+            self.settings.set_storage_profile(profile)
+            if self.file_service:
+                # Rewrite existing files in the background; new writes use the profile immediately
+                self.file_service.set_storage_profile(profile)
+                self.file_service.start_storage_migration(
+                    on_done=lambda counts: logger.info(
+                        "Storage migration to '%s' finished: %s", profile, counts
+                    )
+                )
+                message += "\n\n" + tr("settings_storage_migration_started")
+
+        QMessageBox.information(self, tr("success"), message)
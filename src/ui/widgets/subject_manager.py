@@ -10,7 +10,7 @@ from typing import List, Optional
 from datetime import datetime
 from src.models.subject import Subject
 from src.services.subject_service import SubjectService
-from src.utils.i18n import tr
+from src.utils.i18n import tr, on_language_changed
 
 
 class SubjectManager(QWidget):
@@ -25,6 +25,7 @@ class SubjectManager(QWidget):
         self.subjects: List[Subject] = []
         self.setup_ui()
         self.load_subjects()
+        on_language_changed(self.update_ui_language)
     
     def setup_ui(self):
         """Setup UI components"""
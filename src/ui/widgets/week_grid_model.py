@@ -0,0 +1,88 @@
+"""Week grid model for the schedule viewer.
+
+Weeks are laid out by the shared layout engine (src.services.schedule_layout),
+kept in a small LRU cache and shown through a QAbstractTableModel, so switching
+between weeks only swaps the layout the view reads from.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from src.models.schedule import WeekSchedule
+from src.services.schedule_layout import WeekLayout, layout_week, LAYOUT_DAY_COUNT
+from src.utils.i18n import tr
+
+DAY_KEYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday")
+
+# Number of week layouts kept by the viewer
+WEEK_GRID_CACHE_SIZE = 32
+
+
+class WeekGridCache:
+    """LRU cache of week layouts keyed by (schedule_id, week index)"""
+
+    def __init__(self, build: Callable[[WeekSchedule], WeekLayout] = layout_week,
+                 max_size: int = WEEK_GRID_CACHE_SIZE):
+        self._build = build
+        self.max_size = max_size
+        self._grids: "OrderedDict[Tuple[str, int], WeekLayout]" = OrderedDict()
+
+    def get(self, schedule_id: str, week_index: int, week: WeekSchedule) -> WeekLayout:
+        key = (schedule_id, week_index)
+        grid = self._grids.get(key)
+        if grid is not None:
+            self._grids.move_to_end(key)
+            return grid
+        grid = self._build(week)
+        self._grids[key] = grid
+        if len(self._grids) > self.max_size:
+            self._grids.popitem(last=False)
+        return grid
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return key in self._grids
+
+    def clear(self):
+        self._grids.clear()
+
+
+class WeekGridModel(QAbstractTableModel):
+    """Read-only table model over a WeekLayout (rows = time intervals, columns = days)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._layout: Optional[WeekLayout] = None
+        self._cells = {}
+
+    @property
+    def week_layout(self) -> Optional[WeekLayout]:
+        return self._layout
+
+    def set_grid(self, layout: Optional[WeekLayout]):
+        self.beginResetModel()
+        self._layout = layout
+        self._cells = layout.cell_map() if layout is not None else {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid() or self._layout is None:
+            return 0
+        return self._layout.row_count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else LAYOUT_DAY_COUNT
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        cell = self._cells.get((index.row(), index.column()))
+        return cell.text if cell is not None else None
+
+    def headerData(self, section: int, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return tr(DAY_KEYS[section]) if section < len(DAY_KEYS) else None
+        if self._layout is not None and section < self._layout.row_count:
+            return self._layout.row_label(section)
+        return None
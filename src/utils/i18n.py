@@ -1,33 +1,81 @@
-"""Internationalization support"""
+"""Internationalization support.
+
+Translations are edited in resources/translations/<lang>.json and compiled into
+src/utils/translations_compiled.py (``python -m src.utils.i18n``), which Python
+loads from its cached bytecode in a single read. The JSON files are only parsed
+when the compiled module is missing or older than them.
+
+tr() is a single lookup in the table of the current language. Widgets register
+their texts with bind_text() (or a callback with on_language_changed()), and
+set_language() re-applies just those registrations.
+"""
 
 import json
+import sys
+import weakref
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 # Default language
 DEFAULT_LANGUAGE = "vi"
 SUPPORTED_LANGUAGES = ["vi", "en"]
 
+_TRANSLATIONS_DIR = Path(__file__).parent.parent.parent / "resources" / "translations"
+_COMPILED_MODULE_PATH = Path(__file__).parent / "translations_compiled.py"
+
 # Translation cache
 _translations: Dict[str, Dict[str, str]] = {}
 _current_language = DEFAULT_LANGUAGE
+# Table of the current language, looked up directly by tr()
+_active: Dict[str, str] = {}
+
+# (weak ref to object, setter method name, key) applied again on every language change
+_bindings: List[Tuple[weakref.ref, str, str]] = []
+# Weak references to callbacks (WeakMethod for bound methods) run after the bindings
+_callbacks: List[Callable[[], Optional[Callable[[], None]]]] = []
+
+
+def _compiled_is_current() -> bool:
+    """True if the compiled module exists and no JSON source is newer than it."""
+    try:
+        compiled_mtime = _COMPILED_MODULE_PATH.stat().st_mtime
+    except OSError:
+        return False
+    for language in SUPPORTED_LANGUAGES:
+        try:
+            if (_TRANSLATIONS_DIR / f"{language}.json").stat().st_mtime > compiled_mtime:
+                return False
+        except OSError:
+            continue
+    return True
+
+
+def _load_compiled_translations():
+    """Fill the cache from the compiled module when it is up to date."""
+    if not _compiled_is_current():
+        return
+    try:
+        from . import translations_compiled
+    except ImportError:
+        return
+    for language, table in translations_compiled.TRANSLATIONS.items():
+        _translations.setdefault(language, table)
 
 
 def load_translations(language: str = DEFAULT_LANGUAGE) -> Dict[str, str]:
     """Load translations for a language"""
     if language in _translations:
         return _translations[language]
-    
+
     # Find translation file
-    base_path = Path(__file__).parent.parent.parent
-    translation_file = base_path / "resources" / "translations" / f"{language}.json"
-    
+    translation_file = _TRANSLATIONS_DIR / f"{language}.json"
+
     if not translation_file.exists():
         # Fallback to default
         if language != DEFAULT_LANGUAGE:
             return load_translations(DEFAULT_LANGUAGE)
         return {}
-    
+
     try:
         with open(translation_file, 'r', encoding='utf-8') as f:
             translations = json.load(f)
@@ -38,12 +86,35 @@ def load_translations(language: str = DEFAULT_LANGUAGE) -> Dict[str, str]:
         return {}
 
 
+def compile_translations(output_path: Optional[Path] = None) -> Path:
+    """Write every JSON catalog into a Python module (run at build time / after editing translations)"""
+    output_path = Path(output_path) if output_path else _COMPILED_MODULE_PATH
+    tables = {}
+    for language in SUPPORTED_LANGUAGES:
+        with open(_TRANSLATIONS_DIR / f"{language}.json", 'r', encoding='utf-8') as f:
+            tables[language] = json.load(f)
+    lines = [
+        '"""Compiled translation tables. Generated by `python -m src.utils.i18n`, do not edit."""',
+        "",
+        "TRANSLATIONS = {",
+    ]
+    for language, table in tables.items():
+        lines.append(f"    {language!r}: {{")
+        for key, value in table.items():
+            lines.append(f"        {key!r}: {value!r},")
+        lines.append("    },")
+    lines.append("}")
+    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return output_path
+
+
 def set_language(language: str):
-    """Set current language"""
-    global _current_language
+    """Set current language and re-apply every registered text"""
+    global _current_language, _active
     if language in SUPPORTED_LANGUAGES:
         _current_language = language
-        load_translations(language)
+        _active = load_translations(language)
+        retranslate()
 
 
 def get_language() -> str:
@@ -53,10 +124,59 @@ def get_language() -> str:
 
 def tr(key: str, default: Optional[str] = None) -> str:
     """Translate a key"""
-    translations = load_translations(_current_language)
-    return translations.get(key, default or key)
+    return _active.get(key, default or key)
+
+
+def bind_text(obj, setter: str, key: str) -> str:
+    """Call obj.<setter>(tr(key)) now and again after each language change. Returns the text.
+    Only a weak reference to obj is kept."""
+    text = tr(key)
+    getattr(obj, setter)(text)
+    _bindings.append((weakref.ref(obj), setter, key))
+    return text
+
+
+def on_language_changed(callback: Callable[[], None]):
+    """Run callback after each language change (bound methods are held weakly)"""
+    if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+        _callbacks.append(weakref.WeakMethod(callback))
+    else:
+        _callbacks.append(lambda: callback)
+
+
+def retranslate():
+    """Re-apply all bindings and callbacks; drops those whose object is gone"""
+    alive = []
+    for ref, setter, key in _bindings:
+        obj = ref()
+        if obj is None:
+            continue
+        try:
+            getattr(obj, setter)(_active.get(key, key))
+        except RuntimeError:
+            # Qt object already deleted on the C++ side
+            continue
+        alive.append((ref, setter, key))
+    _bindings[:] = alive
+
+    callbacks = []
+    for ref in _callbacks:
+        callback = ref()
+        if callback is None:
+            continue
+        try:
+            callback()
+        except RuntimeError:
+            continue
+        callbacks.append(ref)
+    _callbacks[:] = callbacks
 
 
 # Initialize translations
-load_translations(DEFAULT_LANGUAGE)
+_load_compiled_translations()
+_active = load_translations(DEFAULT_LANGUAGE)
+
 
+if __name__ == "__main__":
+    print(f"Wrote {compile_translations()}")
+    sys.exit(0)
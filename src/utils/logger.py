@@ -1,52 +1,199 @@
-"""Logging configuration"""
+"""Logging configuration.
 
+Log calls only put the record on a queue; a background QueueListener thread
+formats it and writes it to the console and to the daily log file, so the GUI
+thread never waits on disk. The daily file rolls over to .1, .2, ... when it
+grows past LOG_MAX_BYTES, and daily files older than LOG_RETENTION_DAYS are
+removed. Identical warnings repeated within REPEAT_INTERVAL_SECONDS are
+collapsed into one line with a count.
+"""
+
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_RETENTION_DAYS = 30
+REPEAT_INTERVAL_SECONDS = 60.0
+
+# logger name -> (listener, file handler)
+_listeners: Dict[str, Tuple[logging.handlers.QueueListener, "DailyRotatingFileHandler"]] = {}
+
+
+class DailyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Writes to <prefix>_<YYYY-MM-DD>.log, switching file when the day changes and
+    rolling over to .1, .2, ... when the file exceeds max_bytes."""
+
+    def __init__(self, log_dir: Path, prefix: str, max_bytes: int = LOG_MAX_BYTES,
+                 backup_count: int = LOG_BACKUP_COUNT, retention_days: int = LOG_RETENTION_DAYS):
+        self.log_dir = Path(log_dir)
+        self.prefix = prefix
+        self.retention_days = retention_days
+        self._day = self._today()
+        super().__init__(
+            self._path_for(self._day), maxBytes=max_bytes, backupCount=backup_count,
+            encoding='utf-8', delay=True
+        )
+        self._remove_old_files()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def _path_for(self, day: str) -> str:
+        return str(self.log_dir / f"{self.prefix}_{day}.log")
+
+    def shouldRollover(self, record) -> bool:
+        if self._today() != self._day:
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self):
+        today = self._today()
+        if today == self._day:
+            super().doRollover()
+            return
+        # New day: start the next daily file instead of renaming the current one
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self._day = today
+        self.baseFilename = os.path.abspath(self._path_for(today))
+        self._remove_old_files()
+
+    def _remove_old_files(self):
+        """Delete daily files (and their size backups) older than retention_days"""
+        if self.retention_days <= 0:
+            return
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        prefix = f"{self.prefix}_"
+        try:
+            for path in self.log_dir.glob(f"{prefix}*.log*"):
+                day = path.name[len(prefix):len(prefix) + 10]
+                if len(day) == 10 and day < cutoff:
+                    path.unlink()
+        except OSError:
+            pass
+
+
+class RepeatedMessageFilter(logging.Filter):
+    """Drops identical WARNING+ records repeated within interval seconds; the next
+    record let through reports how many were suppressed."""
+
+    def __init__(self, interval: float = REPEAT_INTERVAL_SECONDS,
+                 min_level: int = logging.WARNING, max_keys: int = 1000):
+        super().__init__()
+        self.interval = interval
+        self.min_level = min_level
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        # key -> [time first let through, suppressed count]
+        self._seen: Dict[tuple, List] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.min_level:
+            return True
+        message = record.getMessage()
+        key = (record.name, record.levelno, record.pathname, record.lineno, message)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(key)
+            if entry is not None and now - entry[0] < self.interval:
+                entry[1] += 1
+                return False
+            suppressed = entry[1] if entry is not None else 0
+            self._seen[key] = [now, 0]
+            if len(self._seen) > self.max_keys:
+                self._prune(now)
+        if suppressed:
+            record.msg = f"{message} ({suppressed} identical messages suppressed)"
+            record.args = None
+        return True
+
+    def _prune(self, now: float):
+        expired = [k for k, (seen_at, _) in self._seen.items() if now - seen_at >= self.interval]
+        for k in expired:
+            del self._seen[k]
+        if len(self._seen) > self.max_keys:
+            self._seen.clear()
 
 
 def setup_logger(name: str = "military_training_plan", log_dir: Optional[str] = None) -> logging.Logger:
-    """Setup logger with file handler (one file per day)"""
+    """Setup logger writing through a background thread to a daily, size-capped log file"""
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
-    
+
     # Avoid adding handlers multiple times
     if logger.handlers:
         return logger
-    
+
     # Create log directory
     if log_dir is None:
         log_dir = Path(__file__).parent.parent.parent / "logs"
     else:
         log_dir = Path(log_dir)
-    
+
     log_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Create log file with today's date
-    today = datetime.now().strftime("%Y-%m-%d")
-    log_file = log_dir / f"{name}_{today}.log"
-    
-    # File handler
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+
+    # File handler (one file per day, rolled over by size)
+    file_handler = DailyRotatingFileHandler(log_dir, name)
     file_handler.setLevel(logging.DEBUG)
-    
+
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    
+
     # Formatter
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
+
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
-    
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
-    
+
+    # Callers only enqueue; the listener thread does formatting and I/O
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RepeatedMessageFilter())
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    _listeners[name] = (listener, file_handler)
+
+    logger.addHandler(queue_handler)
+
     return logger
 
+
+def get_log_file(name: str = "military_training_plan") -> Optional[Path]:
+    """Path of the daily log file currently written for a logger set up by setup_logger"""
+    entry = _listeners.get(name)
+    if entry is None:
+        return None
+    return Path(entry[1].baseFilename)
+
+
+def flush_logs():
+    """Block until every queued record has been written (listeners are restarted)"""
+    for listener, _ in _listeners.values():
+        listener.stop()
+        listener.start()
+
+
+@atexit.register
+def _stop_listeners():
+    for listener, _ in _listeners.values():
+        try:
+            listener.stop()
+        except Exception:
+            pass
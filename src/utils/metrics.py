@@ -0,0 +1,180 @@
+"""Lightweight in-process performance metrics (counters and latency histograms).
+
+Hot paths are wrapped with @timed("name") or ``with measure("name"):``; the
+collected numbers are shown in the Performance panel and can be exported as a
+JSON snapshot to report real latencies from field machines.
+"""
+
+import functools
+import json
+import platform
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_lock = threading.Lock()
+_enabled = True
+_counters: Dict[str, int] = {}
+_histograms: Dict[str, "_Histogram"] = {}
+
+
+class _Histogram:
+    """Fixed-bucket latency histogram with count/total/min/max."""
+
+    __slots__ = ("count", "total_ms", "min_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, ms: float) -> None:
+        self.count += 1
+        self.total_ms += ms
+        if ms < self.min_ms:
+            self.min_ms = ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples (max for the last one)."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return min(BUCKET_BOUNDS_MS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "min_ms": round(self.min_ms, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": round(self.percentile(0.5), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "buckets": {
+                (f"<={bound}" if i < len(BUCKET_BOUNDS_MS) else f">{BUCKET_BOUNDS_MS[-1]}"): n
+                for i, (bound, n) in enumerate(zip(BUCKET_BOUNDS_MS + (None,), self.buckets))
+                if n
+            },
+        }
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn collection on or off (timed functions still run, just without recording)."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """Add amount to a counter."""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def observe(name: str, ms: float) -> None:
+    """Record one latency sample (milliseconds) for name."""
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = _Histogram()
+        histogram.add(ms)
+
+
+class measure:
+    """Context manager recording the duration of its block: ``with measure("x"): ...``"""
+
+    __slots__ = ("name", "_start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.name, (time.perf_counter() - self._start) * 1000.0)
+        if exc_type is not None:
+            increment(f"{self.name}.errors")
+        return False
+
+
+def timed(name: str):
+    """Decorator recording each call's duration in the histogram called name."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(name, (time.perf_counter() - start) * 1000.0)
+        return wrapper
+    return decorator
+
+
+def reset() -> None:
+    """Drop all collected counters and histograms."""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def snapshot() -> Dict[str, Any]:
+    """Return the current counters and histogram summaries as a JSON-serializable dict."""
+    try:
+        from src import __version__ as app_version
+    except ImportError:
+        app_version = None
+    with _lock:
+        counters = dict(sorted(_counters.items()))
+        histograms = {name: h.to_dict() for name, h in sorted(_histograms.items())}
+    return {
+        "app_version": app_version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "counters": counters,
+        "histograms": histograms,
+    }
+
+
+def export_snapshot(file_path: str) -> Optional[str]:
+    """Write snapshot() to file_path as JSON. Returns an error message or None on success."""
+    try:
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot(), f, ensure_ascii=False, indent=2)
+        return None
+    except OSError as e:
+        return str(e)
@@ -0,0 +1,227 @@
+"""Startup phase timing and optional startup profiling.
+
+Import this module as early as possible (src/main.py does it before Qt) so the
+clock starts close to process start. Each mark() closes a phase; report() logs
+the phases and the total.
+
+Profiling mode (``--profile-startup`` or MTP_PROFILE_STARTUP=1) additionally
+records per-module import costs (self and cumulative, like ``-X importtime``)
+and the duration of selected calls, and writes everything to a JSON report.
+"""
+
+import functools
+import json
+import logging
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_ENV_VAR = "MTP_PROFILE_STARTUP"
+
+_START = time.perf_counter()
+_MARKS: List[Tuple[str, float]] = []
+
+# Profiling state: (module, self ms, cumulative ms) per executed module, in completion order
+_IMPORT_TIMES: List[Tuple[str, float, float]] = []
+_IMPORT_STACK: List[float] = []
+# label -> {"calls", "total_ms", "first_ms"}
+_SPANS: Dict[str, Dict[str, float]] = {}
+_import_finder = None
+
+
+def mark(phase: str) -> None:
+    """Record that a startup phase has just finished."""
+    _MARKS.append((phase, time.perf_counter()))
+
+
+def get_phases() -> List[Tuple[str, float]]:
+    """Return (phase, duration in ms) for every recorded phase, in order."""
+    phases = []
+    previous = _START
+    for phase, at in _MARKS:
+        phases.append((phase, (at - previous) * 1000.0))
+        previous = at
+    return phases
+
+
+def elapsed_ms() -> float:
+    """Milliseconds since the timer started."""
+    return (time.perf_counter() - _START) * 1000.0
+
+
+def report(logger) -> str:
+    """Log and return a one-line summary of the recorded phases."""
+    parts = [f"{phase}={ms:.0f}ms" for phase, ms in get_phases()]
+    total = (_MARKS[-1][1] - _START) * 1000.0 if _MARKS else 0.0
+    text = f"Startup timing: {', '.join(parts)} (total {total:.0f}ms)"
+    logger.info(text)
+    return text
+
+
+def profiling_requested(argv: Sequence[str]) -> bool:
+    """True if startup profiling was asked for on the command line or in the environment."""
+    if PROFILE_FLAG in argv:
+        return True
+    return os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class _ImportTimer:
+    """sys.meta_path hook that times module execution.
+
+    Finding is delegated to the remaining finders; only exec_module of
+    per-module loader instances is wrapped (builtin/frozen modules are cheap
+    and their loaders are shared classes, so they are left alone).
+    """
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+            try:
+                loader.exec_module = _timed_exec_module(fullname, loader.exec_module)
+            except (AttributeError, TypeError):
+                pass
+        return spec
+
+
+def _timed_exec_module(fullname: str, exec_module):
+    def wrapper(module):
+        start = time.perf_counter()
+        _IMPORT_STACK.append(0.0)
+        try:
+            exec_module(module)
+        finally:
+            children = _IMPORT_STACK.pop()
+            total = time.perf_counter() - start
+            if _IMPORT_STACK:
+                _IMPORT_STACK[-1] += total
+            _IMPORT_TIMES.append((fullname, (total - children) * 1000.0, total * 1000.0))
+    return wrapper
+
+
+def enable_import_profiling() -> None:
+    """Start timing every module imported from now on."""
+    global _import_finder
+    if _import_finder is None:
+        _import_finder = _ImportTimer()
+        sys.meta_path.insert(0, _import_finder)
+
+
+def disable_import_profiling() -> None:
+    """Stop timing imports (already recorded times are kept)."""
+    global _import_finder
+    if _import_finder is not None:
+        if _import_finder in sys.meta_path:
+            sys.meta_path.remove(_import_finder)
+        _import_finder = None
+
+
+def record_span(label: str, ms: float) -> None:
+    """Add one timed call to the span statistics for label."""
+    span = _SPANS.get(label)
+    if span is None:
+        _SPANS[label] = {"calls": 1, "total_ms": ms, "first_ms": ms}
+    else:
+        span["calls"] += 1
+        span["total_ms"] += ms
+
+
+def profile_method(owner: Any, name: str, label: Optional[str] = None) -> None:
+    """Wrap owner.name so each call is recorded as a span (used only in profiling mode)."""
+    original = getattr(owner, name)
+    label = label or f"{getattr(owner, '__name__', owner)}.{name}"
+
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            record_span(label, (time.perf_counter() - start) * 1000.0)
+
+    setattr(owner, name, wrapper)
+
+
+def get_import_times() -> List[Dict[str, Any]]:
+    """Recorded module import costs, most expensive (cumulative) first."""
+    rows = [
+        {"module": module, "self_ms": round(self_ms, 3), "cumulative_ms": round(cumulative_ms, 3)}
+        for module, self_ms, cumulative_ms in _IMPORT_TIMES
+    ]
+    rows.sort(key=lambda row: (-row["cumulative_ms"], row["module"]))
+    return rows
+
+
+def build_profile() -> Dict[str, Any]:
+    """Collect phases, spans and import costs into a JSON-serializable dict."""
+    try:
+        from src import __version__ as app_version
+    except ImportError:
+        app_version = None
+    total = (_MARKS[-1][1] - _START) * 1000.0 if _MARKS else 0.0
+    return {
+        "app_version": app_version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "total_ms": round(total, 3),
+        "phases": [{"phase": phase, "ms": round(ms, 3)} for phase, ms in get_phases()],
+        "spans": {
+            label: {
+                "calls": int(span["calls"]),
+                "total_ms": round(span["total_ms"], 3),
+                "first_ms": round(span["first_ms"], 3),
+            }
+            for label, span in sorted(_SPANS.items())
+        },
+        "imports": get_import_times(),
+    }
+
+
+def _log_dir_of(logger: logging.Logger) -> Path:
+    """Directory of the logger's daily log file, or ./logs if it has none."""
+    from src.utils.logger import get_log_file
+    log_file = get_log_file(logger.name)
+    return log_file.parent if log_file is not None else Path("logs")
+
+
+def write_profile_report(logger: logging.Logger, top: int = 20) -> Optional[Path]:
+    """Log the startup profile and write it as JSON next to the daily log file."""
+    profile = build_profile()
+    report(logger)
+    for label, span in profile["spans"].items():
+        logger.info(
+            f"Startup span {label}: calls={span['calls']}, first={span['first_ms']:.1f}ms, "
+            f"total={span['total_ms']:.1f}ms"
+        )
+    for row in profile["imports"][:top]:
+        logger.info(
+            f"Startup import {row['module']}: self={row['self_ms']:.1f}ms, "
+            f"cumulative={row['cumulative_ms']:.1f}ms"
+        )
+
+    report_path = _log_dir_of(logger) / f"startup_profile_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}.json"
+    try:
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write startup profile: {e}")
+        return None
+    logger.info(f"Startup profile written to {report_path}")
+    return report_path
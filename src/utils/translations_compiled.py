@@ -0,0 +1,414 @@
+"""Compiled translation tables. Generated by `python -m src.utils.i18n`, do not edit."""
+
+TRANSLATIONS = {
+    'vi': {
+        'app_name': 'Ứng dụng Quản lý Kế hoạch Huấn luyện',
+        'login': 'Đăng nhập',
+        'logout': 'Đăng xuất',
+        'username': 'Tên đăng nhập',
+        'password': 'Mật khẩu',
+        'cancel': 'Hủy',
+        'save': 'Lưu',
+        'delete': 'Xóa',
+        'edit': 'Sửa',
+        'add': 'Thêm',
+        'search': 'Tìm kiếm',
+        'subject': 'Môn học',
+        'subjects': 'Môn học',
+        'schedule': 'Thời khóa biểu',
+        'schedules': 'Thời khóa biểu',
+        'lesson': 'Bài học',
+        'lessons': 'Bài học',
+        'progress': 'Tiến độ',
+        'monday': 'Thứ Hai',
+        'tuesday': 'Thứ Ba',
+        'wednesday': 'Thứ Tư',
+        'thursday': 'Thứ Năm',
+        'friday': 'Thứ Sáu',
+        'saturday': 'Thứ Bảy',
+        'sunday': 'Chủ Nhật',
+        'week': 'Tuần',
+        'day': 'Ngày',
+        'time': 'Thời gian',
+        'location': 'Địa điểm',
+        'category': 'Phân loại',
+        'duration': 'Thời lượng',
+        'materials': 'Tài liệu',
+        'export': 'Xuất',
+        'import': 'Import',
+        'completed': 'Đã hoàn thành',
+        'pending': 'Chưa hoàn thành',
+        'file_menu': 'Tệp',
+        'view_menu': 'Xem',
+        'help_menu': 'Trợ giúp',
+        'exit': 'Thoát',
+        'about': 'Giới thiệu',
+        'create_schedule': 'Tạo kế hoạch huấn luyện',
+        'view_schedule': 'Xem thời khóa biểu',
+        'ready': 'Sẵn sàng',
+        'refreshed': 'Đã làm mới',
+        'schedule_created_successfully': 'Đã kế hoạch huấn luyện thành công',
+        'confirm_logout': 'Bạn có chắc chắn muốn đăng xuất?',
+        'confirm_exit': 'Bạn có chắc chắn muốn thoát?',
+        'about_text': 'Ứng dụng hỗ trợ giảng viên quân đội quản lý các môn học và thời khóa biểu.',
+        'about_version': 'Phiên bản: 1.0.0',
+        'about_author': 'Tác giả: Victor Howard',
+        'login_title': 'Đăng nhập',
+        'username_label': 'Tên đăng nhập:',
+        'password_label': 'Mật khẩu:',
+        'error': 'Lỗi',
+        'please_enter_username': 'Vui lòng nhập tên đăng nhập',
+        'please_enter_password': 'Vui lòng nhập mật khẩu',
+        'login_error': 'Lỗi đăng nhập',
+        'invalid_credentials': 'Tên đăng nhập hoặc mật khẩu không đúng',
+        'search_label': 'Tìm kiếm:',
+        'search_placeholder': 'Nhập tên hoặc mã môn học...',
+        'sort_by': 'Sắp xếp theo:',
+        'sort_name': 'Tên',
+        'sort_code': 'Mã',
+        'sort_created_time': 'Thời gian thêm',
+        'sort_category': 'Phân loại',
+        'results': 'kết quả',
+        'add_subject': 'Thêm môn học',
+        'import_excel': 'Import Excel',
+        'download_template': 'Tải template Excel',
+        'subject_name': 'Tên môn học',
+        'subject_code': 'Mã môn học',
+        'number_of_lessons': 'Số bài học',
+        'default_duration': 'Thời lượng mặc định',
+        'hours': 'giờ',
+        'select_subject_to_edit': 'Vui lòng chọn môn học cần sửa',
+        'select_subject_to_delete': 'Vui lòng chọn môn học cần xóa',
+        'error_loading_subject': 'Không thể tải thông tin môn học',
+        'confirm_delete_subject': "Bạn có chắc chắn muốn xóa môn học '{name}'?",
+        'subject_deleted_successfully': 'Đã xóa môn học thành công',
+        'subject_imported_successfully': "Đã import môn học '{name}' thành công",
+        'template_created_successfully': 'Đã tạo template tại: {path}',
+        'subject_saved_successfully': 'Đã lưu môn học thành công',
+        'cannot_delete_subject': 'Không thể xóa môn học',
+        'cannot_import_subject': 'Không thể import môn học',
+        'cannot_save_subject': 'Không thể lưu môn học',
+        'choose_excel_file': 'Chọn file Excel',
+        'save_template_excel': 'Lưu template Excel',
+        'excel_files': 'Excel Files (*.xlsx *.xls)',
+        'add_subject_title': 'Thêm môn học',
+        'edit_subject_title': 'Sửa môn học',
+        'warning': 'Cảnh báo',
+        'success': 'Thành công',
+        'confirm': 'Xác nhận',
+        'refresh': 'Làm mới',
+        'user': 'Người dùng',
+        'view': 'Xem',
+        'language': 'Ngôn ngữ',
+        'language_vietnamese': 'Tiếng Việt',
+        'language_english': 'English',
+        'select_language': 'Chọn ngôn ngữ',
+        'choose_time': 'Chọn thời gian',
+        'start_date_monday': 'Ngày bắt đầu (Thứ Hai):',
+        'end_date_sunday': 'Ngày kết thúc (Chủ Nhật):',
+        'create_schedule_button': 'Tạo kế hoạch huấn luyện',
+        'prev_week': '← Tuần trước',
+        'next_week': 'Tuần tiếp →',
+        'add_lesson': 'Thêm bài học',
+        'validate': 'Kiểm tra',
+        'select_schedule': 'Chọn thời khóa biểu:',
+        'select_week': 'Chọn tuần:',
+        'refresh_button': 'Làm mới',
+        'export_pdf': 'Xuất PDF',
+        'export_excel': 'Xuất Excel',
+        'export_image': 'Xuất Ảnh',
+        'calendar': 'Lịch',
+        'today': 'Hôm nay',
+        'no_schedule': 'Chưa có lịch',
+        'mark_complete': 'Đánh dấu đã hoàn thành',
+        'show': 'Hiển thị:',
+        'status': 'Trạng thái',
+        'select_materials': 'Chọn tài liệu',
+        'all_files': 'All Files (*.*)',
+        'image_files': 'Image Files (*.png *.jpg)',
+        'confirm_delete_lesson': 'Bạn có chắc chắn muốn xóa bài học này?',
+        'please_select_schedule': 'Vui lòng chọn thời khóa biểu',
+        'please_select_week': 'Vui lòng chọn tuần',
+        'please_select_day_in_week': 'Vui lòng chọn ngày trong tuần hiện tại',
+        'cannot_add_lesson': 'Không thể thêm bài học',
+        'please_select_subject': 'Vui lòng chọn môn học',
+        'please_select_lesson': 'Vui lòng chọn bài học',
+        'please_select_start_time': 'Vui lòng chọn giờ bắt đầu',
+        'add_lesson_title': 'Thêm bài học',
+        'edit_lesson_title': 'Sửa bài học',
+        'please_select_lesson_to_edit': 'Vui lòng chọn bài học cần sửa',
+        'please_select_lesson_to_delete': 'Vui lòng chọn bài học cần xóa',
+        'pdf_files': 'PDF Files (*.pdf)',
+        'start_date_must_be_monday': 'Ngày bắt đầu phải là Thứ Hai',
+        'end_date_must_be_sunday': 'Ngày kết thúc phải là Chủ Nhật',
+        'start_date_before_end_date': 'Ngày bắt đầu phải trước ngày kết thúc',
+        'cannot_create_schedule': 'Không thể tạo kế hoạch huấn luyện: {error}',
+        'cannot_save_schedule': 'Không thể lưu thời khóa biểu',
+        'schedule_created': 'Đã tạo kế hoạch huấn luyện',
+        'week_schedule_valid': 'Thời khóa biểu tuần này hợp lệ!',
+        'validate_build_failed': 'Không thể tạo nội dung tuần (xem chi tiết bên dưới). Đã ghi log trong thư mục logs/.',
+        'validate_warning_title': 'Cảnh báo kiểm tra TKB',
+        'schedule_saved': 'Đã lưu thời khóa biểu',
+        'settings': 'Cài đặt',
+        'settings_season_dates': 'Ngày bắt đầu và kết thúc mùa hè',
+        'settings_summer_range_help': 'Mùa hè mặc định: 1/1 - 30/6. Thời gian còn lại trong năm là mùa đông.',
+        'settings_summer_start': 'Ngày bắt đầu mùa hè:',
+        'settings_summer_end': 'Ngày kết thúc mùa hè:',
+        'settings_schedule_times_by_season': 'Giờ học theo mùa (mặc định)',
+        'settings_summer_times': 'Mùa hè: Sáng {morning}, Nghỉ trưa {break_}, Chiều {afternoon}.',
+        'settings_winter_times': 'Mùa đông: Sáng {morning}, Nghỉ trưa {break_}, Chiều {afternoon}.',
+        'settings_summer_start_before_end': 'Ngày bắt đầu mùa hè phải trước hoặc bằng ngày kết thúc.',
+        'settings_saved': 'Đã lưu cài đặt.',
+        'settings_summer_times_group': 'Giờ học mùa hè',
+        'settings_winter_times_group': 'Giờ học mùa đông',
+        'settings_morning_start': 'Sáng bắt đầu',
+        'settings_morning_end': 'Sáng kết thúc',
+        'settings_break_start': 'Nghỉ trưa bắt đầu',
+        'settings_break_end': 'Nghỉ trưa kết thúc',
+        'settings_afternoon_start': 'Chiều bắt đầu',
+        'settings_afternoon_end': 'Chiều kết thúc',
+        'auto_fill_times_lessons': 'Tự động điền giờ và bài',
+        'auto_fill_done': 'Đã tự động điền giờ và bài cho tuần này.',
+        'auto_fill_failed': 'Không thể tự động điền giờ và bài.',
+        'auto_fill_some_days_short': 'Một số ngày chưa đạt đủ tổng giờ theo quy định. Vui lòng điều chỉnh môn học hoặc bài học cho các ngày sau:',
+        'settings_storage_group': 'Định dạng file dữ liệu',
+        'settings_storage_profile': 'Định dạng lưu',
+        'settings_storage_help': 'Định dạng gọn và nén giúp file dữ liệu nhỏ hơn và tải nhanh hơn qua thư mục mạng.',
+        'storage_profile_pretty': 'JSON dễ đọc (thụt lề)',
+        'storage_profile_compact': 'JSON gọn',
+        'storage_profile_gzip': 'JSON nén (gzip)',
+        'storage_profile_zstd': 'JSON nén (zstd)',
+        'settings_storage_migration_started': 'Các file dữ liệu hiện có đang được chuyển sang định dạng mới ở chế độ nền.',
+        'performance': 'Hiệu năng',
+        'perf_help': 'Thời gian xử lý của việc tạo, kiểm tra lịch và đọc/ghi file dữ liệu kể từ khi mở ứng dụng.',
+        'perf_metric': 'Thao tác',
+        'perf_count': 'Số lần',
+        'perf_mean': 'Trung bình (ms)',
+        'perf_p50': 'p50 (ms)',
+        'perf_p95': 'p95 (ms)',
+        'perf_max': 'Lớn nhất (ms)',
+        'perf_total': 'Tổng (ms)',
+        'perf_counter': 'Bộ đếm',
+        'perf_value': 'Giá trị',
+        'perf_reset': 'Đặt lại',
+        'perf_export': 'Xuất JSON',
+        'perf_exported': 'Đã lưu số liệu hiệu năng',
+        'perf_export_failed': 'Không thể lưu số liệu hiệu năng',
+        'json_files': 'File JSON (*.json)',
+        'export_all_weeks_image': 'Xuất ảnh tất cả các tuần',
+        'image_export_mode': 'Kiểu xuất',
+        'image_export_pages': 'Mỗi tuần một ảnh',
+        'image_export_tall': 'Một ảnh dài',
+        'auto_fill_use_solver': 'Tối ưu',
+        'auto_fill_use_solver_tooltip': 'Tìm cho cả tuần các bài (theo thứ tự) lấp đầy đúng tổng giờ mỗi ngày',
+        'undo': 'Hoàn tác',
+        'redo': 'Làm lại',
+        'recover_schedule_title': 'Khôi phục thời khóa biểu',
+        'recover_schedule_question': 'Thời khóa biểu "{name}" có thay đổi chưa được lưu (ứng dụng đã đóng bất thường). Khôi phục lại?',
+    },
+    'en': {
+        'app_name': 'Military Training Plan Application',
+        'login': 'Login',
+        'logout': 'Logout',
+        'username': 'Username',
+        'password': 'Password',
+        'cancel': 'Cancel',
+        'save': 'Save',
+        'delete': 'Delete',
+        'edit': 'Edit',
+        'add': 'Add',
+        'search': 'Search',
+        'subject': 'Subject',
+        'subjects': 'Subjects',
+        'schedule': 'Schedule',
+        'schedules': 'Schedules',
+        'lesson': 'Lesson',
+        'lessons': 'Lessons',
+        'progress': 'Progress',
+        'monday': 'Monday',
+        'tuesday': 'Tuesday',
+        'wednesday': 'Wednesday',
+        'thursday': 'Thursday',
+        'friday': 'Friday',
+        'saturday': 'Saturday',
+        'sunday': 'Sunday',
+        'week': 'Week',
+        'day': 'Day',
+        'time': 'Time',
+        'location': 'Location',
+        'category': 'Category',
+        'duration': 'Duration',
+        'materials': 'Materials',
+        'export': 'Export',
+        'import': 'Import',
+        'completed': 'Completed',
+        'pending': 'Pending',
+        'file_menu': 'File',
+        'view_menu': 'View',
+        'help_menu': 'Help',
+        'exit': 'Exit',
+        'about': 'About',
+        'create_schedule': 'Create Schedule',
+        'view_schedule': 'View Schedule',
+        'ready': 'Ready',
+        'refreshed': 'Refreshed',
+        'schedule_created_successfully': 'Schedule created successfully',
+        'confirm_logout': 'Are you sure you want to logout?',
+        'confirm_exit': 'Are you sure you want to exit?',
+        'about_text': 'Application to help military instructors manage subjects and schedules.',
+        'about_version': 'Version: 1.0.0',
+        'about_author': 'Author: Victor Howard',
+        'login_title': 'Login',
+        'username_label': 'Username:',
+        'password_label': 'Password:',
+        'error': 'Error',
+        'please_enter_username': 'Please enter username',
+        'please_enter_password': 'Please enter password',
+        'login_error': 'Login Error',
+        'invalid_credentials': 'Username or password is incorrect',
+        'search_label': 'Search:',
+        'search_placeholder': 'Enter subject name or code...',
+        'sort_by': 'Sort by:',
+        'sort_name': 'Name',
+        'sort_code': 'Code',
+        'sort_created_time': 'Created Time',
+        'sort_category': 'Category',
+        'results': 'results',
+        'add_subject': 'Add Subject',
+        'import_excel': 'Import Excel',
+        'download_template': 'Download Excel Template',
+        'subject_name': 'Subject Name',
+        'subject_code': 'Subject Code',
+        'number_of_lessons': 'Number of Lessons',
+        'default_duration': 'Default Duration',
+        'hours': 'hours',
+        'select_subject_to_edit': 'Please select a subject to edit',
+        'select_subject_to_delete': 'Please select a subject to delete',
+        'error_loading_subject': 'Cannot load subject information',
+        'confirm_delete_subject': "Are you sure you want to delete subject '{name}'?",
+        'subject_deleted_successfully': 'Subject deleted successfully',
+        'subject_imported_successfully': "Subject '{name}' imported successfully",
+        'template_created_successfully': 'Template created at: {path}',
+        'subject_saved_successfully': 'Subject saved successfully',
+        'cannot_delete_subject': 'Cannot delete subject',
+        'cannot_import_subject': 'Cannot import subject',
+        'cannot_save_subject': 'Cannot save subject',
+        'choose_excel_file': 'Choose Excel File',
+        'save_template_excel': 'Save Excel Template',
+        'excel_files': 'Excel Files (*.xlsx *.xls)',
+        'add_subject_title': 'Add Subject',
+        'edit_subject_title': 'Edit Subject',
+        'warning': 'Warning',
+        'success': 'Success',
+        'confirm': 'Confirm',
+        'refresh': 'Refresh',
+        'user': 'User',
+        'view': 'View',
+        'language': 'Language',
+        'language_vietnamese': 'Vietnamese',
+        'language_english': 'English',
+        'select_language': 'Select Language',
+        'choose_time': 'Choose Time',
+        'start_date_monday': 'Start Date (Monday):',
+        'end_date_sunday': 'End Date (Sunday):',
+        'create_schedule_button': 'Create Schedule',
+        'prev_week': '← Previous Week',
+        'next_week': 'Next Week →',
+        'add_lesson': 'Add Lesson',
+        'validate': 'Validate',
+        'select_schedule': 'Select Schedule:',
+        'select_week': 'Select Week:',
+        'refresh_button': 'Refresh',
+        'export_pdf': 'Export PDF',
+        'export_excel': 'Export Excel',
+        'export_image': 'Export Image',
+        'calendar': 'Calendar',
+        'today': 'Today',
+        'no_schedule': 'No schedule',
+        'mark_complete': 'Mark as Completed',
+        'show': 'Show:',
+        'status': 'Status',
+        'select_materials': 'Select Materials',
+        'all_files': 'All Files (*.*)',
+        'image_files': 'Image Files (*.png *.jpg)',
+        'confirm_delete_lesson': 'Are you sure you want to delete this lesson?',
+        'please_select_schedule': 'Please select a schedule',
+        'please_select_week': 'Please select a week',
+        'please_select_day_in_week': 'Please select a day in the current week',
+        'cannot_add_lesson': 'Cannot add lesson',
+        'please_select_subject': 'Please select a subject',
+        'please_select_lesson': 'Please select a lesson',
+        'please_select_start_time': 'Please select a start time',
+        'add_lesson_title': 'Add Lesson',
+        'edit_lesson_title': 'Edit Lesson',
+        'please_select_lesson_to_edit': 'Please select a lesson to edit',
+        'please_select_lesson_to_delete': 'Please select a lesson to delete',
+        'pdf_files': 'PDF Files (*.pdf)',
+        'start_date_must_be_monday': 'Start date must be Monday',
+        'end_date_must_be_sunday': 'End date must be Sunday',
+        'start_date_before_end_date': 'Start date must be before end date',
+        'cannot_create_schedule': 'Cannot create schedule: {error}',
+        'cannot_save_schedule': 'Cannot save schedule',
+        'schedule_created': 'Schedule created',
+        'schedule_saved': 'Schedule saved',
+        'week_schedule_valid': 'Week schedule is valid!',
+        'validate_build_failed': 'Could not build week schedule (see details below). Details have been written to the logs/ folder.',
+        'validate_warning_title': 'Schedule validation warning',
+        'settings': 'Settings',
+        'settings_season_dates': 'Summer season start and end dates',
+        'settings_summer_range_help': 'Default summer: Jan 1 - Jun 30. Rest of year is winter.',
+        'settings_summer_start': 'Summer start:',
+        'settings_summer_end': 'Summer end:',
+        'settings_schedule_times_by_season': 'Schedule times by season (default)',
+        'settings_summer_times': 'Summer: Morning {morning}, Break {break_}, Afternoon {afternoon}.',
+        'settings_winter_times': 'Winter: Morning {morning}, Break {break_}, Afternoon {afternoon}.',
+        'settings_summer_start_before_end': 'Summer start date must be before or equal to end date.',
+        'settings_saved': 'Settings saved.',
+        'settings_summer_times_group': 'Summer schedule times',
+        'settings_winter_times_group': 'Winter schedule times',
+        'settings_morning_start': 'Morning start',
+        'settings_morning_end': 'Morning end',
+        'settings_break_start': 'Break start',
+        'settings_break_end': 'Break end',
+        'settings_afternoon_start': 'Afternoon start',
+        'settings_afternoon_end': 'Afternoon end',
+        'auto_fill_times_lessons': 'Auto-fill times and lessons',
+        'auto_fill_done': 'Times and lessons have been auto-filled for this week.',
+        'auto_fill_failed': 'Could not auto-fill times and lessons.',
+        'auto_fill_some_days_short': 'Some days do not meet the required total hours. Please adjust subjects or lessons for the following days:',
+        'settings_storage_group': 'Data file format',
+        'settings_storage_profile': 'Storage format',
+        'settings_storage_help': 'Compact and compressed formats make data files smaller and faster to load over network shares.',
+        'storage_profile_pretty': 'Readable JSON (indented)',
+        'storage_profile_compact': 'Compact JSON',
+        'storage_profile_gzip': 'Compressed JSON (gzip)',
+        'storage_profile_zstd': 'Compressed JSON (zstd)',
+        'settings_storage_migration_started': 'Existing data files are being converted to the new format in the background.',
+        'performance': 'Performance',
+        'perf_help': 'Timings of schedule building, validation and data file access since the application started.',
+        'perf_metric': 'Operation',
+        'perf_count': 'Calls',
+        'perf_mean': 'Mean (ms)',
+        'perf_p50': 'p50 (ms)',
+        'perf_p95': 'p95 (ms)',
+        'perf_max': 'Max (ms)',
+        'perf_total': 'Total (ms)',
+        'perf_counter': 'Counter',
+        'perf_value': 'Value',
+        'perf_reset': 'Reset',
+        'perf_export': 'Export JSON',
+        'perf_exported': 'Performance snapshot saved',
+        'perf_export_failed': 'Could not save performance snapshot',
+        'json_files': 'JSON Files (*.json)',
+        'export_all_weeks_image': 'Export All Weeks (PNG)',
+        'image_export_mode': 'Output',
+        'image_export_pages': 'One image per week',
+        'image_export_tall': 'One tall image',
+        'auto_fill_use_solver': 'Optimize',
+        'auto_fill_use_solver_tooltip': 'Search the whole week for lessons (in order) that fill every day exactly',
+        'undo': 'Undo',
+        'redo': 'Redo',
+        'recover_schedule_title': 'Recover schedule',
+        'recover_schedule_question': 'Schedule "{name}" has changes that were not saved (the application closed unexpectedly). Recover them?',
+    },
+}
@@ -4,7 +4,7 @@ import pytest
 from datetime import datetime, date, time
 from src.models.subject import Subject
 from src.models.lesson import Lesson
-from src.models.schedule import Schedule, DaySchedule, ScheduleItem
+from src.models.schedule import Schedule, WeekSchedule, DaySchedule, ScheduleItem
 from src.models.user import User
 
 
@@ -70,3 +70,48 @@ def test_day_schedule():
     assert len(day.items) == 0
     assert not day.is_completed
 
+
+
+def test_schedule_get_day():
+    """Test date lookup in schedule"""
+    week = WeekSchedule(week_number=1, start_date=date(2026, 1, 5), end_date=date(2026, 1, 11))
+    for offset in range(6):
+        week.days.append(DaySchedule(date=date(2026, 1, 5 + offset)))
+    schedule = Schedule(start_date=date(2026, 1, 5), end_date=date(2026, 1, 11), weeks=[week])
+    assert schedule.get_day(date(2026, 1, 7)) is week.days[2]
+    assert schedule.get_day(date(2026, 1, 11)) is None
+    assert schedule.get_day(date(2026, 1, 4)) is None
+
+
+def test_schedule_item_round_trip_shares_values():
+    """Test schedule items keep their dict format and share repeated values"""
+    data = {
+        "subject_id": "sub1", "lesson_id": "les1",
+        "subject_name": "Môn học", "lesson_name": "Bài học",
+        "start_time": "07:00", "end_time": "08:30", "location": "Thao trường",
+    }
+    item1 = ScheduleItem.from_dict(dict(data))
+    item2 = ScheduleItem.from_dict(dict(data))
+    assert item1.to_dict() == data
+    assert item1.subject_name is item2.subject_name
+    assert item1.start_time is item2.start_time
+    assert item1.end_time == time(8, 30)
+
+
+def test_schedule_from_dict_legacy_and_current_format():
+    """Test legacy single-string slot maps are still normalized on load"""
+    day_data = {
+        "date": "2026-01-05",
+        "items": [],
+        "subject_time_slots": {"sub1": "07:00"},
+        "subject_lesson_map": {"sub1": "les1"},
+    }
+    week_data = {"week_number": 1, "start_date": "2026-01-05", "end_date": "2026-01-11", "days": [day_data]}
+    legacy = Schedule.from_dict({"start_date": "2026-01-05", "end_date": "2026-01-11", "weeks": [week_data]})
+    assert legacy.weeks[0].days[0].get_time_slots("sub1") == ["07:00"]
+    assert legacy.weeks[0].days[0].get_lesson_ids("sub1") == ["les1"]
+    
+    data = legacy.to_dict()
+    assert data["format_version"] >= 2
+    reloaded = Schedule.from_dict(data)
+    assert reloaded.weeks[0].days[0].subject_lesson_map == {"sub1": ["les1"]}
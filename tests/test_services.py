@@ -1,15 +1,23 @@
 """Tests for services"""
 
+import os
+import stat
 import pytest
 import tempfile
 import shutil
 from pathlib import Path
-from src.services.file_service import FileService
+from datetime import date, time
+from src.services.file_service import (
+    FileService, detect_storage_profile,
+    STORAGE_PROFILE_PRETTY, STORAGE_PROFILE_COMPACT, STORAGE_PROFILE_GZIP,
+)
 from src.services.subject_service import SubjectService
 from src.services.auth_service import AuthService
+from src.services.schedule_service import ScheduleService
 from src.models.subject import Subject
 from src.models.lesson import Lesson
 from src.models.user import User
+from src.utils import metrics
 
 
 @pytest.fixture
@@ -82,3 +90,690 @@ def test_auth_service(temp_data_dir):
     assert not auth_service.login("testuser", "wrong")
     assert not auth_service.is_authenticated()
 
+
+
+def test_schedule_service_mark_completed(temp_data_dir):
+    """Test bulk completion marking with a single save"""
+    file_service = FileService(base_data_dir=temp_data_dir)
+    schedule_service = ScheduleService(file_service)
+    schedule = schedule_service.create_schedule(date(2026, 1, 5), date(2026, 1, 18))
+    
+    success, error, counts = schedule_service.mark_completed(
+        schedule, date_range=(date(2026, 1, 5), date(2026, 1, 11))
+    )
+    assert success
+    assert counts["changed"] == 6
+    assert all(day.is_completed for day in schedule.weeks[0].days)
+    assert not any(day.is_completed for day in schedule.weeks[1].days)
+    
+    # Already completed days and unscheduled dates are counted, not re-saved
+    success, error, counts = schedule_service.mark_completed(
+        schedule, dates=[date(2026, 1, 5), date(2026, 1, 11)]
+    )
+    assert success
+    assert counts == {"matched": 1, "changed": 0, "already": 1, "missing": 1}
+    
+    loaded = file_service.load_schedule(schedule.schedule_id)
+    assert loaded.get_day(date(2026, 1, 10)).is_completed
+    assert not loaded.get_day(date(2026, 1, 12)).is_completed
+
+
+def test_file_service_storage_profiles(temp_data_dir):
+    """Test compact/compressed profiles are read back and existing files migrated"""
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject = Subject(name="Test Subject", code="TS001")
+    assert file_service.save_subject(subject)
+    subject_file = Path(temp_data_dir) / "subjects" / f"{subject.subject_id}.json"
+    assert detect_storage_profile(subject_file.read_bytes()) == STORAGE_PROFILE_PRETTY
+    
+    counts = file_service.migrate_storage_profile(STORAGE_PROFILE_GZIP)
+    assert counts["rewritten"] == 2  # subject file + summary
+    assert counts["failed"] == 0
+    assert detect_storage_profile(subject_file.read_bytes()) == STORAGE_PROFILE_GZIP
+    assert file_service.load_subject(subject.subject_id).name == "Test Subject"
+    assert len(file_service.load_all_subjects()) == 1
+    
+    # Reader auto-detects, so a service configured for another profile still loads the files
+    compact_service = FileService(base_data_dir=temp_data_dir, storage_profile=STORAGE_PROFILE_COMPACT)
+    assert compact_service.load_subject(subject.subject_id).code == "TS001"
+    assert compact_service.migrate_storage_profile()["rewritten"] == 2
+    assert compact_service.migrate_storage_profile()["skipped"] == 2
+
+
+def test_file_service_materials_deduplicated(temp_data_dir):
+    """Test identical material files are stored once and collected after delete"""
+    file_service = FileService(base_data_dir=temp_data_dir)
+    source = Path(temp_data_dir) / "slides.pdf"
+    source.write_bytes(b"%PDF-1.4 same content")
+    
+    path1 = file_service.save_material("subject_a", "lesson_1", str(source))
+    path2 = file_service.save_material("subject_b", "lesson_2", str(source))
+    assert path1 and path2
+    assert Path(path1).read_bytes() == source.read_bytes()
+    assert len([p for p in file_service.blobs_dir.rglob("*") if p.is_file()]) == 1
+    assert file_service.get_materials("subject_a", "lesson_1") == [path1]
+    assert not os.stat(path1).st_mode & stat.S_IWUSR
+
+    # A blob changed in place through a link is stored again with the content of its hash
+    blob = next(p for p in file_service.blobs_dir.rglob("*") if p.is_file())
+    os.chmod(path1, stat.S_IRUSR | stat.S_IWUSR)
+    Path(path1).write_bytes(b"edited")
+    path3 = file_service.save_material("subject_c", "lesson_3", str(source))
+    assert Path(path3).read_bytes() == blob.read_bytes() == source.read_bytes()
+    assert not os.stat(blob).st_mode & stat.S_IWUSR
+    file_service.delete_subject("subject_c")
+
+    # Blob is still used by subject_b
+    file_service.delete_subject("subject_a")
+    assert file_service.collect_material_garbage() == {"removed": 0, "kept": 1, "freed_bytes": 0}
+    assert Path(path2).exists()
+    
+    assert file_service.remove_material("subject_b", "lesson_2", "slides.pdf")
+    assert file_service.get_materials("subject_b", "lesson_2") == []
+    assert file_service.collect_material_garbage()["removed"] == 1
+
+
+def test_service_metrics_snapshot(temp_data_dir):
+    """Test instrumented service calls show up in the metrics snapshot"""
+    metrics.reset()
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    subject = Subject(name="Test Subject")
+    file_service.save_subject(subject)
+    subject_service.get_subject(subject.subject_id)
+    
+    snapshot = metrics.snapshot()
+    assert snapshot["histograms"]["subject_service.get_subject"]["count"] == 1
+    assert snapshot["histograms"]["file_service.write"]["count"] >= 1
+    assert snapshot["counters"]["file_service.bytes_read"] > 0
+    
+    export_path = Path(temp_data_dir) / "perf.json"
+    assert metrics.export_snapshot(str(export_path)) is None
+    assert export_path.exists()
+
+
+def test_compiled_translations_match_json():
+    """Test the compiled translation module is regenerated after editing the JSON catalogs"""
+    import json
+    from src.utils import i18n
+    from src.utils.translations_compiled import TRANSLATIONS
+    
+    for language in i18n.SUPPORTED_LANGUAGES:
+        with open(i18n._TRANSLATIONS_DIR / f"{language}.json", encoding="utf-8") as f:
+            assert TRANSLATIONS[language] == json.load(f), "run: python -m src.utils.i18n"
+
+
+def test_language_change_reapplies_bound_texts():
+    """Test bind_text/on_language_changed registrations follow set_language"""
+    from src.utils import i18n
+    
+    class Label:
+        text = None
+        
+        def setText(self, text):
+            self.text = text
+    
+    label = Label()
+    calls = []
+    try:
+        i18n.set_language("vi")
+        i18n.bind_text(label, "setText", "logout")
+        i18n.on_language_changed(lambda: calls.append(i18n.get_language()))
+        i18n.set_language("en")
+        assert label.text == "Logout"
+        assert calls == ["en"]
+    finally:
+        i18n.set_language(i18n.DEFAULT_LANGUAGE)
+        i18n._callbacks.clear()
+
+
+def test_layout_week_time_aligned_with_spans():
+    """Test the week layout aligns items by time, spans rows and is memoized by content"""
+    from datetime import time
+    from src.models.schedule import WeekSchedule, DaySchedule, ScheduleItem
+    from src.services.schedule_layout import layout_week
+    
+    def make_week():
+        monday = DaySchedule(date=date(2024, 1, 1), items=[
+            ScheduleItem("s1", "l1", "Math", "Lesson 1", time(7, 0), time(9, 0)),
+        ])
+        tuesday = DaySchedule(date=date(2024, 1, 2), items=[
+            ScheduleItem("s2", "l2", "Drill", "Drill", time(7, 0), time(8, 0)),
+            ScheduleItem("s2", "l3", "Drill", "March", time(8, 0), time(9, 0)),
+        ])
+        return WeekSchedule(week_number=1, start_date=date(2024, 1, 1),
+                            end_date=date(2024, 1, 7), days=[monday, tuesday])
+    
+    layout = layout_week(make_week())
+    assert layout.row_count == 2
+    assert layout.row_label(0) == "07:00 - 08:00"
+    cells = layout.cell_map()
+    assert cells[(0, 0)].row_span == 2 and cells[(0, 0)].text == "Math: Lesson 1"
+    assert cells[(0, 1)].text == "Drill" and cells[(1, 1)].text == "Drill: March"
+    # Same content -> same memoized layout object
+    assert layout_week(make_week()) is layout
+
+
+def test_pdf_export_reuses_cached_weeks(temp_data_dir):
+    """Test re-exporting a PDF only renders the weeks that changed"""
+    from datetime import time
+    from src.models.schedule import ScheduleItem
+    from src.services import pdf_export_service
+    if not pdf_export_service.PYPDF_AVAILABLE:
+        pytest.skip("pypdf not installed")
+    
+    file_service = FileService(base_data_dir=temp_data_dir)
+    schedule_service = ScheduleService(file_service, SubjectService(file_service))
+    schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 28), "PDF")
+    service = pdf_export_service.PdfExportService(cache_dir=str(Path(temp_data_dir) / "pdf_cache"))
+    file_path = str(Path(temp_data_dir) / "schedule.pdf")
+    
+    assert service.export_schedule(schedule, file_path) == (True, None)
+    first_rendered = service.last_export_stats["rendered"]
+    assert first_rendered >= 1
+    
+    schedule.weeks[2].days[0].items.append(
+        ScheduleItem("s1", "l1", "Math", "Lesson 1", time(7, 0), time(9, 0))
+    )
+    assert service.export_schedule(schedule, file_path) == (True, None)
+    assert service.last_export_stats["rendered"] == 1
+    assert service.last_export_stats["cached"] == 3
+
+
+def test_image_export_pages_and_tall(temp_data_dir, monkeypatch):
+    """Test multi-week PNG export as one file per week and as one streamed tall image"""
+    from src.services import image_export_service
+    if not image_export_service.PIL_AVAILABLE:
+        pytest.skip("Pillow not installed")
+    from PIL import Image
+    
+    file_service = FileService(base_data_dir=temp_data_dir)
+    schedule_service = ScheduleService(file_service, SubjectService(file_service))
+    schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 14), "PNG")
+    service = image_export_service.ImageExportService()
+    
+    success, error, paths = service.export_weeks(schedule, str(Path(temp_data_dir) / "week.png"))
+    assert success, error
+    assert [Path(p).name for p in paths] == ["week_tuan_01.png", "week_tuan_02.png"]
+    
+    tall_path = str(Path(temp_data_dir) / "tall.png")
+    success, error, _ = service.export_weeks(schedule, tall_path, mode=image_export_service.IMAGE_MODE_TALL)
+    assert success, error
+    with Image.open(tall_path) as img:
+        img.load()
+        expected_height = sum(image_export_service.tile_height(week) for week in schedule.weeks)
+        assert img.size == (image_export_service.TILE_WIDTH, expected_height)
+    
+    # A failed render leaves neither the target nor the partial temp file
+    def fail(*_):
+        raise RuntimeError("render failed")
+    monkeypatch.setattr(image_export_service, "render_week_rows", fail)
+    failed_path = Path(temp_data_dir) / "failed.png"
+    assert not service.export_weeks(schedule, str(failed_path), mode=image_export_service.IMAGE_MODE_TALL)[0]
+    assert not failed_path.exists() and not Path(f"{failed_path}.tmp").exists()
+
+
+def test_cli_create_validate_export(temp_data_dir, capsys):
+    """Test the headless CLI: create a schedule, validate it and export it without Qt"""
+    import subprocess
+    import sys
+    from src import cli
+    
+    out_dir = Path(temp_data_dir) / "out"
+    assert cli.main(["--data-dir", temp_data_dir, "--workers", "1", "create-schedule",
+                     "--name", "CLI", "--range", "2024-01-01:2024-01-14"]) == 0
+    schedules = FileService(base_data_dir=temp_data_dir).load_all_schedules()
+    assert len(schedules) == 1 and len(schedules[0].weeks) == 2
+    
+    # Empty days do not reach the daily total: reported, exit code 1
+    assert cli.main(["--data-dir", temp_data_dir, "--workers", "1", "validate"]) == 1
+    assert cli.main(["--data-dir", temp_data_dir, "--workers", "1", "export",
+                     "--format", "excel", "--out", str(out_dir)]) == 0
+    assert [p.suffix for p in out_dir.iterdir()] == [".xlsx"]
+    assert "Tuần 1" in capsys.readouterr().out
+    
+    code = "import sys, src.cli; sys.exit(any(m.startswith('PySide6') for m in sys.modules))"
+    assert subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent.parent).returncode == 0
+
+
+def test_suggest_adjustments_ranked_and_multi_swap(temp_data_dir):
+    """Test duration-indexed suggestions: deduplicated, best first, and multi-lesson swaps"""
+    from datetime import time
+    from src.models.schedule import DaySchedule, ScheduleItem
+    
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    subject = Subject(name="Math", default_duration=2.0, lessons=[
+        Lesson(name="L1", duration=1.0, lesson_id="l1"),
+        Lesson(name="L2", lesson_id="l2"),  # default duration
+        Lesson(name="L3", duration=3.0, lesson_id="l3"),
+        Lesson(name="L6", duration=6.0, lesson_id="l6"),
+    ])
+    assert file_service.save_subject(subject)
+    day = DaySchedule(date=date(2024, 1, 2))
+    day.items = [
+        ScheduleItem(subject.subject_id, "l1", "Math", "L1", time(7, 0), time(8, 0)),
+        ScheduleItem(subject.subject_id, "l1", "Math", "L1", time(8, 0), time(9, 0)),
+        ScheduleItem(subject.subject_id, "l2", "Math", "L2", time(9, 0), time(11, 0)),
+    ]
+    _, total_hours, _ = schedule_service.validate_day_schedule(day)
+    shortage = schedule_service.get_schedule_times_for_date(day.date)["daily_total_hours"] - total_hours
+    assert shortage == 4.0
+    
+    suggestions = schedule_service.suggest_adjustments(day, subject)
+    pairs = [(s["current_lesson"], s["suggested_lesson"]) for s in suggestions]
+    assert len(pairs) == len(set(pairs))
+    # L2 (2h) -> L6 (6h) closes the 4h gap exactly
+    assert pairs[0] == ("L2", "L6")
+    assert all(s["hours_change"] > 0 for s in suggestions)
+    
+    swaps = schedule_service.suggest_day_swaps(day)
+    assert swaps and swaps[0]["remaining_hours"] == 0
+    assert sum(s["hours_change"] for s in swaps[0]["swaps"]) == 4.0
+
+
+def test_auto_fill_with_solver_fills_day_exactly(temp_data_dir):
+    """Test the search planner fills a day the greedy fill leaves short, teaching lessons in order"""
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    drill = Subject(name="Drill", lessons=[
+        Lesson(name=f"D{i}", duration=1.0, lesson_id=f"d{i}") for i in range(3)
+    ])
+    math = Subject(name="Math", lessons=[
+        Lesson(name=f"M{i}", duration=hours, lesson_id=f"m{i}") for i, hours in enumerate([3.0, 4.0])
+    ])
+    assert file_service.save_subject(drill)
+    assert file_service.save_subject(math)
+    
+    results = {}
+    for use_solver in (False, True):
+        schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 7), "Solver")
+        schedule_service.set_day_subjects(schedule, 1, 1, [drill.subject_id, math.subject_id])
+        success, error, days_with_issues = schedule_service.auto_fill_week_times_and_lessons(
+            schedule, 1, use_solver=use_solver
+        )
+        assert success, error
+        day = schedule.weeks[0].days[1]
+        results[use_solver] = (schedule_service.validate_day_schedule(day)[0],
+                               day.get_lesson_ids(drill.subject_id), day.get_lesson_ids(math.subject_id))
+        if use_solver:
+            assert schedule_service.check_sequencing(schedule, 1) == ([], [])
+    
+    assert results[False][0] is False
+    is_valid, drill_ids, math_ids = results[True]
+    assert is_valid
+    # 1h + 3h + 4h, in order; the last lesson runs over the lunch break (two slots)
+    assert drill_ids == ["d0"]
+    assert math_ids == ["m0", "m1", "m1"]
+
+
+def test_sequencing_prerequisites_and_graph_cache(temp_data_dir):
+    """Test prerequisite issues in validation, cycle detection and graph rebuild after a subject save"""
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    basic = Subject(name="Basic", lessons=[Lesson(name="B1", duration=2.0, lesson_id="b1"),
+                                           Lesson(name="B2", duration=2.0, lesson_id="b2")])
+    advanced = Subject(name="Advanced", lessons=[Lesson(name="A1", duration=2.0, lesson_id="a1")],
+                       prerequisites=[basic.subject_id])
+    assert file_service.save_subject(basic)
+    assert file_service.save_subject(advanced)
+    
+    graph = subject_service.get_subject_graph()
+    assert graph.order == [basic.subject_id, advanced.subject_id]
+    assert not graph.cyclic
+    assert subject_service.get_subject_graph() is graph
+    
+    schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 7), "Order")
+    # Tuesday: only the first Basic lesson; Wednesday: Advanced already
+    schedule_service.set_day_subjects(schedule, 1, 1, [basic.subject_id])
+    schedule.weeks[0].days[1].subject_lesson_map[basic.subject_id] = ["b1"]
+    schedule_service.set_day_subjects(schedule, 1, 2, [advanced.subject_id])
+    schedule.weeks[0].days[2].subject_lesson_map[advanced.subject_id] = ["a1"]
+    issues, warnings = schedule_service.check_sequencing(schedule, 1)
+    assert len(issues) == 1 and "Advanced" in issues[0] and "Basic" in issues[0]
+    assert issues[0].startswith("Thứ Tư (2024-01-03)")
+    assert not warnings
+    
+    # Completing Basic on Tuesday clears the issue
+    schedule.weeks[0].days[1].subject_lesson_map[basic.subject_id] = ["b2", "b1"]
+    issues, warnings = schedule_service.check_sequencing(schedule, 1)
+    assert not issues
+    assert len(warnings) == 1
+    
+    # A cycle is detected once the catalog changes
+    basic.prerequisites = [advanced.subject_id]
+    assert file_service.save_subject(basic)
+    graph = subject_service.get_subject_graph()
+    assert graph.cyclic == {basic.subject_id, advanced.subject_id}
+    
+    # Filling week by week with one extended history matches filling each week from scratch
+    from src.services.batch_generator import populate_schedule
+    from src.services.sequencing import TeachingHistory, day_ordinal, sequencing_issues
+    basic.prerequisites = []
+    assert file_service.save_subject(basic)
+    term = [schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 28), "Term") for _ in range(2)]
+    populate_schedule(schedule_service, term[0], [basic.subject_id, advanced.subject_id])
+    for week_num in range(1, 5):
+        for day_index in range(6):
+            schedule_service.set_day_subjects(term[1], week_num, day_index, [basic.subject_id, advanced.subject_id])
+        schedule_service.auto_fill_week_times_and_lessons(term[1], week_num)
+    assert [d.to_dict() for d in term[0].iter_days()] == [d.to_dict() for d in term[1].iter_days()]
+    
+    # A week checked with the history of the weeks before it reports like a full pass
+    graph = subject_service.get_subject_graph()
+    history = TeachingHistory(graph, term[0], before=day_ordinal(3, 0))
+    assert sequencing_issues(term[0], graph, [3], history) == sequencing_issues(term[0], graph, [3])
+
+
+def test_build_all_weeks_in_pool_matches_serial(temp_data_dir):
+    """Test weeks built in worker processes are merged back in week order like a serial build"""
+    from src.models.schedule import Schedule
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    subject = Subject(name="Math", lessons=[
+        Lesson(name=f"L{i}", duration=2.0, lesson_id=f"l{i}") for i in range(12)
+    ])
+    assert file_service.save_subject(subject)
+    schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 21), "Pool")
+    for week_num in (1, 3):
+        schedule_service.set_day_subjects(schedule, week_num, 1, [subject.subject_id])
+        assert schedule_service.auto_fill_week_times_and_lessons(schedule, week_num)[0]
+    # Week 2: a subject selected without lessons
+    schedule_service.set_day_subjects(schedule, 2, 1, [subject.subject_id])
+    serial = Schedule.from_dict(schedule.to_dict())
+    
+    results = {}
+    for workers, target in ((1, serial), (2, schedule)):
+        success, summary, issues = schedule_service.build_all_weeks(target, workers=workers, validate=True)
+        assert not success and summary
+        results[workers] = issues
+    assert results[1] == results[2]
+    week_order = [int(issue.split(":")[0].split()[1]) for issue in results[2]]
+    assert week_order == sorted(week_order) and 2 in week_order
+    assert [[d.to_dict()["items"] for d in w.days] for w in schedule.weeks] == \
+        [[d.to_dict()["items"] for d in w.days] for w in serial.weeks]
+    assert any(item.subject_id for item in schedule.weeks[2].days[1].items)
+
+
+def test_batch_generator_creates_units(temp_data_dir):
+    """Test many units are created from one template, saved, and reported with progress"""
+    from src.services.batch_generator import BatchScheduleGenerator, UnitSpec
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    subjects = [
+        Subject(name=f"S{n}", lessons=[Lesson(name=f"L{i}", duration=2.0, lesson_id=f"s{n}l{i}") for i in range(40)])
+        for n in range(2)
+    ]
+    for subject in subjects:
+        assert file_service.save_subject(subject)
+    units = [UnitSpec(f"Unit {n}", [subjects[n % 2].subject_id]) for n in range(3)]
+    units.append(UnitSpec("Empty", ["missing"], auto_fill=False))
+    
+    for workers in (1, 2):
+        progress = []
+        results = BatchScheduleGenerator(schedule_service).generate(
+            date(2024, 1, 1), date(2024, 1, 14), units, workers,
+            lambda done, total, result: progress.append((done, total, result.name))
+        )
+        assert [r.name for r in results] == [u.name for u in units]
+        assert all(r.ok for r in results)
+        assert sorted(done for done, _, _ in progress) == [1, 2, 3, 4]
+        assert len({r.schedule_id for r in results}) == 4
+        saved = schedule_service.load_schedule(results[1].schedule_id)
+        assert saved.name == "Unit 1" and len(saved.weeks) == 2
+        assert subjects[1].subject_id in saved.weeks[0].days[1].subject_lesson_map
+        # A subject missing from the catalog is reported for that unit only
+        assert any("missing" in issue for issue in results[3].issues)
+
+
+def test_location_conflicts_across_schedules(temp_data_dir):
+    """Test double bookings of a location are found across saved schedules and follow saves/deletes"""
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    subject = Subject(name="Shooting", location="Range A", lessons=[
+        Lesson(name=f"L{i}", duration=2.0, lesson_id=f"l{i}") for i in range(8)
+    ])
+    assert file_service.save_subject(subject)
+    schedules = []
+    for name in ("Unit 1", "Unit 2"):
+        schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 7), name)
+        schedule_service.set_day_subjects(schedule, 1, 1, [subject.subject_id])
+        assert schedule_service.auto_fill_week_times_and_lessons(schedule, 1)[0]
+        schedules.append(schedule)
+    
+    assert schedule_service.save_schedule(schedules[0])[0]
+    index = schedule_service.get_location_index()
+    _, issues = schedule_service.validate_week_schedule(schedules[1], 1)
+    conflicts = [issue for issue in issues if "Range A" in issue]
+    assert conflicts and all("Unit 1" in issue for issue in conflicts)
+    users = schedule_service.find_location_users(" range a ", date(2024, 1, 2), time(7, 0), time(7, 30))
+    assert [booking.schedule_name for booking in users] == ["Unit 1"]
+    assert not schedule_service.find_location_users("Range A", date(2024, 1, 3), time(7, 0), time(9, 0))
+    
+    # Saving updates the index in place; a schedule never conflicts with itself
+    assert schedule_service.save_schedule(schedules[1])[0]
+    assert schedule_service.get_location_index() is index
+    assert len(schedule_service.find_location_users("Range A", date(2024, 1, 2), time(7, 0), time(7, 30))) == 2
+    assert schedule_service.delete_schedule(schedules[0].schedule_id)[0]
+    _, issues = schedule_service.validate_week_schedule(schedules[1], 1)
+    assert not [issue for issue in issues if "Range A" in issue]
+
+
+def test_resource_capacity_blocks_over_allocation(temp_data_dir):
+    """Test instructors used to capacity by another schedule are avoided by auto-fill and rejected on placement"""
+    from src.models.resource import Resource
+    from src.services.resource_service import ResourceService
+    from src.services.resource_calendar import ResourceCalendar, slot_mask
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    resource_service = ResourceService(file_service)
+    instructor = Resource(name="Instructor A")
+    assert resource_service.create_resource(instructor) == (True, None)
+    assert resource_service.create_resource(Resource(name="Bad", capacity=0))[0] is False
+    subject = Subject(name="Tactics", resource_ids=[instructor.resource_id], lessons=[
+        Lesson(name=f"L{i}", duration=2.0, lesson_id=f"l{i}") for i in range(8)
+    ])
+    assert file_service.save_subject(subject)
+    assert file_service.load_subject(subject.subject_id).resource_ids == [instructor.resource_id]
+    
+    first = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 7), "Unit 1")
+    schedule_service.set_day_subjects(first, 1, 1, [subject.subject_id])
+    assert schedule_service.auto_fill_week_times_and_lessons(first, 1)[0]
+    assert schedule_service.save_schedule(first)[0]
+    
+    second = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 7), "Unit 2")
+    schedule_service.set_day_subjects(second, 1, 1, [subject.subject_id])
+    version_checks = []
+    resources_version = file_service.resources_version
+    file_service.resources_version = lambda: version_checks.append(1) or resources_version()
+    for use_solver in (False, True):
+        # Nothing can be placed: the build then reports the subject without lessons
+        version_checks.clear()
+        schedule_service.auto_fill_week_times_and_lessons(second, 1, use_solver=use_solver)
+        assert not second.weeks[0].days[1].subject_lesson_map.get(subject.subject_id)
+        # Resource files are checked once per fill and build, not per candidate lesson
+        assert len(version_checks) <= 2
+    success, error = schedule_service.add_lesson_to_day(second, 1, 1, subject, subject.lessons[5], time(7, 0))
+    assert not success and "Instructor A" in error
+    
+    # With room for two lessons at once, the second unit fits
+    instructor.capacity = 2
+    assert resource_service.update_resource(instructor)[0]
+    assert schedule_service.add_lesson_to_day(second, 1, 1, subject, subject.lessons[5], time(7, 0)) == (True, None)
+    
+    calendar = ResourceCalendar({"r": 2})
+    morning = slot_mask(time(7, 0), time(9, 0))
+    calendar.book("r", date(2024, 1, 2), morning)
+    calendar.book("r", date(2024, 1, 2), slot_mask(time(8, 0), time(10, 0)))
+    assert not calendar.fits("r", date(2024, 1, 2), slot_mask(time(8, 30), time(9, 0)))
+    assert calendar.fits("r", date(2024, 1, 2), slot_mask(time(7, 0), time(8, 0)))
+    view = calendar.excluding("none")
+    view.release("r", date(2024, 1, 2), morning)
+    assert view.fits("r", date(2024, 1, 2), slot_mask(time(8, 30), time(9, 0)))
+    assert not calendar.fits("r", date(2024, 1, 2), slot_mask(time(8, 30), time(9, 0)))
+    
+    # Back-to-back lessons at times off the half hour do not overlap
+    single = ResourceCalendar({"r": 1})
+    single.book("r", date(2024, 1, 2), slot_mask(time(7, 0), time(7, 45)))
+    assert single.fits("r", date(2024, 1, 2), slot_mask(time(7, 45), time(8, 30)))
+    assert not single.fits("r", date(2024, 1, 2), slot_mask(time(7, 44), time(8, 30)))
+    
+    # Units of one batch see each other's bookings of a capacity-1 instructor
+    from src.services.batch_generator import BatchScheduleGenerator, UnitSpec
+    coach = Resource(name="Coach")
+    assert resource_service.create_resource(coach)[0]
+    shared = Subject(name="Fitness", resource_ids=[coach.resource_id], lessons=[
+        Lesson(name=f"F{i}", duration=1.0, lesson_id=f"f{i}") for i in range(60)
+    ])
+    assert file_service.save_subject(shared)
+    units = [UnitSpec(f"Unit {n}", [shared.subject_id]) for n in range(2)]
+    results = BatchScheduleGenerator(schedule_service).generate(date(2024, 1, 8), date(2024, 1, 14), units, 2)
+    booked = {}
+    for result in results:
+        for day in schedule_service.load_schedule(result.schedule_id).iter_days():
+            for item in day.items:
+                if item.subject_id == shared.subject_id:
+                    booked.setdefault(day.date, []).append((item.start_time, item.end_time))
+    assert booked
+    for intervals in booked.values():
+        intervals.sort()
+        assert all(end <= next_start for (_, end), (next_start, _) in zip(intervals, intervals[1:]))
+
+
+def test_schedule_journal_undo_redo_and_recovery(temp_data_dir):
+    """Test journaled edits can be undone/redone and replayed by a new service after a crash"""
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    subject = Subject(name="Drill", lessons=[Lesson(name="L1", duration=1.0, lesson_id="l1")])
+    assert file_service.save_subject(subject)
+    
+    schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 7), "Draft")
+    journal = schedule_service.open_journal(schedule)
+    assert schedule_service.edit_schedule(schedule, "set_day_subjects", 1, 0, [subject.subject_id])[0]
+    assert schedule_service.edit_schedule(schedule, "set_day_subject_lesson", 1, 0, subject.subject_id, "l1")[0]
+    day = schedule.weeks[0].days[0]
+    assert day.subject_lesson_map[subject.subject_id] == ["l1"]
+    assert schedule_service.undo_edit(schedule) == "set_day_subject_lesson"
+    assert not day.subject_lesson_map.get(subject.subject_id)
+    assert schedule_service.redo_edit(schedule) == "set_day_subject_lesson"
+    assert day.subject_lesson_map[subject.subject_id] == ["l1"]
+    assert schedule_service.undo_edit(schedule) and journal.can_redo
+    
+    # A crash while appending leaves a torn last line
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"op": "redo"')
+    other = ScheduleService(FileService(base_data_dir=temp_data_dir), SubjectService(file_service))
+    assert other.recoverable_journals() == [(schedule.schedule_id, "Draft", False)]
+    recovered = other.recover_schedule(schedule.schedule_id)
+    assert recovered.weeks[0].days[0].selected_subject_ids == [subject.subject_id]
+    assert not recovered.weeks[0].days[0].subject_lesson_map.get(subject.subject_id)
+    assert other.redo_edit(recovered) == "set_day_subject_lesson"
+    
+    # Saving folds the journal into the document; later edits replay over it
+    assert other.save_schedule(recovered)[0]
+    assert other.edit_schedule(recovered, "set_day_subjects", 1, 2, [subject.subject_id])[0]
+    third = ScheduleService(FileService(base_data_dir=temp_data_dir), SubjectService(file_service))
+    assert third.recoverable_journals() == [(schedule.schedule_id, "Draft", True)]
+    restored = third.recover_schedule(schedule.schedule_id)
+    assert restored.weeks[0].days[0].subject_lesson_map[subject.subject_id] == ["l1"]
+    assert restored.weeks[0].days[2].selected_subject_ids == [subject.subject_id]
+    assert third.load_schedule(schedule.schedule_id).weeks[0].days[2].selected_subject_ids == [subject.subject_id]
+    assert third.recoverable_journals() == []
+    
+    # An auto-fill that fails after filling the days is still journaled (and can be undone)
+    first_day = restored.weeks[0].days[0]
+    assert third.edit_schedule(restored, "set_day_subject_lesson", 1, 0, subject.subject_id, "")[0]
+    third.build_week_items = lambda *args, **kwargs: (False, "build failed", ["build failed"])
+    success, error, _ = third.edit_schedule(restored, "auto_fill_week_times_and_lessons", 1)
+    assert not success and error == "build failed"
+    assert first_day.subject_lesson_map == {subject.subject_id: ["l1"]}
+    assert third.undo_edit(restored) == "auto_fill_week_times_and_lessons"
+    assert not first_day.subject_lesson_map.get(subject.subject_id)
+
+
+def test_week_template_shared_until_edited(temp_data_dir):
+    """Test weeks applied from a template share its day plans, copy one on edit and store it once"""
+    from src.services.week_template_service import WeekTemplateService
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    template_service = WeekTemplateService(file_service)
+    subject = Subject(name="Drill", lessons=[Lesson(name="L1", duration=1.0, lesson_id="l1")])
+    assert file_service.save_subject(subject)
+    
+    schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 2, 4), "Term")
+    schedule_service.set_day_subjects(schedule, 1, 0, [subject.subject_id])
+    schedule_service.set_day_subject_time(schedule, 1, 0, subject.subject_id, time(7, 0))
+    assert template_service.create_from_week(schedule, 1, " ")[0] is False
+    success, _, template = template_service.create_from_week(schedule, 1, "Standard week")
+    assert success and template_service.get_all_templates()[0].name == "Standard week"
+    
+    week_nums = list(range(2, len(schedule.weeks) + 1))
+    assert schedule_service.apply_week_template(schedule, template, week_nums) == (True, None)
+    plan = template.days[0]
+    assert all(week.days[0].subject_time_slots is plan.subject_time_slots for week in schedule.weeks[1:])
+    
+    # Editing one day copies its plan; the template and the other weeks are untouched
+    assert schedule_service.set_day_subject_lesson(schedule, 3, 0, subject.subject_id, "l1")[0]
+    assert schedule.weeks[2].days[0].subject_lesson_map == {subject.subject_id: ["l1"]}
+    assert not schedule.weeks[2].uses_template_day(0) and schedule.weeks[2].uses_template_day(1)
+    assert plan.subject_lesson_map == {} and schedule.weeks[3].days[0].subject_lesson_map == {}
+    
+    data = schedule.to_dict()
+    assert list(data["week_templates"]) == [template.template_id]
+    assert "subject_time_slots" not in data["weeks"][1]["days"][0]
+    assert data["weeks"][2]["days"][0]["subject_lesson_map"] == {subject.subject_id: ["l1"]}
+    assert schedule_service.save_schedule(schedule)[0]
+    loaded = schedule_service.load_schedule(schedule.schedule_id)
+    assert loaded.weeks[1].template is loaded.weeks[4].template
+    assert loaded.weeks[4].days[0].subject_time_slots == {subject.subject_id: ["07:00"]}
+    assert loaded.weeks[4].days[0].subject_time_slots is loaded.weeks[1].days[0].subject_time_slots
+    assert loaded.weeks[2].days[0].subject_lesson_map == {subject.subject_id: ["l1"]}
+
+
+def test_schedule_diff_and_change_notice(temp_data_dir, capsys):
+    """Test only changed days are reported and exported, with items matched by time"""
+    from src import cli
+    from src.services.schedule_diff import diff_schedules
+    file_service = FileService(base_data_dir=temp_data_dir)
+    subject_service = SubjectService(file_service)
+    schedule_service = ScheduleService(file_service, subject_service)
+    subject = Subject(name="Drill", lessons=[
+        Lesson(name=f"L{i}", duration=1.0, lesson_id=f"l{i}") for i in range(3)
+    ])
+    assert file_service.save_subject(subject)
+    schedule = schedule_service.create_schedule(date(2024, 1, 1), date(2024, 1, 14), "Term")
+    assert schedule_service.add_lesson_to_day(schedule, 1, 1, subject, subject.lessons[0], time(7, 0))[0]
+    assert schedule_service.save_schedule(schedule)[0]
+    backup = Path(temp_data_dir) / "backup.json"
+    shutil.copy(file_service.schedules_dir / f"{schedule.schedule_id}.json", backup)
+    assert diff_schedules(schedule, schedule_service.load_schedule(schedule.schedule_id)).is_empty
+    
+    day = schedule.weeks[0].days[1]
+    day.items = [item for item in day.items if item.lesson_id != "l0"]
+    assert schedule_service.add_lesson_to_day(schedule, 1, 1, subject, subject.lessons[1], time(7, 0))[0]
+    assert schedule_service.add_lesson_to_day(schedule, 2, 4, subject, subject.lessons[2], time(9, 0))[0]
+    diff = schedule_service.diff_with_saved(schedule)
+    assert [day.day_date for day in diff.days] == [date(2024, 1, 2), date(2024, 1, 12)]
+    assert diff.unchanged_days == len(list(schedule.iter_days())) - 2
+    assert [change.kind for change in diff.days[0].changes] == ["changed"]
+    assert "L0" in diff.days[0].changes[0].old_text and "L1" in diff.days[0].changes[0].new_text
+    assert diff.days[1].changes[0].kind == "added" and diff.days[1].week_number == 2
+    
+    assert schedule_service.save_schedule(schedule)[0]
+    out = Path(temp_data_dir) / "changes.xlsx"
+    args = ["--data-dir", temp_data_dir, "diff", str(backup), schedule.schedule_id, "--out", str(out)]
+    assert cli.main(args) == 0
+    assert "2 ngày thay đổi" in capsys.readouterr().out
+    assert out.exists()
+    pdf_out = Path(temp_data_dir) / "changes.pdf"
+    assert cli.main(args[:-1] + [str(pdf_out), "--format", "pdf"]) == 0
+    assert pdf_out.read_bytes().startswith(b"%PDF")